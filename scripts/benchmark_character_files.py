@@ -0,0 +1,60 @@
+import click
+import tempfile
+from pathlib import Path
+from timeit import timeit
+
+from npc.campaign import init
+
+def glob_character_files(collection) -> list[Path]:
+    """Find character files the way valid_character_files did before it used scandir"""
+    ignore_paths = [collection.root / p for p in collection.campaign.settings.get("campaign.characters.ignore_subpaths")]
+    def allowed(file_path):
+        if file_path.suffix not in collection.allowed_suffixes:
+            return False
+
+        for ignore_path in ignore_paths:
+            if file_path.is_relative_to(ignore_path):
+                return False
+
+        return True
+
+    return [p for p in collection.root.glob("**/*") if allowed(p)]
+
+def make_tree(root: Path, depth: int, breadth: int, files: int):
+    """Fill a directory with nested subdirectories of character files and images"""
+    for index in range(files):
+        (root / f"Character {index} - mook.npc").write_text("@type person\n")
+        (root / f"portrait {index}.png").write_bytes(b"")
+    if depth == 0:
+        return
+    for index in range(breadth):
+        subdir = root / f"Group {index}"
+        subdir.mkdir()
+        make_tree(subdir, depth - 1, breadth, files)
+
+@click.command()
+@click.option("--depth", default=4, help="How many levels of subdirectories to create")
+@click.option("--breadth", default=4, help="How many subdirectories to create in each directory")
+@click.option("--files", default=5, help="How many character files to create in each directory")
+@click.option("--runs", default=5, help="How many times to time each method")
+def benchmark(depth, breadth, files, runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        campaign = init(Path(tmp_dir), name="Benchmark", system="generic")
+        campaign.patch_campaign_settings({"characters": {"ignore_subpaths": ["Archive"]}})
+        make_tree(campaign.characters_dir, depth, breadth, files)
+        archive = campaign.characters_dir / "Archive"
+        archive.mkdir()
+        make_tree(archive, depth, breadth, files)
+
+        collection = campaign.characters
+        found = len(list(collection.valid_character_files()))
+        assert found == len(glob_character_files(collection))
+        click.echo(f"Found {found} character files, skipping an archive of the same size")
+
+        glob_time = timeit(lambda: glob_character_files(collection), number=runs) / runs
+        scan_time = timeit(lambda: list(collection.scan_character_files()), number=runs) / runs
+        click.echo(f"glob:    {glob_time * 1000:.1f}ms")
+        click.echo(f"scandir: {scan_time * 1000:.1f}ms ({glob_time / scan_time:.1f}x faster)")
+
+if __name__ == '__main__':
+    benchmark()
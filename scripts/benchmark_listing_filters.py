@@ -0,0 +1,57 @@
+import click
+import random
+import tempfile
+import mistletoe
+from io import StringIO
+from pathlib import Path
+from timeit import timeit
+
+from npc.campaign import init
+from npc.listers import CharacterLister
+from npc.templates.filters import trim_tags, cached_markdown
+
+def make_characters(root: Path, count: int, distinct: int):
+    """Fill a directory with character files whose descriptions and appearances come from a small pool"""
+    rng = random.Random(1)
+    sentence = "A *member* of the **{} Society**, known for [many things](#{}) and `odd habits`. "
+    descriptions = [sentence.format(index, index) * 8 for index in range(distinct)]
+    appearances = [f"Tall, with _{index}_ scars" for index in range(distinct)]
+    for index in range(count):
+        (root / f"Character {index} - mook.npc").write_text(
+            "@type person\n"
+            f"@org Org {index % distinct}\n"
+            f"@appearance {rng.choice(appearances)}\n"
+            f"@description {rng.choice(descriptions)}\n"
+        )
+
+@click.command()
+@click.option("--characters", default=2000, help="How many character files to create")
+@click.option("--distinct", default=20, help="How many different descriptions and appearances to use")
+@click.option("--runs", default=3, help="How many times to time each method")
+def benchmark(characters, distinct, runs):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        campaign = init(Path(tmp_dir), name="Benchmark", system="generic")
+        make_characters(campaign.characters_dir, characters, distinct)
+        campaign.characters.load()
+        lister = CharacterLister(campaign.characters, lang="html", render_cache=False, workers=1)
+        jenv = lister.environment()
+        click.echo(f"Listing {characters} characters with {distinct} distinct markdown values")
+
+        cached_filters = jenv.filters["md"], jenv.filters["mdi"]
+        jenv.filters["md"] = mistletoe.markdown
+        jenv.filters["mdi"] = lambda v: trim_tags(mistletoe.markdown(v))
+        jenv.cache.clear()
+        plain_time = timeit(lambda: lister.list(StringIO()), number=runs) / runs
+
+        jenv.filters["md"], jenv.filters["mdi"] = cached_filters
+        jenv.cache.clear()
+        cached_markdown.cache_clear()
+        cached_time = timeit(lambda: lister.list(StringIO()), number=runs) / runs
+        stats = lister.stats
+
+        click.echo(f"uncached: {plain_time * 1000:.1f}ms")
+        click.echo(f"cached:   {cached_time * 1000:.1f}ms ({plain_time / cached_time:.2f}x faster)")
+        click.echo(f"last run: {stats}")
+
+if __name__ == '__main__':
+    benchmark()
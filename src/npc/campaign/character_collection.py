@@ -1,12 +1,22 @@
-from typing import Iterator, Callable
+import os
+import json
+from hashlib import sha256
+from typing import Iterator, Iterable, Callable
 from pathlib import Path
+from threading import Event
+from sqlalchemy import insert
 
 from functools import cached_property
+from contextlib import contextmanager
 
 from .pathfinder_class import Pathfinder
-from npc.characters import Character, CharacterFactory, CharacterReader, CharacterWriter
-from npc.db import DB, character_repository
+from .character_ingest import parse_character_files
+from .character_watcher import ChangeSummary, make_watcher
+from npc.characters import Character, CharacterFactory, CharacterWriter, ParseCache, ParsedCharacter
+from npc.db import DB, character_repository, bulk_insert, character_sync, search_index, name_index
+from npc.db import character_search, character_names
 from npc.util.errors import NotFoundError
+from npc import __version__ as npc_version
 
 class CharacterCollection():
     """Class for a group of Character objects, backed by a database
@@ -15,6 +25,7 @@ class CharacterCollection():
     """
 
     CACHE_KEY = "characters"
+    INDEX_FILENAME = "characters.sqlite"
 
     def __init__(self, campaign, *, db: DB = None):
         """Create a new CharacterCollection object
@@ -28,6 +39,11 @@ class CharacterCollection():
         self.root = campaign.characters_dir
         self._count = 0
         self.item_type = "Character"
+        self.watcher = None
+        # whether search() has built the search index, so that it must be kept up to date from now on
+        self.search_index_built = False
+        # whether the search index may have rows whose deferred body has not been filled in yet
+        self.unfilled_bodies = True
 
     @property
     def count(self) -> int:
@@ -54,86 +70,457 @@ class CharacterCollection():
         self._count = value
         self.campaign.stats.set(self.CACHE_KEY, value)
 
-    def seed(self, progress_callback: Callable = None):
+    @property
+    def index_path(self) -> Path:
+        """Get the path to the persistent character index
+
+        Returns:
+            Path: Path to the index database file within the campaign's cache dir
+        """
+        return self.campaign.cache_dir / self.INDEX_FILENAME
+
+    @property
+    def index_fingerprint(self) -> str:
+        """Get a fingerprint of the settings that affect how character records are built
+
+        Any change to the tag, metatag, or type definitions can change the records that are created from the
+        same character file. The same goes for the package version and for which files are considered valid.
+        This fingerprint combines all of those so that a persistent index can tell when it is out of date.
+
+        Returns:
+            str: Hex digest of the relevant settings
+        """
+        settings = self.campaign.settings
+        system_key = self.campaign.system_key
+        data = {
+            "version": npc_version,
+            "root": str(self.root),
+            "search_index": self.use_search_index,
+            "ignore_subpaths": settings.get("campaign.characters.ignore_subpaths"),
+            "suffixes": sorted(self.allowed_suffixes),
+            "system": system_key,
+            "tags": self.campaign.campaign_tag_defs,
+            "metatags": self.campaign.campaign_metatag_defs,
+            "types": [
+                settings.get(f"campaign.types.{system_key}", {}),
+                settings.get(f"npc.types.{system_key}", {}),
+            ],
+        }
+        encoded = json.dumps(data, sort_keys=True, default=str)
+        return sha256(encoded.encode("utf-8")).hexdigest()
+
+    def open_index(self) -> DB:
+        """Switch to the persistent character index for this campaign
+
+        The index database is stored in the campaign's cache dir and replaces the DB singleton, so that
+        everything else uses it too. If the index was built with a different schema or different settings,
+        it is emptied so that the next refresh() loads every character file.
+
+        Returns:
+            DB: The index database object
+        """
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = DB(clearSingleton=True, db_path=self.index_path)
+        self.db.ensure_fingerprint(self.index_fingerprint)
+        self.search_index_built = False
+        self.unfilled_bodies = True
+        return self.db
+
+    @property
+    def ingest_workers(self) -> int:
+        """Get the number of worker processes to use when reading character files
+
+        Comes from the campaign.characters.ingest_workers setting. Zero means one worker per CPU.
+
+        Returns:
+            int: Number of worker processes
+        """
+        return self.campaign.settings.get("campaign.characters.ingest_workers", 1)
+
+    @property
+    def defer_bodies(self) -> bool:
+        """Get whether character bodies should be left on disk until they are needed
+
+        Comes from the campaign.characters.defer_bodies setting.
+
+        Returns:
+            bool: True if only the body offset should be loaded
+        """
+        return self.campaign.settings.get("campaign.characters.defer_bodies", False)
+
+    @property
+    def use_parse_cache(self) -> bool:
+        """Get whether parsed character files should be cached between runs
+
+        Comes from the campaign.characters.parse_cache setting.
+
+        Returns:
+            bool: True if the parse cache should be used
+        """
+        return self.campaign.settings.get("campaign.characters.parse_cache", False)
+
+    @property
+    def use_search_index(self) -> bool:
+        """Get whether the full-text search index should be kept up to date as characters are loaded
+
+        Comes from the campaign.characters.search_index setting.
+
+        Returns:
+            bool: True if the search index should be updated along with the character records
+        """
+        return self.campaign.settings.get("campaign.characters.search_index", False)
+
+    @property
+    def maintain_search_index(self) -> bool:
+        """Get whether the search index must be updated along with the character records
+
+        This is true when use_search_index is on, and also once search() has built the index. After that, it
+        is kept up to date just as if use_search_index were on, so that later searches do not have to build
+        it again.
+
+        Returns:
+            bool: True if the search index should be updated along with the character records
+        """
+        return self.use_search_index or self.search_index_built
+
+    def open_parse_cache(self) -> ParseCache:
+        """Open the parse cache for this campaign
+
+        The cache file is stored in the campaign's cache dir.
+
+        Returns:
+            ParseCache: The parse cache object, or None if the cache is turned off
+        """
+        if not self.use_parse_cache:
+            return None
+
+        self.campaign.cache_dir.mkdir(parents=True, exist_ok=True)
+        return ParseCache(self.campaign.cache_dir / ParseCache.FILENAME)
+
+    def load(self, progress_callback: Callable = None, *, workers: int = None):
+        """Make the db reflect the current character files, using the fastest available method
+
+        When a watcher is attached, only the changes it has seen since the last call are applied. When the
+        campaign.characters.persistent_index setting is on, this opens the persistent index and calls
+        refresh() so that only changed files are read. Otherwise, it calls seed() to load every file into a
+        fresh database.
+
+        Args:
+            progress_callback (Callable): Optional callback to update a progress bar
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
+        """
+        if self.watcher:
+            if changed := self.watcher.changes(0):
+                self.apply_changes(changed, workers=workers)
+        elif self.campaign.settings.get("campaign.characters.persistent_index"):
+            self.open_index()
+            self.refresh(progress_callback, workers=workers)
+        else:
+            self.seed(progress_callback, workers=workers)
+
+    def make_characters(
+        self,
+        paths: list[Path],
+        progress_callback: Callable,
+        workers: int = None,
+        stats: dict[Path, os.stat_result] = None,
+        parse_cache: ParseCache = None) -> list[Character]:
+        """Read character files and make new Character objects from them
+
+        The files are parsed using workers processes, while the Character objects are always created in this
+        process. The returned list is in the same order as paths, and progress_callback is called once for
+        every character made.
+
+        When parse_cache is given, files it already knows about are not parsed again, and the results for all
+        other files are added to it. The cache is not saved.
+
+        When defer_bodies is on, the characters only get the offset of their body. The body itself is read from
+        the file if something asks for it.
+
+        Args:
+            paths (list[Path]): Character file paths to load
+            progress_callback (Callable): Callback to update a progress bar
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
+            stats (dict[Path, os.stat_result]): Known stat results for the files, to avoid another stat call
+            parse_cache (ParseCache): Optional cache of parsed files
+
+        Returns:
+            list[Character]: New Character objects, not yet added to the db
+        """
+        workers = self.ingest_workers if workers is None else workers
+        read_body = not self.defer_bodies
+        if stats is None:
+            stats = {}
+        if parse_cache:
+            for path in paths:
+                if path not in stats:
+                    stats[path] = path.stat()
+
+        cached: dict[Path, ParsedCharacter] = {}
+        if parse_cache:
+            for path in paths:
+                if parsed := parse_cache.lookup(path, stats[path], read_body):
+                    cached[path] = parsed
+        misses = [path for path in paths if path not in cached]
+        fresh = parse_character_files(misses, workers, body=read_body)
+
+        new_characters = []
+        factory = CharacterFactory(self.campaign)
+        for path in paths:
+            parsed = cached.get(path)
+            if parsed is None:
+                parsed = next(fresh)
+                if parse_cache:
+                    parse_cache.store(parsed, stats[path])
+            stat = stats.get(path)
+            character = factory.make(
+                realname = parsed.realname,
+                mnemonic = parsed.mnemonic,
+                body = parsed.body,
+                body_offset = parsed.body_offset,
+                tags = parsed.tags,
+                path = parsed.path,
+                mtime = stat.st_mtime if stat else None,
+                size = stat.st_size if stat else None,
+            )
+            new_characters.append(character)
+            progress_callback()
+        return new_characters
+
+    def seed(self, progress_callback: Callable = None, *, workers: int = None):
         """Load all npc filesinto the db
 
         This method is designed to be used when you want a clean load of all files. It clears out the
         characters table and loads every character file it can find, without any checking like refresh does.
+        The new records are written using bulk inserts, then indexed using index_characters().
 
         Args:
             progress_callback (Callable): Optional callback to update a progress bar
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
         """
         def default_progress():
             pass
         if progress_callback is None:
             progress_callback = default_progress
 
-        new_characters = []
-        factory = CharacterFactory(self.campaign)
-        for character_path in self.valid_character_files():
-            reader = CharacterReader(character_path)
-            character = factory.make(
-                realname = reader.name(),
-                mnemonic = reader.mnemonic(),
-                body = reader.body(),
-                tags = reader.tags(),
-                path = reader.character_path,
-            )
-            new_characters.append(character)
-            progress_callback()
+        paths: list[Path] = []
+        stats: dict[Path, os.stat_result] = {}
+        for entry in self.scan_character_files():
+            character_path = Path(entry.path)
+            paths.append(character_path)
+            stats[character_path] = entry.stat()
+
+        parse_cache = self.open_parse_cache()
+        new_characters = self.make_characters(paths, progress_callback, workers, stats, parse_cache)
+        if parse_cache:
+            parse_cache.prune({str(path) for path in paths})
+            parse_cache.save()
         with self.db.session() as session:
+            if self.search_index_ready(session):
+                session.execute(search_index.destroy_all())
+            if self.name_index_ready(session):
+                session.execute(name_index.destroy_all())
             session.execute(character_repository.destroy_all())
-            session.add_all(new_characters)
+            new_ids = bulk_insert.insert_characters(session, new_characters)
+            self.index_characters(session, list(zip(new_ids, new_characters)))
             session.commit()
         self.count = len(new_characters)
 
-    def refresh(self, progress_callback: Callable = None):
+    def refresh(self, progress_callback: Callable = None, *, workers: int = None):
         """Reload changed npc files into the db
 
-        This method checks all valid character files. Any that are new are loaded into the db. Any that have
-        changed since they were loaded have their old records deleted and are added as new characters. Any
-        records whose files no longer exist are deleted.
+        This method checks all valid character files. Any that are new are loaded into the db. A file counts as
+        changed when its modification time or size differs from the ones stored when it was loaded. An older
+        modification time counts too, since restoring a backup can bring back an earlier copy. Changed files have their records updated in place, so they keep their IDs. See
+        store_changes() for how. Any records whose files no longer exist are deleted, along with their tags,
+        using remove_missing().
 
         Args:
             progress_callback (Callable): Optional callback to update a progress bar
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
         """
         def default_progress():
             pass
         if progress_callback is None:
             progress_callback = default_progress
 
-        new_characters: list[Character] = []
+        changed_files: list[Path] = []
+        stats: dict[Path, os.stat_result] = {}
+        seen: set[str] = set()
         keep: list[int] = []
-        valid_files: list[Path] = list(self.valid_character_files())
-        factory = CharacterFactory(self.campaign)
         with self.db.session() as session:
             chars_query = character_repository.all()
-            indexed_characters = {c.file_loc: c for (c,) in session.execute(chars_query).all()}
-            for character_path in valid_files:
-                record = indexed_characters.get(str(character_path))
-                if record:
-                    mtime = record.file_path.stat().st_mtime
-                    if record.file_mtime >= mtime:
-                        keep.append(record.id)
-                        continue
-
-                reader = CharacterReader(character_path)
-                character = factory.make(
-                    realname = reader.name(),
-                    mnemonic = reader.mnemonic(),
-                    body = reader.body(),
-                    tags = reader.tags(),
-                    path = reader.character_path,
-                )
-                new_characters.append(character)
-                progress_callback()
-
-            session.execute(character_repository.destroy_others(keep))
-            session.add_all(new_characters)
+            records = session.scalars(chars_query).all()
+            indexed_characters = {c.file_loc: c for c in records}
+            for entry in self.scan_character_files():
+                seen.add(entry.path)
+                stat = entry.stat()
+                record = indexed_characters.get(entry.path)
+                if record and record.file_mtime == stat.st_mtime and record.file_size == stat.st_size:
+                    keep.append(record.id)
+                    continue
+
+                character_path = Path(entry.path)
+                changed_files.append(character_path)
+                stats[character_path] = stat
+
+            parse_cache = self.open_parse_cache()
+            new_characters = self.make_characters(changed_files, progress_callback, workers, stats, parse_cache)
+            if parse_cache:
+                parse_cache.prune(seen)
+                parse_cache.save()
+            kept_ids = set(keep)
+            stale = [record for record in records if record.id not in kept_ids and record.file_loc in seen]
+            self.remove_missing(session, seen)
+            self.store_changes(session, stale, new_characters)
             session.commit()
 
             self.count = len(new_characters) + len(keep)
 
+    def remove_missing(self, session, seen: set[str]):
+        """Delete every character record whose file is not in seen, along with its tags
+
+        The seen paths are written to a temporary table, so that the records to delete can be found with a
+        join instead of a query with one parameter per character. The search and name index rows and the tags
+        go first, then the characters, each in a single statement.
+
+        This does not commit the session. Records which are already loaded in the session are not updated and
+        should not be used afterwards.
+
+        Args:
+            session (Session): Session to run the deletes in
+            seen (set[str]): Path strings of every character file that exists
+        """
+        with self.seen_files(session, seen):
+            if self.search_index_ready(session):
+                session.execute(search_index.destroy_missing())
+            if self.name_index_ready(session):
+                session.execute(name_index.destroy_missing())
+            session.execute(character_repository.destroy_missing_tags())
+            session.execute(character_repository.destroy_missing())
+
+    @contextmanager
+    def seen_files(self, session, paths: set[str]):
+        """Fill the seen_files temporary table for the duration of a block
+
+        Queries that take a set of paths join against this table instead of using one parameter per path. The
+        table is dropped again when the block ends.
+
+        Args:
+            session (Session): Session to create the table in
+            paths (set[str]): Path strings to put in the table
+        """
+        seen_files = character_repository.seen_files
+        connection = session.connection()
+        seen_files.create(connection)
+        try:
+            if paths:
+                session.execute(insert(seen_files), [{"file_loc": path} for path in paths])
+            yield
+        finally:
+            seen_files.drop(connection)
+
+    def store_changes(self, session, records: list[Character], new_characters: list[Character]):
+        """Replace stored character records with newly loaded ones
+
+        Each new character whose file already has a record updates that record in place using
+        character_sync.sync_character(), so only what changed in the file is written and the record keeps its
+        ID. The remaining new characters are inserted using bulk inserts. Records which no new character took
+        over are deleted, along with their tags. The index rows of every one of these characters are replaced
+        as well, using unindex_characters() and index_characters().
+
+        This does not commit the session.
+
+        Args:
+            session (Session): Session the records belong to
+            records (list[Character]): Stored records which are out of date
+            new_characters (list[Character]): New Character objects, not yet added to the db
+        """
+        by_loc: dict[str, Character] = {}
+        leftover: list[Character] = []
+        for record in records:
+            if record.file_loc in by_loc:
+                leftover.append(record)
+            else:
+                by_loc[record.file_loc] = record
+
+        inserts: list[Character] = []
+        synced: list[Character] = []
+        for character in new_characters:
+            record = by_loc.pop(character.file_loc, None)
+            if record is None:
+                inserts.append(character)
+            else:
+                character_sync.sync_character(record, character)
+                synced.append(record)
+
+        doomed = leftover + list(by_loc.values())
+        stale_ids = [record.id for record in doomed + synced]
+        for record in doomed:
+            session.delete(record)
+        session.flush()
+        new_ids = bulk_insert.insert_characters(session, inserts)
+
+        self.unindex_characters(session, stale_ids)
+        self.index_characters(session, [(record.id, record) for record in synced] + list(zip(new_ids, inserts)))
+
+    def index_characters(self, session, characters: list[tuple[int, Character]]):
+        """Add characters to the name index, and to the search index when maintain_search_index is on
+
+        This does not commit the session.
+
+        Args:
+            session (Session): Session to write the index rows in
+            characters (list[tuple[int, Character]]): Pairs of character IDs and the characters to index
+        """
+        if self.name_index_ready(session):
+            name_index.add(session, characters)
+        if self.search_index_ready(session):
+            search_index.add(session, characters)
+            if self.defer_bodies:
+                self.unfilled_bodies = True
+
+    def name_index_ready(self, session) -> bool:
+        """Get whether the name index can be used, creating its table if needed
+
+        The name index needs SQLite's trigram tokenizer. Without it, there is no index and find_by_name()
+        matches substrings of the names instead.
+
+        Args:
+            session (Session): Session which is about to use the index
+
+        Returns:
+            bool: True if the name index exists
+        """
+        return self.db.ensure_virtual_table(session, character_names)
+
+    def search_index_ready(self, session) -> bool:
+        """Get whether the search index should be updated, creating its table if needed
+
+        This is only true when maintain_search_index is on and SQLite has the FTS5 extension.
+
+        Args:
+            session (Session): Session which is about to use the index
+
+        Returns:
+            bool: True if the search index exists and should be kept up to date
+        """
+        return self.maintain_search_index and self.db.ensure_virtual_table(session, character_search)
+
+    def unindex_characters(self, session, ids: list[int]):
+        """Remove characters from the name index, and from the search index when maintain_search_index is on
+
+        This does not commit the session.
+
+        Args:
+            session (Session): Session to delete the index rows in
+            ids (list[int]): IDs of the characters to remove
+        """
+        if self.name_index_ready(session):
+            name_index.remove(session, ids)
+        if self.search_index_ready(session):
+            search_index.remove(session, ids)
+
     def valid_character_files(self) -> Iterator[Path]:
         """Iterate valid character file paths
 
@@ -144,22 +531,194 @@ class CharacterCollection():
         Returns:
             Iterator[Path]: Iterator of valid character files
         """
-        ignore_paths = [self.root / p for p in self.campaign.settings.get("campaign.characters.ignore_subpaths")]
-        def allowed(file_path):
-            if file_path.suffix not in self.allowed_suffixes:
+        for entry in self.scan_character_files():
+            yield Path(entry.path)
+
+    def scan_character_files(self, start: str = None) -> Iterator[os.DirEntry]:
+        """Iterate directory entries for valid character files
+
+        This walks our root dir using os.scandir and yields the entry for every file that has an allowed suffix.
+        Ignored subpaths are skipped before they are opened, so nothing within them is ever read. The entries
+        cache their stat results, which saves a second stat call when checking modification times.
+
+        Symlinked directories are not followed, and directories which cannot be read are skipped.
+
+        Args:
+            start (str): Directory within our root dir to walk instead of the whole thing (default: `None`)
+
+        Returns:
+            Iterator[os.DirEntry]: Iterator of directory entries for valid character files
+        """
+        ignore_paths: set[str] = self.ignore_paths
+        allowed_suffixes: set[str] = self.allowed_suffixes
+
+        def walk(dir_path: str) -> Iterator[os.DirEntry]:
+            try:
+                with os.scandir(dir_path) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        if entry.path in ignore_paths:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1] in allowed_suffixes:
+                            yield entry
+            except OSError:
+                return
+
+            for subdir in subdirs:
+                yield from walk(subdir)
+
+        yield from walk(start if start else str(self.root))
+
+    @property
+    def ignore_paths(self) -> set[str]:
+        """Get the full paths of the ignored subpaths of our root dir
+
+        Returns:
+            set[str]: Set of path strings
+        """
+        return {str(self.root / p) for p in self.campaign.settings.get("campaign.characters.ignore_subpaths")}
+
+    def is_character_file(self, path: str) -> bool:
+        """Check whether a path is a valid character file
+
+        The path must be an existing file with an allowed suffix, within our root dir but outside of every
+        ignored subpath. This gives the same answer as checking whether scan_character_files() would yield it.
+
+        Args:
+            path (str): Path to check
+
+        Returns:
+            bool: True if the path is a valid character file, False if not
+        """
+        if os.path.splitext(path)[1] not in self.allowed_suffixes or not os.path.isfile(path):
+            return False
+
+        root = str(self.root)
+        ignore_paths = self.ignore_paths
+        parent = os.path.dirname(path)
+        while parent != root:
+            if parent in ignore_paths:
+                return False
+            next_parent = os.path.dirname(parent)
+            if next_parent == parent:
                 return False
+            parent = next_parent
+        return True
 
-            for ignore_path in ignore_paths:
-                if file_path.is_relative_to(ignore_path):
-                    return False
+    def apply_changes(self, paths: Iterable[str], *, workers: int = None) -> ChangeSummary:
+        """Update the db for a batch of changed paths
 
-            return True
+        Every valid character file among the paths, or within them, is loaded. Files which already have a
+        record update it in place, and the rest become new records. Every other record whose file is one of the
+        paths, or is within one of them, is deleted. This makes the db match the files on disk for those paths
+        without looking at anything else.
 
-        for character_path in self.root.glob("**/*"):
-            if not allowed(character_path):
-                continue
+        Args:
+            paths (Iterable[str]): Paths of changed files and directories
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
 
-            yield character_path
+        Returns:
+            ChangeSummary: The paths that were loaded and removed
+        """
+        paths = set(map(str, paths))
+        load_paths: set[str] = set()
+        for path in paths:
+            if os.path.isdir(path):
+                load_paths.update(entry.path for entry in self.scan_character_files(path))
+            elif self.is_character_file(path):
+                load_paths.add(path)
+
+        with self.db.session() as session:
+            with self.seen_files(session, paths):
+                records = session.scalars(character_repository.within_seen_files()).all()
+
+            stats: dict[Path, os.stat_result] = {}
+            for path in sorted(load_paths):
+                try:
+                    stats[Path(path)] = os.stat(path)
+                except FileNotFoundError:
+                    continue
+            new_characters = self.make_characters(list(stats.keys()), lambda: None, workers, stats)
+
+            loaded_locs = {str(path) for path in stats.keys()}
+            summary = ChangeSummary(
+                loaded = list(stats.keys()),
+                removed = [record.file_loc for record in records if record.file_loc not in loaded_locs],
+            )
+            self.store_changes(session, records, new_characters)
+            session.commit()
+
+        if summary:
+            self.count = self.count + len(new_characters) - len(records)
+        return summary
+
+    def attach_watcher(self, *, polling: bool = False):
+        """Start tracking changes to the character files between calls to load()
+
+        The db should already match the files when this is called. Afterwards, load() applies whatever has
+        changed since it was last called instead of reading every file. This is meant for long-lived users
+        of the collection, which load characters over and over.
+
+        Args:
+            polling (bool): Whether to scan for changes even when inotify is available (default: `False`)
+        """
+        self.detach_watcher()
+        self.watcher = make_watcher(self, polling=polling)
+
+    def detach_watcher(self):
+        """Stop tracking changes to the character files"""
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
+    def watch(
+        self,
+        callback: Callable = None,
+        *,
+        stop: Event = None,
+        debounce: float = 0.25,
+        interval: float = 1.0,
+        polling: bool = False,
+        workers: int = None):
+        """Keep the db in sync with the character files until stopped
+
+        Changes are picked up using inotify when it is available, or by scanning every interval seconds
+        otherwise. Changes that arrive within debounce seconds of each other are applied together using
+        apply_changes(), so that editors which write a file in several steps only cause one update.
+
+        The db should already match the files when this is called, as from load() or refresh().
+
+        Args:
+            callback (Callable): Optional function that is called with the ChangeSummary of each update
+            stop (Event): Optional event which stops watching when it is set. Without it, this method only
+                returns when interrupted.
+            debounce (float): Seconds to wait for more changes before applying them (default: `0.25`)
+            interval (float): Seconds between checks for changes (default: `1.0`)
+            polling (bool): Whether to scan for changes even when inotify is available (default: `False`)
+            workers (int): Number of worker processes for reading files. Defaults to ingest_workers.
+        """
+        if stop is None:
+            stop = Event()
+
+        watcher = make_watcher(self, polling=polling)
+        pending: set[str] = set()
+        try:
+            while not stop.is_set():
+                changed = watcher.changes(debounce if pending else interval)
+                if changed:
+                    pending.update(changed)
+                    continue
+                if not pending:
+                    continue
+
+                summary = self.apply_changes(pending, workers=workers)
+                pending = set()
+                if summary and callback:
+                    callback(summary)
+        finally:
+            watcher.close()
 
     @cached_property
     def allowed_suffixes(self) -> set[str]:
@@ -175,8 +734,8 @@ class CharacterCollection():
     def create(self, **kwargs) -> int:
         """Make and save a new character object
 
-        The character object is created using the given kwargs and immediately persisted to the database. Our
-        count of total characters is also updated.
+        The character object is created using the given kwargs and immediately persisted to the database, and
+        indexed using index_characters(). Our count of total characters is also updated.
 
         Returns:
             int: ID of the newly created character
@@ -186,6 +745,8 @@ class CharacterCollection():
 
         with self.db.session() as session:
             session.add(character)
+            session.flush()
+            self.index_characters(session, [(character.id, character)])
             session.commit()
 
         self.count += 1
@@ -221,7 +782,8 @@ class CharacterCollection():
     def update(self, id: int, **kwargs):
         """Update a character record's attributes
 
-        This method only allows updating the character's own attributes. Tags are entirely unsupported.
+        This method only allows updating the character's own attributes. Tags are entirely unsupported. The
+        character's index rows are replaced to match.
 
         Args:
             id (int): ID of the character record
@@ -240,8 +802,73 @@ class CharacterCollection():
                 if not hasattr(character, attr):
                     raise AttributeError(name=attr, obj=character)
                 setattr(character, attr, value)
+            self.unindex_characters(session, [id])
+            self.index_characters(session, [(id, character)])
             session.commit()
 
+    def search(self, query: str, limit: int = None) -> list[search_index.SearchResult]:
+        """Find the characters whose text matches some search terms, best matches first
+
+        The realname, mnemonic, description, body, and tag values of each character are searched. Every term
+        must appear for a character to match, and a term ending in * matches any word starting with it.
+
+        When use_search_index is off, the index is not kept up to date as characters are loaded. The first
+        search builds it from the stored records instead, and from then on it is updated along with the
+        records, as described in maintain_search_index. Any deferred bodies which are not yet in the index are
+        read and added to it before searching.
+
+        When SQLite does not have the FTS5 extension, there is no index. The stored records are scanned using
+        search_index.scan() instead, which is slower and does not look in deferred bodies.
+
+        Args:
+            query (str): Search terms
+            limit (int): Maximum number of results. None gets them all. (default: `None`)
+
+        Returns:
+            list[SearchResult]: Matching characters and snippets of their matching text
+        """
+        expression = search_index.match_expression(query)
+        if not expression:
+            return []
+
+        with self.db.session() as session:
+            if not self.db.ensure_virtual_table(session, character_search):
+                rows = session.execute(search_index.scan(query, limit)).all()
+                return [search_index.SearchResult(row[0], row.snippet) for row in rows]
+
+            if not self.maintain_search_index:
+                search_index.rebuild(session)
+                self.search_index_built = True
+                self.unfilled_bodies = True
+            if self.unfilled_bodies:
+                search_index.fill_bodies(session)
+                self.unfilled_bodies = False
+            session.commit()
+            rows = session.execute(search_index.search(expression, limit)).all()
+            return [search_index.SearchResult(row[0], row.snippet) for row in rows]
+
+    def find_by_name(self, fragment: str, limit: int = 10) -> list[Character]:
+        """Find the characters whose name or mnemonic best matches part of a name
+
+        Characters containing the whole fragment come first, followed by ones which share some of its
+        three-letter sequences, so small typos still find the right character. See npc.db.name_index for
+        details. When SQLite has no trigram tokenizer, only the characters containing the whole fragment are
+        found.
+
+        Args:
+            fragment (str): Part of a name or mnemonic
+            limit (int): Maximum number of characters to get. None gets them all. (default: `10`)
+
+        Returns:
+            list[Character]: Matching characters, best matches first
+        """
+        if not fragment.strip():
+            return []
+
+        with self.db.session() as session:
+            indexed = self.name_index_ready(session)
+            return session.scalars(name_index.find(fragment, limit, indexed=indexed)).all()
+
     def apply_query(self, query):
         """Run an arbitrary query against this collection
 
@@ -0,0 +1,54 @@
+"""Helpers for reading many character files at once
+
+These functions read character files into ParsedCharacter objects, either one at a time or spread across
+several worker processes. Creating Character records from the parsed data is left to the caller, since the
+database and campaign objects stay in the main process.
+"""
+
+import os
+from typing import Iterator
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from npc.characters import ParsedCharacter, read_character_file
+
+def resolve_workers(workers: int) -> int:
+    """Get the real number of worker processes to use
+
+    Args:
+        workers (int): Requested number of workers. Zero means one worker per CPU.
+
+    Returns:
+        int: Number of worker processes, always at least 1
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+def parse_character_files(
+    paths: list[Path],
+    workers: int = 1,
+    body: bool = True) -> Iterator[ParsedCharacter]:
+    """Parse character files, optionally using a pool of worker processes
+
+    Results are always yielded in the same order as paths, regardless of how many workers are used. With a
+    single worker, or a single path, the files are parsed in this process.
+
+    Args:
+        paths (list[Path]): Paths of the character files to parse
+        workers (int): Number of worker processes to use. Zero means one worker per CPU. (default: `1`)
+        body (bool): Whether to include the body of each file (default: `True`)
+
+    Yields:
+        ParsedCharacter: Parsed contents of each file, in order
+    """
+    reader = partial(read_character_file, body=body)
+    workers = resolve_workers(workers)
+    if workers == 1 or len(paths) < 2:
+        yield from map(reader, paths)
+        return
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(reader, paths, chunksize=chunksize)
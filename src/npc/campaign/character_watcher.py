@@ -0,0 +1,316 @@
+"""Watchers that report changes to the files in a campaign's characters dir
+
+Both watchers have the same interface: changes() waits for something to happen and returns the paths that
+were created, modified, moved, or deleted. Paths may be files or directories. Turning those paths into
+database changes is left to CharacterCollection.apply_changes().
+
+InotifyWatcher uses the Linux inotify API through ctypes. PollingWatcher works anywhere by comparing the size
+and modification time of every character file between scans. Use make_watcher() to get the best one that is
+available. When inotify cannot watch part of the tree, InotifyWatcher polls that part instead.
+"""
+
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import ctypes
+import ctypes.util
+from pathlib import Path
+from dataclasses import dataclass, field
+
+import logging
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChangeSummary():
+    """Class describing the database changes made from a batch of file changes
+
+    Attributes:
+        loaded: Paths of the character files that were loaded, whether new or changed
+        removed: File locations of the character records that were removed
+    """
+    loaded: list[Path] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.loaded or self.removed)
+
+class PollingWatcher():
+    """Watch character files by scanning the characters dir over and over
+
+    Each scan records the size and modification time of every valid character file. Any file that appears,
+    disappears, or has different values from the last scan is reported as changed.
+
+    Args:
+        collection (CharacterCollection): Collection whose files should be watched
+        start (str): Directory within the characters dir to watch instead of the whole thing (default: `None`)
+    """
+
+    def __init__(self, collection, start: str = None):
+        self.collection = collection
+        self.start = start
+        self.snapshot: dict[str, tuple[int, int]] = self.scan()
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        """Get the current size and modification time of every character file
+
+        Returns:
+            dict[str, tuple[int, int]]: Dict of path strings and their (size, mtime_ns) tuples
+        """
+        snapshot = {}
+        for entry in self.collection.scan_character_files(self.start):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: float = None) -> set[str]:
+        """Wait for timeout seconds, then report what changed since the last call
+
+        Args:
+            timeout (float): Seconds to wait before scanning. None or 0 scans right away.
+
+        Returns:
+            set[str]: Paths of files that were created, modified, or deleted
+        """
+        if timeout:
+            time.sleep(timeout)
+
+        current = self.scan()
+        changed = {
+            path for path in current.keys() | self.snapshot.keys()
+            if current.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        """Stop watching. Polling needs no cleanup."""
+
+class InotifyWatcher():
+    """Watch character files using Linux inotify
+
+    Every directory under the characters dir gets its own watch, apart from ignored subpaths. Directories
+    that are created or moved in are watched as soon as their event is read.
+
+    When the kernel's event queue overflows, the whole characters dir is reported as changed.
+
+    A directory which cannot be watched, such as when the watch limit is reached or permission is denied, is
+    logged and handed to a PollingWatcher along with everything beneath it. Those pollers are checked at least
+    every POLL_INTERVAL seconds.
+    """
+
+    # Longest time in seconds to wait for events before checking the pollers
+    POLL_INTERVAL = 1.0
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE \
+        | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.libc = load_libc()
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.dirs: dict[int, str] = {}
+        self.pollers: dict[str, PollingWatcher] = {}
+        self.ignore_paths = collection.ignore_paths
+        self.add_tree(str(collection.root))
+
+    def add_tree(self, dir_path: str):
+        """Watch a directory and all of its subdirectories
+
+        If the directory cannot be watched, it is polled instead.
+
+        Args:
+            dir_path (str): Path of the directory to watch
+        """
+        if dir_path in self.ignore_paths:
+            return
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            logger.warning(f"Cannot watch {dir_path} with inotify ({os.strerror(err)}), polling it instead")
+            self.pollers[dir_path] = PollingWatcher(self.collection, dir_path)
+            return
+        self.dirs[wd] = dir_path
+
+        try:
+            with os.scandir(dir_path) as entries:
+                subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for subdir in subdirs:
+            self.add_tree(subdir)
+
+    def changes(self, timeout: float = None) -> set[str]:
+        """Wait up to timeout seconds for events, then report the paths they affected
+
+        Changes found by the pollers are reported too.
+
+        Args:
+            timeout (float): Seconds to wait for the first change. None waits forever, 0 does not wait.
+
+        Returns:
+            set[str]: Paths of files and directories that were created, modified, moved, or deleted
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if self.pollers:
+                wait = self.POLL_INTERVAL if wait is None else min(wait, self.POLL_INTERVAL)
+
+            changed = self.read_events(wait)
+            for poller in list(self.pollers.values()):
+                changed.update(poller.changes())
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def read_events(self, timeout: float = None) -> set[str]:
+        """Wait up to timeout seconds for inotify events, then read every one that is ready
+
+        Args:
+            timeout (float): Seconds to wait for the first event. None waits forever, 0 does not wait.
+
+        Returns:
+            set[str]: Paths affected by the events
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as err:
+                if err.errno == errno.EINTR:
+                    continue
+                raise
+            changed.update(self.parse_events(data))
+        return changed
+
+    def parse_events(self, data: bytes) -> set[str]:
+        """Turn a buffer of raw inotify events into changed paths
+
+        Args:
+            data (bytes): Bytes read from the inotify file descriptor
+
+        Returns:
+            set[str]: Paths affected by the events
+        """
+        changed: set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+            offset += name_len
+
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(str(self.collection.root))
+                continue
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+
+            dir_path = self.dirs.get(wd)
+            if dir_path is None:
+                continue
+            path = os.path.join(dir_path, name) if name else dir_path
+            changed.add(path)
+
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self.add_tree(path)
+            elif mask & self.IN_ISDIR and mask & self.IN_MOVED_FROM:
+                self.remove_tree(path)
+        return changed
+
+    def remove_tree(self, dir_path: str):
+        """Stop watching a directory and all of its subdirectories
+
+        This is needed when a directory is moved, since its watches would otherwise keep reporting events
+        under its old path. Pollers within the directory are dropped as well.
+
+        Args:
+            dir_path (str): Path of the directory to stop watching
+        """
+        prefix = dir_path + os.sep
+        for wd, path in list(self.dirs.items()):
+            if path == dir_path or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[wd]
+        for path in list(self.pollers):
+            if path == dir_path or path.startswith(prefix):
+                del self.pollers[path]
+
+    def close(self):
+        """Stop watching and release the inotify file descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+def load_libc():
+    """Load the C library with inotify functions, if there is one
+
+    Returns:
+        ctypes.CDLL: The C library, or None if inotify is not available
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+def inotify_available() -> bool:
+    """Get whether InotifyWatcher can be used on this system
+
+    Returns:
+        bool: True if the inotify functions can be loaded
+    """
+    return load_libc() is not None
+
+def make_watcher(collection, *, polling: bool = False):
+    """Create the best available watcher for a character collection
+
+    Args:
+        collection (CharacterCollection): Collection whose files should be watched
+        polling (bool): Whether to use a PollingWatcher even when inotify is available (default: `False`)
+
+    Returns:
+        InotifyWatcher|PollingWatcher: New watcher object
+    """
+    if not polling and inotify_available():
+        try:
+            return InotifyWatcher(collection)
+        except OSError:
+            pass
+    return PollingWatcher(collection)
@@ -2,5 +2,6 @@ from .character_class import Character
 from .tag_class import Tag, RawTag
 from .character_factory import CharacterFactory
 from .character_tagger import CharacterTagger
-from .character_reader import CharacterReader
+from .character_reader import CharacterReader, ParsedCharacter, read_character_file, read_character_body
+from .parse_cache import ParseCache
 from .writer import CharacterWriter
@@ -1,9 +1,11 @@
 from pathlib import Path
-from sqlalchemy import String, Text, select, Select, Boolean
-from sqlalchemy.orm import Mapped, relationship, mapped_column
+from sqlalchemy import String, Text, select, Select, Boolean, event
+from sqlalchemy.orm import Mapped, relationship, mapped_column, validates
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional
 from .taggable_interface import Taggable
-from .tag_class import Tag
+from .tag_class import Tag, assemble_tree, next_position
+from .character_reader import CharacterReader, read_character_body
 
 from ..db import BaseModel
 
@@ -18,18 +20,25 @@ class Character(BaseModel):
 
     Required Attributes:
         id          int     auto
-        delist      bool    default False
+        delist      bool    default False, indexed
         realname    str
         nolint      bool    default False
         sticky      bool    default False
-        type_key    str     default "unknown"
+        type_key    str     default "unknown", indexed
     Optional Attributes
+        body_offset int
         desc        str
-        file_body   str
+        file_body   str     deferred when body_offset is set
         file_loc    str     indexed
         file_mtime  float
+        file_size   int
+        first_initial   str     set from realname, indexed
+        first_name      str     set from realname, indexed
+        last_initial    str     set from realname, indexed
+        last_name       str     set from realname, indexed
         mnemonic    str
         tags        rel     Tag
+        tag_tree    rel     Tag     read-only, every tag at any depth in path order
     """
 
     # Names of tags which are represented by properties on the Character object, instead of as associated Tags
@@ -47,24 +56,75 @@ class Character(BaseModel):
     __tablename__ = "characters"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    delist: Mapped[bool] = mapped_column(Boolean, default=False)
+    body_offset: Mapped[Optional[int]] = mapped_column()
+    delist: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
     desc: Mapped[Optional[str]] = mapped_column(Text)
-    file_body: Mapped[Optional[str]] = mapped_column(Text)
+    _file_body: Mapped[Optional[str]] = mapped_column("file_body", Text)
     file_loc: Mapped[Optional[str]] = mapped_column(String(1024), index=True)
     file_mtime: Mapped[Optional[float]] = mapped_column(default=0)
+    file_size: Mapped[Optional[int]] = mapped_column()
+    first_initial: Mapped[Optional[str]] = mapped_column(String(1), index=True)
+    first_name: Mapped[Optional[str]] = mapped_column(String(1024), index=True)
+    last_initial: Mapped[Optional[str]] = mapped_column(String(1), index=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String(1024), index=True)
     mnemonic: Mapped[Optional[str]] = mapped_column(String(1024))
     realname: Mapped[str] = mapped_column(String(1024))
     nolint: Mapped[bool] = mapped_column(Boolean, default=False)
     sticky: Mapped[bool] = mapped_column(Boolean, default=False)
     tags: Mapped[List["Tag"]] = relationship(
         back_populates="character",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        foreign_keys="Tag.character_id",
     )
-    type_key: Mapped[str] = mapped_column(String(128), default=DEFAULT_TYPE)
+    tag_tree: Mapped[List["Tag"]] = relationship(
+        foreign_keys="Tag.owner_id",
+        order_by="Tag.path",
+        viewonly=True,
+    )
+    type_key: Mapped[str] = mapped_column(String(128), default=DEFAULT_TYPE, index=True)
 
     def __repr__(self) -> str:
         return f"Character(id={self.id!r}, realname={self.realname!r}, delist={self.delist!r})"
 
+    @staticmethod
+    def name_parts(realname: str) -> dict:
+        """Get the parts of a name which are stored alongside it
+
+        The first and last names are the first and last space-separated words of the name. When the name is a
+        single word, it is both the first and last name. The initials are the first letter of the name and of
+        the last name.
+
+        Args:
+            realname (str): Name to split up
+
+        Returns:
+            dict: Dict of attribute names and values for first_name, last_name, first_initial, and last_initial
+        """
+        words = realname.split() if realname else []
+        first_name = words[0] if words else ""
+        last_name = words[-1] if words else ""
+        return {
+            "first_name": first_name,
+            "last_name": last_name,
+            "first_initial": realname[:1] if realname else "",
+            "last_initial": last_name[:1],
+        }
+
+    @validates("realname")
+    def validate_realname(self, key: str, realname: str) -> str:
+        """Keep the name part attributes in step with realname
+
+        Args:
+            key (str): Name of the attribute being set
+            realname (str): New realname value
+
+        Returns:
+            str: The realname value, unchanged
+        """
+        for attr, value in self.name_parts(realname).items():
+            setattr(self, attr, value)
+        return realname
+
     def accepts_tag(self, tag_name: str) -> bool:
         """Indicate that Character objects accept all tags
 
@@ -79,13 +139,22 @@ class Character(BaseModel):
     def add_tag(self, tag: Tag):
         """Add the tag to our tags list
 
-        Adds the tag to our tags property.
+        Adds the tag to our tags property. It is placed in our tag tree as it is appended.
 
         Args:
             tag (Tag): Tag to add
         """
         self.tags.append(tag)
 
+    def build_tag_tree(self):
+        """Fill in our tags and all of their subtags from the tag_tree relationship
+
+        This turns the single query for tag_tree into the full tree of tags, so that walking the tags and
+        subtags afterward does not need a query for each level. The tag_tree relationship is loaded first if
+        it has not been already.
+        """
+        set_committed_value(self, "tags", assemble_tree(self.tag_tree))
+
     @property
     def name(self) -> str:
         """Get the canonical name of this character
@@ -97,6 +166,54 @@ class Character(BaseModel):
         """
         return self.realname
 
+    @property
+    def file_body(self) -> str:
+        """Get the non-tag contents of the character's file
+
+        When the body was not stored while loading the character, it is read from the character file the
+        first time it is needed and kept from then on. See load_body() for how.
+
+        Returns:
+            str: The file body string
+        """
+        if self._file_body is None and self.body_offset is not None:
+            set_committed_value(self, "_file_body", self.load_body())
+        return self._file_body
+
+    @file_body.setter
+    def file_body(self, new_body: str):
+        """Set the non-tag contents of the character's file
+
+        Args:
+            new_body (str): The new file body string
+        """
+        self._file_body = new_body
+
+    @property
+    def body_deferred(self) -> bool:
+        """Get whether the character's file body has yet to be read
+
+        Returns:
+            bool: True if using file_body would read the body from the character file
+        """
+        return self._file_body is None and self.body_offset is not None
+
+    def load_body(self) -> str:
+        """Read the body of this character's file from disk
+
+        If the file has not been modified since the character was loaded, the body is read starting at
+        body_offset. Otherwise the offset cannot be trusted, so the whole file is parsed again.
+
+        Returns:
+            str: The file body string, or an empty string if the file no longer exists
+        """
+        path = self.file_path
+        if not path.exists():
+            return ""
+        if path.stat().st_mtime == self.file_mtime:
+            return read_character_body(path, self.body_offset)
+        return CharacterReader(path).body()
+
     @property
     def file_path(self) -> Path:
         """Get the character's file location as a Path
@@ -112,7 +229,7 @@ class Character(BaseModel):
     def file_path(self, new_path: Path):
         """Set the character's file location from a Path
 
-        This method also updates the stored file modification time.
+        This method also updates the stored file modification time and size.
 
         It is stronly preferred to use this setter over manipulating file_loc
         directly.
@@ -122,6 +239,24 @@ class Character(BaseModel):
         """
         self.file_loc = str(new_path)
         if new_path and new_path.exists():
-            self.file_mtime = new_path.stat().st_mtime
+            stat = new_path.stat()
+            self.file_mtime = stat.st_mtime
+            self.file_size = stat.st_size
         else:
             self.file_mtime = 0
+            self.file_size = None
+
+@event.listens_for(Character.tags, "append")
+def place_tag(character: Character, tag: Tag, initiator):
+    """Place a new top-level tag in its character's tag tree
+
+    Makes the character the owner of the tag's tree and puts the tag after the last of the character's tags,
+    so a position freed by removing a tag is never reused. This runs for tags added by add_tag() as well as
+    those assigned directly to the tags list.
+
+    Args:
+        character (Character): Character receiving the tag
+        tag (Tag): Tag being appended
+        initiator: SQLAlchemy event token
+    """
+    tag.place(character, "", next_position(character.tags), "")
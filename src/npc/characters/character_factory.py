@@ -17,7 +17,10 @@ class CharacterFactory():
         type_key: str = None,
         mnemonic: str = None,
         body: str = None,
+        body_offset: int = None,
         path: str = None,
+        mtime: float = None,
+        size: int = None,
         desc: str = "",
         tags: list[RawTag] = None,
     ) -> Character:
@@ -34,7 +37,12 @@ class CharacterFactory():
             realname (str): The character's name
             mnemonic (str): A brief reminder of the character to go in its filename (default: `None`)
             body (str): The non-tag contents of the character's file (default: `None`)
+            body_offset (int): Byte offset of the body within the character's file. When body is None, the
+                body is read from here when it is first needed. (default: `None`)
             path (str): The path to the character file location (default: `None`)
+            mtime (float): Modification time of the file at path, if already known. Saves a stat call.
+                (default: `None`)
+            size (int): Size of the file at path in bytes. Only used along with mtime. (default: `None`)
             desc (str): General purpose text in the tag area of the sheet (default: `None`)
             tags (list[RawTag]): List of tag data to parse and add as Tag records (default: `None`)
 
@@ -49,12 +57,18 @@ class CharacterFactory():
             realname=realname,
             mnemonic=mnemonic,
             file_body=body,
+            body_offset=body_offset,
             desc=desc,
             delist=False,
             nolint=False,
             sticky=False,
         )
-        character.file_path = path
+        if mtime is None:
+            character.file_path = path
+        else:
+            character.file_loc = str(path)
+            character.file_mtime = mtime
+            character.file_size = size
 
         tagger = CharacterTagger(self.campaign, character)
         tagger.apply_tags(tags)
@@ -1,6 +1,7 @@
 import re
 from pathlib import Path
 from functools import cache
+from dataclasses import dataclass
 
 from .tag_class import RawTag
 
@@ -14,16 +15,22 @@ class CharacterReader:
 
     CharacterReader objects are intended to be short lived. They cache the result of parsing the file, so any
     changes made after the first read will not be read.
+
+    In header-only mode, the file is read in chunks of CHUNK_SIZE bytes and reading stops at the first
+    section header, so the body is never loaded unless body() is called.
     """
 
     NAME_SEPARATOR = " - "
     SECTION_HEADER_RE = re.compile(r"^--")
     TAG_RE = re.compile(r"^@(?P<name>\w+)(\s+(?P<value>.*))?$")
+    CHUNK_SIZE = 8192
 
-    def __init__(self, character_path: Path):
+    def __init__(self, character_path: Path, *, header_only: bool = False):
         self.character_path: Path = character_path
+        self.header_only: bool = header_only
         self._tags: list[RawTag] = []
         self._body: str = ""
+        self._body_offset: int = None
 
     def name(self) -> str:
         """Get the character name from its filename
@@ -54,13 +61,13 @@ class CharacterReader:
         """Get the tags from our character file
 
         Tags each appear on their own line in the format "@tagname value". If the file has not yet been
-        parsed, parse_file() will be called to collect the tag data.
+        parsed, parse_file() or parse_header() will be called to collect the tag data.
 
         Returns:
             list[RawTag]: List of RawTag objects ready for further work
         """
         if not self._tags:
-            self.parse_file()
+            self.parse()
 
         return self._tags
 
@@ -68,31 +75,168 @@ class CharacterReader:
         """Get the body of our character file
 
         The body is everything that isn't a tag and starts on the first line that looks like a section header.
-        If the file has not yet been parsed, parse_file() will be called to collect the body data.
+        If the file has not yet been parsed, parse_file() will be called to collect the body data. In
+        header-only mode, the body is read starting from body_offset() instead.
 
         Returns:
             str: File body string
         """
         if not self._body:
-            self.parse_file()
+            if self.header_only:
+                self._body = read_character_body(self.character_path, self.body_offset())
+            else:
+                self.parse_file()
 
         return self._body
 
+    def body_offset(self) -> int:
+        """Get the byte offset of the body within our character file
+
+        The offset points to the first character of the section header that starts the body. If the file has
+        not yet been parsed, parse_file() or parse_header() will be called to find it.
+
+        Returns:
+            int: Byte offset of the body, or None if the file has no body
+        """
+        self.parse()
+
+        return self._body_offset
+
+    def parse(self):
+        """Parse the file using the method for our mode
+
+        Calls parse_header() in header-only mode, and parse_file() otherwise.
+        """
+        if self.header_only:
+            self.parse_header()
+        else:
+            self.parse_file()
+
     @cache
     def parse_file(self):
         """Parse the file into tags and body"""
         with self.character_path.open('r', newline="\n", encoding="utf-8") as file:
-            for line in file:
-                line = line.strip()
-
-                if not line:
-                    continue
+            offset = 0
+            for raw_line in file:
+                line_start = offset
+                offset += len(raw_line.encode("utf-8"))
 
-                if self.SECTION_HEADER_RE.match(line):
-                    self._body = line + file.read()
+                if self._read_header_line(raw_line, line_start):
+                    self._body = raw_line.strip() + file.read()
                     return
 
-                if match := self.TAG_RE.match(line):
-                    self._tags.append(RawTag(match.group("name"), match.group("value")))
-                else:
-                    self._tags.append(RawTag("description", line))
+    @cache
+    def parse_header(self):
+        """Parse the tags of the file, without reading its body
+
+        The file is read in binary chunks of CHUNK_SIZE bytes and split into lines. Reading stops as soon as
+        the first section header is found, so at most one chunk past the end of the tags is ever loaded.
+        """
+        with self.character_path.open('rb') as file:
+            offset = 0
+            pending = b""
+            while chunk := file.read(self.CHUNK_SIZE):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for raw_line in lines:
+                    if self._read_header_line(raw_line.decode("utf-8"), offset):
+                        return
+                    offset += len(raw_line) + 1
+            if pending:
+                self._read_header_line(pending.decode("utf-8"), offset)
+
+    def _read_header_line(self, raw_line: str, line_start: int) -> bool:
+        """Handle a single line from the tag section of the file
+
+        Blank lines are skipped. Tag lines and description lines are added to our tags. A section header
+        line sets our body offset.
+
+        Args:
+            raw_line (str): Line of text, with any surrounding whitespace intact
+            line_start (int): Byte offset of the start of the line within the file
+
+        Returns:
+            bool: True if the line is a section header, False if not
+        """
+        line = raw_line.strip()
+
+        if not line:
+            return False
+
+        if self.SECTION_HEADER_RE.match(line):
+            indent = raw_line[:len(raw_line) - len(raw_line.lstrip())]
+            self._body_offset = line_start + len(indent.encode("utf-8"))
+            return True
+
+        if match := self.TAG_RE.match(line):
+            self._tags.append(RawTag(match.group("name"), match.group("value")))
+        else:
+            self._tags.append(RawTag("description", line))
+        return False
+
+@dataclass
+class ParsedCharacter():
+    """Class for passing the parsed contents of a character file
+
+    This holds everything CharacterReader extracts from a single file, in a form that can be sent between
+    processes. It is meant to be turned into a Character object using CharacterFactory.
+
+    Attributes:
+        path: Path to the character file
+        realname: Character name from the filename
+        mnemonic: Character mnemonic from the filename
+        tags: Raw tags from the file, in file order
+        body: Body of the file, starting with the first section header. None if the body was not read.
+        body_offset: Byte offset of the body within the file, or None if there is no body
+    """
+    path: Path
+    realname: str
+    mnemonic: str
+    tags: list[RawTag]
+    body: str
+    body_offset: int = None
+
+def read_character_body(character_path: Path, body_offset: int) -> str:
+    """Read the body of a character file, starting from a known offset
+
+    This produces the same string as CharacterReader.body() without parsing any of the tags that come before
+    the body.
+
+    Args:
+        character_path (Path): Path to the character file
+        body_offset (int): Byte offset of the body, as found by CharacterReader.body_offset()
+
+    Returns:
+        str: File body string, or an empty string if body_offset is None
+    """
+    if body_offset is None:
+        return ""
+
+    with character_path.open('rb') as file:
+        file.seek(body_offset)
+        contents = file.read().decode("utf-8")
+    header, newline, rest = contents.partition("\n")
+    return header.strip() + rest
+
+def read_character_file(character_path: Path, body: bool = True) -> ParsedCharacter:
+    """Parse a single character file into plain data
+
+    This is a module-level function so that it can be handed to worker processes.
+
+    Args:
+        character_path (Path): Path to the character file
+        body (bool): Whether to include the body. When False, the body is None unless the file has no body
+            at all, in which case it is an empty string. (default: `True`)
+
+    Returns:
+        ParsedCharacter: The parsed contents of the file
+    """
+    reader = CharacterReader(character_path, header_only=not body)
+    return ParsedCharacter(
+        path = character_path,
+        realname = reader.name(),
+        mnemonic = reader.mnemonic(),
+        tags = reader.tags(),
+        body = reader.body() if body or reader.body_offset() is None else None,
+        body_offset = reader.body_offset(),
+    )
@@ -0,0 +1,214 @@
+import os
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import NamedTuple
+from sqlalchemy import create_engine, bindparam, select, delete, insert, MetaData, Table, Column, String, Text, Integer
+from sqlalchemy.pool import SingletonThreadPool
+
+from .tag_class import RawTag
+from .character_reader import CharacterReader, ParsedCharacter, read_character_body
+from npc import __version__ as npc_version
+
+metadata = MetaData()
+
+parsed_files = Table(
+    "parsed_files",
+    metadata,
+    Column("path", Text, primary_key=True),
+    Column("size", Integer, nullable=False),
+    Column("mtime_ns", Integer, nullable=False),
+    Column("realname", Text, nullable=False),
+    Column("mnemonic", Text, nullable=False),
+    Column("tags", Text, nullable=False),
+    Column("body_offset", Integer),
+)
+
+cache_meta = Table(
+    "cache_meta",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("value", Text),
+)
+
+class CacheEntry(NamedTuple):
+    """Stored parse results for a single character file"""
+    size: int
+    mtime_ns: int
+    realname: str
+    mnemonic: str
+    tags: str
+    body_offset: int
+
+class ParseCache():
+    """Persistent cache of parsed character files
+
+    The cache remembers what CharacterReader found in each file, keyed by the file's path. An entry is used
+    without opening the file when the file's size and modification time still match. Any other file is
+    parsed again, so a file is never read just to find out whether its entry can be used. Only the body is
+    ever read from a cached file, starting at its stored offset.
+
+    Everything in the cache is thrown out when the package version or the reader's parsing rules change.
+
+    Lookups and new entries are held in memory until save() is called.
+    """
+
+    FILENAME = "parsed_files.sqlite"
+    FORMAT = 2
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.engine = create_engine(f"sqlite:///{db_path}", poolclass=SingletonThreadPool)
+        metadata.create_all(self.engine)
+        if self.stored_version != self.version_key():
+            metadata.drop_all(self.engine)
+            metadata.create_all(self.engine)
+            self.clear()
+
+        self._entries: dict[str, CacheEntry] = None
+        self._changed: dict[str, CacheEntry] = {}
+        self._removed: set[str] = set()
+
+    @classmethod
+    def version_key(cls) -> str:
+        """Get a key for the rules used to parse character files
+
+        This covers the package version, the patterns CharacterReader uses to find tags and section headers,
+        the separator between name and mnemonic, and the layout of the cache itself.
+
+        Returns:
+            str: Hex digest of the parsing rules
+        """
+        data = [
+            cls.FORMAT,
+            npc_version,
+            CharacterReader.NAME_SEPARATOR,
+            CharacterReader.TAG_RE.pattern,
+            CharacterReader.TAG_RE.flags,
+            CharacterReader.SECTION_HEADER_RE.pattern,
+            CharacterReader.SECTION_HEADER_RE.flags,
+        ]
+        return sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+    @property
+    def stored_version(self) -> str:
+        """Get the version key stored in the cache file
+
+        Returns:
+            str: Stored version key, or None if the cache is new
+        """
+        query = select(cache_meta.c.value).where(cache_meta.c.key == "version")
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    def clear(self):
+        """Remove every entry from the cache and store the current version key"""
+        with self.engine.begin() as conn:
+            conn.execute(delete(parsed_files))
+            conn.execute(delete(cache_meta))
+            conn.execute(insert(cache_meta).values(key="version", value=self.version_key()))
+        self._entries = None
+
+    @property
+    def entries(self) -> dict[str, CacheEntry]:
+        """Get all stored entries, loading them on first use
+
+        Returns:
+            dict[str, CacheEntry]: Dict of file path strings and their cache entries
+        """
+        if self._entries is None:
+            query = select(
+                parsed_files.c.path,
+                parsed_files.c.size,
+                parsed_files.c.mtime_ns,
+                parsed_files.c.realname,
+                parsed_files.c.mnemonic,
+                parsed_files.c.tags,
+                parsed_files.c.body_offset,
+            )
+            with self.engine.connect() as conn:
+                self._entries = {row[0]: CacheEntry(*row[1:]) for row in conn.execute(query)}
+        return self._entries
+
+    def lookup(self, path: Path, stat: os.stat_result, body: bool = True) -> ParsedCharacter:
+        """Get the cached parse results for a file
+
+        A file whose path, size, and modification time match an entry is not opened at all, apart from reading
+        its body.
+
+        Args:
+            path (Path): Path to the character file
+            stat (os.stat_result): Current stat result for the file
+            body (bool): Whether to read the body from the file (default: `True`)
+
+        Returns:
+            ParsedCharacter: The cached contents of the file, or None if the file must be parsed
+        """
+        entry = self.entries.get(str(path))
+        if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return self._make_parsed(path, entry, body)
+        return None
+
+    def store(self, parsed: ParsedCharacter, stat: os.stat_result):
+        """Remember the parse results for a file
+
+        Args:
+            parsed (ParsedCharacter): Parsed file contents
+            stat (os.stat_result): Stat result for the file when it was parsed
+        """
+        entry = CacheEntry(
+            size = stat.st_size,
+            mtime_ns = stat.st_mtime_ns,
+            realname = parsed.realname,
+            mnemonic = parsed.mnemonic,
+            tags = json.dumps([[tag.name, tag.value] for tag in parsed.tags]),
+            body_offset = parsed.body_offset,
+        )
+        self._changed[str(parsed.path)] = entry
+
+    def prune(self, paths: set[str]):
+        """Forget every file that is not in paths
+
+        This is how entries for deleted and renamed files are evicted.
+
+        Args:
+            paths (set[str]): Path strings of every character file that still exists
+        """
+        self._removed.update(self.entries.keys() - paths)
+
+    def save(self):
+        """Write all new, changed, and removed entries to the cache file"""
+        with self.engine.begin() as conn:
+            if self._removed:
+                conn.execute(
+                    delete(parsed_files).where(parsed_files.c.path == bindparam("removed_path")),
+                    [{"removed_path": path} for path in self._removed],
+                )
+            if self._changed:
+                conn.execute(
+                    insert(parsed_files).prefix_with("OR REPLACE"),
+                    [{"path": path, **entry._asdict()} for path, entry in self._changed.items()],
+                )
+        self._entries = None
+        self._changed = {}
+        self._removed = set()
+
+    def _make_parsed(self, path: Path, entry: CacheEntry, body: bool) -> ParsedCharacter:
+        """Turn a cache entry into the same ParsedCharacter that the file would give
+
+        Args:
+            path (Path): Path to the character file
+            entry (CacheEntry): Stored entry for the file
+            body (bool): Whether to read the body from the file
+
+        Returns:
+            ParsedCharacter: Parsed contents of the file
+        """
+        return ParsedCharacter(
+            path = path,
+            realname = entry.realname,
+            mnemonic = entry.mnemonic,
+            tags = [RawTag(name, value) for name, value in json.loads(entry.tags)],
+            body = read_character_body(path, entry.body_offset) if body or entry.body_offset is None else None,
+            body_offset = entry.body_offset,
+        )
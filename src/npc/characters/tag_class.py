@@ -1,5 +1,6 @@
-from sqlalchemy import String, Text, ForeignKey
+from sqlalchemy import String, Text, ForeignKey, Index, event
 from sqlalchemy.orm import Mapped, relationship, mapped_column
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional, Union
 from dataclasses import dataclass
 
@@ -12,6 +13,12 @@ class Tag(BaseModel):
 
     Holds a single value for a single tag belonging to a single character.
 
+    Besides the parent_tag_id link, every tag stores its place in its character's tag tree as a materialized
+    path. The owner is the character at the root of the tree, the path is the tag's position among its
+    siblings appended to its parent's path, and the name_path is the names of the tag's parents followed by
+    its own name. These are filled in whenever a tag is appended to a character's tags or to another tag's
+    subtags, so that a character's whole tag tree can be fetched with one query ordered by path.
+
     Required Attributes:
         id              int (auto)
         name            str
@@ -22,13 +29,43 @@ class Tag(BaseModel):
         subtags         rel     Tag
         parent_tag_id   int
         hidden          str     [None, "all", "one"]
+        owner           rel     Character
+        owner_id        int
+        path            str     like "00002.00000", sorts in file order
+        name_path       str     like "org>>role"
+
+    Indexes:
+        (character_id, name)            tags of one character, optionally by name, in id order
+        (name, value, name_path)        value counts for a tag, and for a subtag under a named parent
+        (parent_tag_id)                 subtags of a tag
+        (owner_id, path)                whole tag tree of one character, in file order
     """
 
+    # Separator between the parts of path and name_path
+    PATH_SEPARATOR = "."
+    NAME_PATH_SEPARATOR = ">>"
+
+    # Width of each zero-padded position in a path
+    PATH_WIDTH = 5
+
     __tablename__ = "tags"
+    __table_args__ = (
+        Index("ix_tags_character_id_name", "character_id", "name"),
+        Index("ix_tags_name_value_name_path", "name", "value", "name_path"),
+        Index("ix_tags_parent_tag_id", "parent_tag_id"),
+        Index("ix_tags_owner_id_path", "owner_id", "path"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    character: Mapped[Optional["Character"]] = relationship(back_populates="tags") # noqa: F821
+    character: Mapped[Optional["Character"]] = relationship( # noqa: F821
+        back_populates="tags",
+        foreign_keys="Tag.character_id",
+    )
     character_id: Mapped[Optional[int]] = mapped_column(ForeignKey("characters.id"))
+    owner: Mapped[Optional["Character"]] = relationship(foreign_keys="Tag.owner_id") # noqa: F821
+    owner_id: Mapped[Optional[int]] = mapped_column(ForeignKey("characters.id"))
+    path: Mapped[Optional[str]] = mapped_column(String(1024))
+    name_path: Mapped[Optional[str]] = mapped_column(String(1024))
     name: Mapped[str] = mapped_column(String(100))
     value: Mapped[Optional[str]] = mapped_column(Text)
     subtags: Mapped[Optional[List["Tag"]]] = relationship(
@@ -54,11 +91,47 @@ class Tag(BaseModel):
     def add_tag(self, tag: "Tag"):
         """Add the given tag to our subtags
 
+        The new subtag is placed under this tag as it is appended.
+
         Args:
             tag (Tag): The tag to add
         """
         self.subtags.append(tag)
 
+    @property
+    def position(self) -> Optional[int]:
+        """Get the position of this tag among its siblings
+
+        Returns:
+            Optional[int]: The last part of our path, or None if we have not been placed
+        """
+        if self.path is None:
+            return None
+        return int(self.path.rsplit(self.PATH_SEPARATOR, 1)[-1])
+
+    def place(self, owner, path_prefix: str, position: int, name_prefix: str):
+        """Set the materialized path attributes of this tag
+
+        Subtags which were added before this tag was placed are placed again beneath it, keeping their
+        positions.
+
+        Args:
+            owner (Character): Character at the root of the tag tree
+            path_prefix (str): Path of the parent tag plus a separator, or "" for a top-level tag
+            position (int): Position of this tag among its siblings
+            name_prefix (str): Name path of the parent tag plus a separator, or "" for a top-level tag
+        """
+        self.owner = owner
+        self.path = f"{path_prefix}{position:0{self.PATH_WIDTH}d}"
+        self.name_path = name_prefix + self.name
+        for index, subtag in enumerate(self.subtags):
+            subtag.place(
+                owner,
+                self.path + self.PATH_SEPARATOR,
+                index if subtag.position is None else subtag.position,
+                self.name_path + self.NAME_PATH_SEPARATOR,
+            )
+
     def emit(self) -> str:
         """Generate a parseable representation of this tag and its subtags
 
@@ -79,6 +152,64 @@ class Tag(BaseModel):
 
         return "\n".join(lines)
 
+def assemble_tree(tags: list[Tag]) -> list[Tag]:
+    """Fill in the subtags of every tag in a flat list, without loading anything
+
+    The subtags relationships are set as if they had been loaded from the database, so reading them later
+    does not run any queries. Tags must be given in path order, which puts every tag after its parent and
+    keeps siblings in file order.
+
+    Args:
+        tags (list[Tag]): Every tag in one or more tag trees, ordered by path
+
+    Returns:
+        list[Tag]: The top-level tags, in order
+    """
+    children: dict[int, list[Tag]] = {tag.id: [] for tag in tags}
+    roots: list[Tag] = []
+    for tag in tags:
+        children.get(tag.parent_tag_id, roots).append(tag)
+    for tag in tags:
+        set_committed_value(tag, "subtags", children[tag.id])
+    return roots
+
+@event.listens_for(Tag.subtags, "append")
+def place_subtag(tag: Tag, subtag: Tag, initiator):
+    """Place a new subtag in its parent's tag tree
+
+    The subtag gets its parent's owner, and its path and name_path are built from its parent's. It goes after
+    the last of its siblings, so a position freed by removing a subtag is never reused. When the parent has
+    not been placed in a tree itself, its name stands in for its name_path.
+
+    This runs for subtags added by add_tag() as well as those assigned directly to the subtags list.
+
+    Args:
+        tag (Tag): The parent tag
+        subtag (Tag): The subtag being appended
+        initiator: SQLAlchemy event token
+    """
+    subtag.place(
+        tag.owner,
+        (tag.path or "") + Tag.PATH_SEPARATOR,
+        next_position(tag.subtags),
+        (tag.name_path or tag.name) + Tag.NAME_PATH_SEPARATOR,
+    )
+
+def next_position(siblings: list[Tag]) -> int:
+    """Get the position for a tag added after the given siblings
+
+    This is one past the highest position among the siblings. Siblings which have not been placed count by
+    their index in the list.
+
+    Args:
+        siblings (list[Tag]): Tags already in the list the new tag is joining
+
+    Returns:
+        int: Position for the new tag
+    """
+    positions = [index if tag.position is None else tag.position for index, tag in enumerate(siblings)]
+    return max(positions, default=-1) + 1
+
 @dataclass
 class RawTag():
     """Class for passing raw tag data
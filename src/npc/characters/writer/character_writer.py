@@ -1,5 +1,5 @@
 from npc.characters.character_class import Character
-from npc.characters.tag_class import Tag
+from npc.characters.tag_class import Tag, assemble_tree
 from npc.db import DB, character_repository
 from .helpers import *
 
@@ -14,12 +14,14 @@ class CharacterWriter:
         """Write the contents of a character file
 
         Opens the file at character.file_path, creating it if necessary, and writes the output of
-        tag_strings along with the character.file_body string.
+        tag_strings along with the character.file_body string. The body is fetched before the file is opened,
+        since a deferred body is read from the very file that is about to be overwritten.
 
         Args:
             character (Character): [description]
         """
         contents = self.tag_strings(character)
+        body = character.file_body
         dest = character.file_path
 
         dest.touch(exist_ok=True)
@@ -27,7 +29,7 @@ class CharacterWriter:
         with dest.open('w', newline="\n", encoding="utf-8") as char_file:
             char_file.write(contents)
             char_file.write("\n\n")
-            char_file.write(character.file_body)
+            char_file.write(body)
 
     def tag_strings(self, character: Character) -> str:
         """Create the contents of the tag section for a character file
@@ -36,6 +38,9 @@ class CharacterWriter:
         excluded from future output. Then, the character's tag records, contags, and metatags are emitted
         using the block definitions and order in the campaign settings.
 
+        The character's whole tag tree is loaded with a single query. Everything else is worked out from
+        those tags in memory.
+
         Args:
             character (Character): Character we're generating for
 
@@ -52,9 +57,16 @@ class CharacterWriter:
         chunks: list[str] = []
         rest_index: int = None
 
+        with self.db.session() as session:
+            tree: list[Tag] = session.scalars(character_repository.tag_tree(character)).all()
+        roots: list[Tag] = assemble_tree(tree)
+        character_tags: list[Tag] = sorted(
+            (tag for tag in tree if tag.character_id == character.id),
+            key=lambda tag: tag.id)
+
         handled_tag_ids: list[int] = []
         constructed_tags: dict[str, list] = make_contags(character)
-        if hide_tags := make_hide_tags(character):
+        if hide_tags := make_hide_tags(character, tags=roots):
             constructed_tags["hide"] = hide_tags
 
         # always begin with the character description
@@ -63,7 +75,7 @@ class CharacterWriter:
 
         # metatags always preceed standard tags
         for metatag_def in self.campaign.metatags.values():
-            metatags = make_metatags(metatag_def, character, handled_tag_ids)
+            metatags = make_metatags(metatag_def, character, handled_tag_ids, tags=character_tags)
             for metatag in metatags:
                 if metatag.name not in constructed_tags:
                     constructed_tags[metatag.name] = []
@@ -87,10 +99,7 @@ class CharacterWriter:
                     tags.extend(constructed_tags.pop(key))
 
             # get normal tags
-            tags_query = character_repository.tags_by_name(character, *block_def)
-            tags_query.where(Tag.id.not_in(handled_tag_ids))
-            with self.db.session() as session:
-                tags.extend(session.scalars(tags_query).all())
+            tags.extend(tag for tag in character_tags if tag.name in block_def)
 
             if len(tags):
                 chunks.append("")
@@ -98,9 +107,7 @@ class CharacterWriter:
                 handled_tag_ids.extend([tag.id for tag in tags if tag.id])
 
         # now that everything explicitly listed has been handled, insert the remaining tags at rest_index
-        remainder_query = character_repository.tags(character).where(Tag.id.not_in(handled_tag_ids))
-        with self.db.session() as session:
-            remainder_result = session.scalars(remainder_query).all()
+        remainder_result = unhandled_tags(character_tags, handled_tag_ids)
 
         if len(constructed_tags) or len(remainder_result):
             if rest_index is None:
@@ -1,8 +1,8 @@
 from npc.settings import MetatagSpec
 from npc.db import DB
-from npc.db.character_repository import tags_by_name, tags
+from npc.db.character_repository import tags_by_name, tag_tree
 from npc.characters.character_class import Character
-from npc.characters.tag_class import Tag
+from npc.characters.tag_class import Tag, assemble_tree
 from .con_tag_class import ConTag
 from .metatag_class import Metatag
 
@@ -50,14 +50,36 @@ def make_contags(character: Character) -> dict:
 
     return tags
 
-def make_hide_tags(character: Character, *, db: DB = None) -> list[ConTag]:
+def unhandled_tags(tags: list[Tag], handled_ids: list[int]) -> list[Tag]:
+    """Get the tags whose IDs have not been handled yet
+
+    This filters the same way as the SQL clause "Tag.id NOT IN handled_ids", so that tags filtered in memory
+    match those from a query. That includes SQL's treatment of NULL: once a None ID has been handled, no tag
+    passes the filter.
+
+    Args:
+        tags (list[Tag]): Tags to filter
+        handled_ids (list[int]): Tag IDs to exclude
+
+    Returns:
+        list[Tag]: The tags whose IDs are not in handled_ids, in their original order
+    """
+    if None in handled_ids:
+        return []
+    handled = set(handled_ids)
+    return [tag for tag in tags if tag.id not in handled]
+
+def make_hide_tags(character: Character, *, db: DB = None, tags: list[Tag] = None) -> list[ConTag]:
     """Construct special @hide tags from tag hidden attributes
 
-    Generates ConTag objects used to emit hide tags which affect the hidden attribute of tag records.
+    Generates ConTag objects used to emit hide tags which affect the hidden attribute of tag records. The
+    character's whole tag tree is fetched with a single query, unless its top-level tags are passed in.
 
     Args:
         character (Character): Character whose tags will be inspected
         db (DB): Database to use for fetching the character's tag records (default: `None`)
+        tags (list[Tag]): The character's top-level tags in path order, with their subtags already assembled.
+            When given, no query is made. (default: `None`)
 
     Returns:
         set[ConTag]: [description]
@@ -76,17 +98,26 @@ def make_hide_tags(character: Character, *, db: DB = None) -> list[ConTag]:
 
         return hide_tags
 
+    if tags is not None:
+        return list(build_hides(tags))
+
     if not db:
         db = DB()
 
-    stmt = tags(character)
+    stmt = tag_tree(character)
     with db.session() as session:
-        result = session.scalars(stmt)
-        hide_tags = build_hides(result)
+        result = session.scalars(stmt).all()
+        hide_tags = build_hides(assemble_tree(result))
 
     return list(hide_tags)
 
-def make_metatags(spec: MetatagSpec, character: Character, handled_ids: list[int], *, db: DB = None) -> list:
+def make_metatags(
+    spec: MetatagSpec,
+    character: Character,
+    handled_ids: list[int],
+    *,
+    db: DB = None,
+    tags: list[Tag] = None) -> list:
     """Construct one or more Metatag objects using the given spec and character
 
     Args:
@@ -94,6 +125,8 @@ def make_metatags(spec: MetatagSpec, character: Character, handled_ids: list[int
         character (Character): Character to use for tags
         handled_ids (list[int]): List of tag IDs to exclude
         db (DB): Database object for the tag query (default: `None`)
+        tags (list[Tag]): The character's top-level tags in ID order, with their subtags already assembled.
+            When given, they are filtered in memory instead of queried. (default: `None`)
 
     Returns:
         list: [description]
@@ -110,18 +143,23 @@ def make_metatags(spec: MetatagSpec, character: Character, handled_ids: list[int
         for contag in contag_list:
             metatag.consider(contag)
 
-    stmt = tags_by_name(character, *spec.required_tag_names).where(Tag.id.not_in(handled_ids))
-    with db.session() as session:
-        result = session.scalars(stmt)
-        for tag in result:
+    if tags is not None:
+        candidates = [tag for tag in tags if tag.name in spec.required_tag_names]
+        for tag in unhandled_tags(candidates, handled_ids):
             metatag.consider(tag)
+    else:
+        stmt = tags_by_name(character, *spec.required_tag_names).where(Tag.id.not_in(handled_ids))
+        with db.session() as session:
+            result = session.scalars(stmt)
+            for tag in result:
+                metatag.consider(tag)
 
     if not metatag.satisfied():
         return metatags
 
     metatags.append(metatag)
     if spec.greedy:
-        next_metatags = make_metatags(spec, character, handled_ids + metatag.tag_ids)
+        next_metatags = make_metatags(spec, character, handled_ids + metatag.tag_ids, db=db, tags=tags)
         metatags.extend(next_metatags)
 
     return metatags
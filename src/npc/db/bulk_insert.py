@@ -0,0 +1,106 @@
+"""Fast insertion of many new characters and their tags
+
+Adding new Character objects to a session makes the ORM flush them a row at a time, since subtags need the
+generated ID of their parent tag. These helpers assign all of the IDs ahead of time instead, so that every
+character and tag row can be written with a single executemany statement apiece.
+"""
+
+from sqlalchemy import insert, select, func, inspect, Table
+from sqlalchemy.orm import Session
+
+from npc.characters import Character, Tag
+
+def column_values(record) -> dict:
+    """Get the column values of an unsaved record as a dict
+
+    Values are read through the mapped attributes, which do not always share their column's name. Columns
+    whose value is None get their scalar default instead, the same as the ORM does on flush.
+
+    Args:
+        record (BaseModel): Record to read from
+
+    Returns:
+        dict: Dict of column names and values
+    """
+    values = {}
+    for attr in inspect(type(record)).column_attrs:
+        column = attr.columns[0]
+        value = getattr(record, attr.key)
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        values[column.key] = value
+    return values
+
+def next_id(session: Session, table: Table) -> int:
+    """Get the first unused primary key for a table
+
+    Args:
+        session (Session): Session to query with
+        table (Table): Table to check
+
+    Returns:
+        int: One more than the highest id in the table
+    """
+    return (session.scalar(select(func.max(table.c.id))) or 0) + 1
+
+def insert_characters(session: Session, characters: list[Character]) -> list[int]:
+    """Insert new characters and all of their tags using one executemany per table
+
+    The characters must not have been added to a session. They are left untouched by this function, so the
+    returned IDs are the only link between them and their new records.
+
+    Tag IDs are handed out one level of nesting at a time across all of the characters, which is the same
+    order the ORM uses when flushing a batch of new characters. Top-level tags get the character_id of their
+    character, while subtags only get the parent_tag_id of their parent. Every tag gets its character as its
+    owner_id.
+
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to execute the inserts in
+        characters (list[Character]): New Character objects to insert
+
+    Returns:
+        list[int]: IDs of the new character records, in the same order as characters
+    """
+    if not characters:
+        return []
+
+    character_table = Character.__table__
+    tag_table = Tag.__table__
+
+    character_ids: list[int] = []
+    character_rows: list[dict] = []
+    current_id = next_id(session, character_table)
+    for character in characters:
+        row = column_values(character)
+        row["id"] = current_id
+        character_rows.append(row)
+        character_ids.append(current_id)
+        current_id += 1
+
+    tag_rows: list[dict] = []
+    current_id = next_id(session, tag_table)
+    level: list[tuple] = [
+        (tag, character_id, character_id, None)
+        for character, character_id in zip(characters, character_ids)
+        for tag in character.tags
+    ]
+    while level:
+        next_level: list[tuple] = []
+        for tag, character_id, owner_id, parent_id in level:
+            row = column_values(tag)
+            row["id"] = current_id
+            row["character_id"] = character_id
+            row["owner_id"] = owner_id
+            row["parent_tag_id"] = parent_id
+            tag_rows.append(row)
+            next_level.extend((subtag, None, owner_id, current_id) for subtag in tag.subtags)
+            current_id += 1
+        level = next_level
+
+    session.execute(insert(character_table), character_rows)
+    if tag_rows:
+        session.execute(insert(tag_table), tag_rows)
+
+    return character_ids
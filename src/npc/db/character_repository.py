@@ -3,10 +3,21 @@
 These queries get data that's related to a character or its tags.
 """
 
-from sqlalchemy import desc, Exists, func, select, Select, update, Update, delete, Delete
+import os
+from sqlalchemy import desc, Exists, func, select, Select, update, Update, delete, Delete, exists, or_, and_
+from sqlalchemy import MetaData, Table, Column, String
 from sqlalchemy.orm import selectinload
 from npc.characters import Tag, Character
 
+# Temporary table of the character files found by a scan. It lives outside of BaseModel's metadata so that it
+# is never part of the stored schema.
+seen_files = Table(
+    "seen_files",
+    MetaData(),
+    Column("file_loc", String(1024), primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
 def tag_values_by_name(character: Character, *names: str) -> Select:
     """Create a database query to get values for a single character's tags
 
@@ -55,6 +66,23 @@ def tags(character: Character) -> Select:
         .filter(Tag.character_id == character.id) \
         .order_by(Tag.id)
 
+def tag_tree(character: Character) -> Select:
+    """Create a db query to get every Tag record in a character's tag tree
+
+    Builds a query for the tags and subtags at every depth, scoped to the given character and ordered by
+    path. That puts each tag right after its parent, with siblings in file order. Pass the result to
+    npc.characters.tag_class.assemble_tree() to fill in the subtags of each tag without further queries.
+
+    Args:
+        character (Character): Character whose tags to query
+
+    Returns:
+        Select: Select object for the tag query
+    """
+    return select(Tag) \
+        .where(Tag.owner_id == character.id) \
+        .order_by(Tag.path)
+
 def has_tags(character: Character, *names: str) -> Select:
     """Create a db query to get whether the named Tag records exist for a character
 
@@ -82,13 +110,16 @@ def all() -> Select:
     return select(Character)
 
 def all_with_tags() -> Select:
-    """Create a db query to get all Character records and eager-load their tags
+    """Create a db query to get all Character records and eager-load their tag trees
+
+    The tag_tree relationship is loaded instead of tags, so that every tag at every depth is fetched at once.
+    Call build_tag_tree() on each character to fill in its tags and subtags from it.
 
     Returns:
-        Select: Select object for the character query with eager loading of the tags relationship
+        Select: Select object for the character query with eager loading of the tag_tree relationship
     """
     return all() \
-        .options(selectinload(Character.tags))
+        .options(selectinload(Character.tag_tree))
 
 def get(id: int) -> Select:
     """Create a db query to get a single Character record
@@ -136,6 +167,57 @@ def destroy_others(keep_ids: list[int]) -> Delete:
     return delete(Character) \
         .where(Character.id.not_in(keep_ids))
 
+def missing_ids() -> Select:
+    """Create a db query to get the IDs of Character records whose file is not in the seen_files table
+
+    Records without a file location are always included.
+
+    Returns:
+        Select: Select object for the character id query
+    """
+    return select(Character.id) \
+        .where(~exists().where(seen_files.c.file_loc == Character.file_loc))
+
+def within_seen_files() -> Select:
+    """Create a db query to get every Character record whose file is in the seen_files table, or within one
+
+    A record matches when its file is a path in the table, or when it is inside a directory in the table. The
+    directory test is a range over the paths which start with the directory and a separator, so it needs no
+    escaping for LIKE and can use the file_loc index.
+
+    Returns:
+        Select: Select object for the character query
+    """
+    dir_start = seen_files.c.file_loc + os.sep
+    dir_end = seen_files.c.file_loc + chr(ord(os.sep) + 1)
+    return select(Character) \
+        .where(exists().where(or_(
+            seen_files.c.file_loc == Character.file_loc,
+            and_(Character.file_loc > dir_start, Character.file_loc < dir_end),
+        )))
+
+def destroy_missing_tags() -> Delete:
+    """Create a db query to delete every Tag belonging to a Character whose file is not in seen_files
+
+    Tags at every depth share the owner_id of their character, so subtags are deleted along with the rest.
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(Tag) \
+        .where(Tag.owner_id.in_(missing_ids()))
+
+def destroy_missing() -> Delete:
+    """Create a db query to delete every Character record whose file is not in the seen_files table
+
+    This leaves the records' tags behind, so destroy_missing_tags() should be run first.
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(Character) \
+        .where(~exists().where(seen_files.c.file_loc == Character.file_loc))
+
 def attr_counts(name: str) -> Select:
     """Create a db query to get a count for all values of an attribute
 
@@ -155,7 +237,8 @@ def attr_counts(name: str) -> Select:
 def update_attrs_by_id(id: int, values: dict) -> Update:
     """Create a db query to update one or more character attributes
 
-    Builds a query that updates the named attributes on the character with the given ID.
+    Builds a query that updates the named attributes on the character with the given ID. When the realname
+    is changed, the name part columns are changed to match.
 
     Args:
         id (int): ID of the character to update
@@ -164,6 +247,8 @@ def update_attrs_by_id(id: int, values: dict) -> Update:
     Returns:
         Update: Update object for the query
     """
+    if "realname" in values:
+        values = {**values, **Character.name_parts(values["realname"])}
     return update(Character) \
         .where(Character.id == id) \
         .values(values)
@@ -0,0 +1,125 @@
+"""Update stored characters in place from freshly loaded copies
+
+When a character file changes, the new Character made from it is compared against the stored record for the
+same file. Only the columns and tags which differ are written, so the record and its unchanged tags keep
+their IDs.
+
+Tags are read back in ID order everywhere, so the stored tags of a record must stay in the same order as the
+tags in its file. New tag rows always get higher IDs than the existing ones, which means a new tag can only be
+inserted after every tag row that is kept. Existing rows are updated in place to fill any other position.
+"""
+
+from sqlalchemy import inspect
+
+from npc.characters import Character, Tag
+from .bulk_insert import column_values
+
+def copy_columns(record, source):
+    """Copy every changed data column from one record to another
+
+    Primary and foreign key columns are left alone. Attributes which already have the same value are not
+    set, so the ORM only updates the columns that actually changed.
+
+    Args:
+        record (BaseModel): Stored record to update
+        source (BaseModel): Unsaved record with the new values
+    """
+    values = column_values(source)
+    for attr in inspect(type(record)).column_attrs:
+        column = attr.columns[0]
+        if column.primary_key or column.foreign_keys:
+            continue
+        value = values[column.key]
+        if getattr(record, attr.key) != value:
+            setattr(record, attr.key, value)
+
+def tag_key(tag: Tag) -> tuple:
+    """Get the values that make two tags the same, ignoring their subtags
+
+    Args:
+        tag (Tag): Tag to describe
+
+    Returns:
+        tuple: The tag's name, value, and hidden attributes
+    """
+    return (tag.name, tag.value, tag.hidden)
+
+def adopt(tag: Tag, owner: Character):
+    """Make a character the owner of a tag and all of its subtags
+
+    Args:
+        tag (Tag): Tag to change
+        owner (Character): Stored character record which will own the tags
+    """
+    tag.owner = owner
+    for subtag in tag.subtags:
+        adopt(subtag, owner)
+
+def sync_tags(stored: list[Tag], new_tags: list[Tag], owner: Character):
+    """Make a stored list of tags match a new list, keeping as many rows as possible
+
+    Tags at the start and end of both lists which are the same are kept as-is. The rest of the stored tags
+    are paired up with the new tags in order and updated in place. Stored tags left over after pairing are
+    deleted, and new tags left over are added as new rows. The subtags of every kept or updated tag are
+    matched the same way.
+
+    Paths are copied along with the other columns. Since the new tags were placed by their positions in the
+    file, the stored tags end up with paths that match their new positions. New rows are given the stored
+    owner, instead of the unsaved character they were made for.
+
+    Stored tags are removed and added through the stored collection itself, so that the ORM's delete-orphan
+    cascade takes care of deleting them along with their own subtags.
+
+    Args:
+        stored (list[Tag]): Relationship collection holding the stored tags
+        new_tags (list[Tag]): Unsaved tags, in file order
+        owner (Character): Stored character record that owns the tags
+    """
+    old = sorted(stored, key=lambda tag: tag.id)
+    new = list(new_tags)
+
+    shortest = min(len(old), len(new))
+    prefix = 0
+    while prefix < shortest and tag_key(old[prefix]) == tag_key(new[prefix]):
+        prefix += 1
+
+    # Kept suffix rows would come before any new row, so they can only be kept when no new rows are needed.
+    suffix = 0
+    if len(new) <= len(old):
+        while suffix < shortest - prefix and tag_key(old[-1 - suffix]) == tag_key(new[-1 - suffix]):
+            suffix += 1
+
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+    pairs = list(zip(old[:prefix], new[:prefix]))
+    pairs.extend(zip(old_middle, new_middle))
+    pairs.extend(zip(old[len(old) - suffix:], new[len(new) - suffix:]))
+
+    for old_tag, new_tag in pairs:
+        copy_columns(old_tag, new_tag)
+        sync_tags(old_tag.subtags, new_tag.subtags, owner)
+    for old_tag in old_middle[len(new_middle):]:
+        stored.remove(old_tag)
+    for new_tag in new_middle[len(old_middle):]:
+        adopt(new_tag, owner)
+        stored.append(new_tag)
+
+def sync_character(record: Character, character: Character):
+    """Update a stored character record to match a new copy of the same character
+
+    The record keeps its ID. Its columns and tags are changed using copy_columns() and sync_tags(), so that
+    only the differences are written when the session is flushed.
+
+    The record must be attached to a session, and the new character must not be. The new character's tags
+    are taken away from it first, since adding one of them to the record while it still belonged to the new
+    character would pull the new character into the session as well.
+
+    Args:
+        record (Character): Stored character record
+        character (Character): Unsaved character with the new values
+    """
+    new_tags = list(character.tags)
+    character.tags.clear()
+
+    copy_columns(record, character)
+    sync_tags(record.tags, new_tags, record)
@@ -31,3 +31,29 @@ def first_word(string_in: str) -> str:
         str: The first word in the string
     """
     return string_in.split()[0]
+
+def replace_name_part(name_path: str, path: str, name: str) -> str:
+    """Replace one tag's name within a tag name path
+
+    The tag to replace is picked by its materialized path: a tag with a path of "00002.00000" is the second
+    part of any name path at or beneath it. The parts of the path and name path are separated by "." and
+    ">>", matching npc.characters.Tag. A missing name path becomes just the new name.
+
+    This helper is designed specifically to be used as a custom sql function and
+    not for general use.
+
+    Args:
+        name_path (str): The name path to change
+        path (str): Materialized path of the renamed tag
+        name (str): New name of the tag
+
+    Returns:
+        str: The name path with the tag's part replaced
+    """
+    if name_path is None:
+        return name
+    depth = path.count(".") if path else 0
+    parts = name_path.split(">>")
+    if depth < len(parts):
+        parts[depth] = name
+    return ">>".join(parts)
@@ -1,6 +1,10 @@
+import sqlite3
 from contextlib import contextmanager
-from sqlalchemy import create_engine, event
+from functools import cache
+from pathlib import Path
+from sqlalchemy import create_engine, event, select, delete, insert, Table, Column, String, Text, Integer, MetaData, DDL
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import SingletonThreadPool
 
 from . import custom_functions
 from npc.util import Singleton
@@ -11,16 +15,60 @@ class DB(metaclass=Singleton):
     Since this class uses Singleton as its metaclass, you can pass the special clearSingleton=True parameter
     if you want to create a standalone DB instance instead of using the normal singleton instance. This is
     mainly meant for ease of writing tests.
+
+    By default, the database lives entirely in memory. When db_path is given, the database is stored in that
+    file instead so that its contents survive between runs. Either way, the schema version is stored in the
+    database itself and the tables are rebuilt whenever it does not match SCHEMA_VERSION.
+
+    Attributes:
+        SCHEMA_VERSION: Version number of the table layout. Must be incremented whenever a model change would
+            make an existing on-disk database unusable.
     """
-    def __init__(self):
-        self.engine = create_engine("sqlite://")
+
+    SCHEMA_VERSION = 8
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path
+        if db_path:
+            url = f"sqlite:///{db_path}"
+        else:
+            url = "sqlite://"
+        self.engine = create_engine(url, poolclass=SingletonThreadPool)
 
         @event.listens_for(self.engine, "connect")
         def inject_functions(conn, rec):
-            conn.create_function("last_word", 1, custom_functions.last_word)
-            conn.create_function("first_word", 1, custom_functions.first_word)
+            conn.create_function("last_word", 1, custom_functions.last_word, deterministic=True)
+            conn.create_function("first_word", 1, custom_functions.first_word, deterministic=True)
+            conn.create_function("replace_name_part", 3, custom_functions.replace_name_part, deterministic=True)
+            if db_path:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
 
-        BaseModel.metadata.create_all(self.engine)
+        if self.schema_version != self.SCHEMA_VERSION:
+            self.reset()
+        else:
+            BaseModel.metadata.create_all(self.engine)
+
+    def ensure_virtual_table(self, session: Session, table: Table) -> bool:
+        """Make sure one of the optional FTS5 tables exists, if this build of SQLite can have it
+
+        The full-text tables need the FTS5 extension, and the name index needs its trigram tokenizer from
+        SQLite 3.34. Neither is guaranteed, so these tables are not part of the normal schema. Instead, they are
+        created the first time something uses them, in the session's own transaction. Callers must skip the
+        table's queries when this returns False.
+
+        Args:
+            session (Session): Session which is about to use the table
+            table (Table): Either character_search or character_names
+
+        Returns:
+            bool: True if the table exists, False if this SQLite cannot create it
+        """
+        ddl = VIRTUAL_TABLES[table.name]
+        if not sqlite_supports(ddl):
+            return False
+        session.connection().exec_driver_sql(ddl)
+        return True
 
     @contextmanager
     def session(self):
@@ -42,9 +90,119 @@ class DB(metaclass=Singleton):
         """
         BaseModel.metadata.drop_all(self.engine)
         BaseModel.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+
+    @property
+    def schema_version(self) -> int:
+        """Get the schema version stored in the database
+
+        Returns:
+            int: Stored schema version. A brand new database always reports 0.
+        """
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+    @property
+    def fingerprint(self) -> str:
+        """Get the settings fingerprint stored in the database
+
+        Returns:
+            str: Stored fingerprint string, or None if no fingerprint has been stored
+        """
+        query = select(index_meta.c.value).where(index_meta.c.key == "fingerprint")
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    def ensure_fingerprint(self, fingerprint: str) -> bool:
+        """Make sure the database contents were built using the given settings fingerprint
+
+        When the stored fingerprint is different, everything is removed from the database and the new
+        fingerprint is stored in its place. This is how a persistent database avoids serving records that were
+        created under different settings.
+
+        Args:
+            fingerprint (str): Fingerprint of the settings that affect stored records
+
+        Returns:
+            bool: True if the existing contents were kept, False if the database was reset
+        """
+        if self.fingerprint == fingerprint:
+            return True
+
+        self.reset()
+        with self.engine.begin() as conn:
+            conn.execute(delete(index_meta).where(index_meta.c.key == "fingerprint"))
+            conn.execute(insert(index_meta).values(key="fingerprint", value=fingerprint))
+        return False
 
 class BaseModel(DeclarativeBase):
     """Base model for creating sqlalchemy classes
 
     All sqlalchemy model classes should extend this module as their parent
     """
+
+index_meta = Table(
+    "index_meta",
+    BaseModel.metadata,
+    Column("key", String(64), primary_key=True),
+    Column("value", Text),
+)
+
+# Full-text index of character text, using an SQLite FTS5 virtual table. The rowid of each row is the ID of
+# its character. SQLAlchemy cannot create virtual tables, so this Table lives in its own MetaData and is only
+# used to build queries. The real table is created and dropped along with the rest of the schema.
+character_search = Table(
+    "character_search",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("realname", Text),
+    Column("mnemonic", Text),
+    Column("description", Text),
+    Column("body", Text),
+    Column("tags", Text),
+)
+
+event.listen(BaseModel.metadata, "before_drop", DDL("DROP TABLE IF EXISTS character_search"))
+
+# Trigram index of character names and mnemonics, using an SQLite FTS5 virtual table. Like character_search,
+# the rowid of each row is the ID of its character and this Table is only used to build queries.
+character_names = Table(
+    "character_names",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("realname", Text),
+    Column("mnemonic", Text),
+)
+
+event.listen(BaseModel.metadata, "before_drop", DDL("DROP TABLE IF EXISTS character_names"))
+
+# Statements which create the optional virtual tables, keyed by table name. See DB.ensure_virtual_table().
+VIRTUAL_TABLES = {
+    "character_search":
+        "CREATE VIRTUAL TABLE IF NOT EXISTS character_search "
+        "USING fts5(realname, mnemonic, description, body, tags, tokenize = 'unicode61 remove_diacritics 2')",
+    "character_names":
+        "CREATE VIRTUAL TABLE IF NOT EXISTS character_names USING fts5(realname, mnemonic, tokenize = 'trigram')",
+}
+
+@cache
+def sqlite_supports(ddl: str) -> bool:
+    """Check whether this build of SQLite can run a CREATE VIRTUAL TABLE statement
+
+    The statement is tried once in a scratch in-memory database, and the answer is remembered.
+
+    Args:
+        ddl (str): Statement which creates a virtual table
+
+    Returns:
+        bool: True if the statement works, False if SQLite is missing the module or tokenizer it needs
+    """
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute(ddl)
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+    return True
@@ -0,0 +1,131 @@
+"""Fuzzy lookup of characters by part of their name or mnemonic
+
+The character_names table is an FTS5 trigram index of every character's realname and mnemonic, with one row
+per character whose rowid is the character's ID. Like the search index, its rows must be added and removed by
+whatever changes the character records, which CharacterCollection does. Unlike the search index, it is
+always kept up to date, since names are short and cheap to index.
+
+A name fragment is split into its trigrams, and characters are ranked by how many of them, and how rare,
+appear in their name. That finds names with a typo or two, as well as plain substrings.
+
+Trigram indexes cannot match fewer than three characters, so shorter fragments are matched as substrings of
+the name and mnemonic instead. The same goes for every fragment when SQLite has no trigram tokenizer, since
+the index cannot exist then. See DB.ensure_virtual_table().
+"""
+
+from sqlalchemy import select, Select, func, or_, literal_column, delete, Delete, insert, bindparam
+from sqlalchemy.orm import Session
+
+from npc.characters import Character
+from .database import character_names
+from . import character_repository
+
+# Relative weight of each column when ranking matches, in table column order: realname and mnemonic
+COLUMN_WEIGHTS = (2.0, 1.0)
+
+def add(session: Session, characters: list[tuple[int, Character]]):
+    """Add index rows for characters, using one executemany statement
+
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to execute the insert in
+        characters (list[tuple[int, Character]]): Pairs of character IDs and the characters to index
+    """
+    rows = [
+        {"rowid": id, "realname": character.realname, "mnemonic": character.mnemonic}
+        for id, character in characters
+    ]
+    if rows:
+        session.execute(insert(character_names), rows)
+
+def remove(session: Session, ids: list[int]):
+    """Remove the index rows of some characters, using one executemany statement
+
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to execute the delete in
+        ids (list[int]): IDs of the characters to remove
+    """
+    if ids:
+        stmt = delete(character_names).where(character_names.c.rowid == bindparam("character_id"))
+        session.execute(stmt, [{"character_id": id} for id in ids])
+
+def destroy_missing() -> Delete:
+    """Create a db query to delete the index rows of every Character whose file is not in seen_files
+
+    This must be run before character_repository.destroy_missing(), while the records still exist.
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(character_names) \
+        .where(character_names.c.rowid.in_(character_repository.missing_ids()))
+
+def destroy_all() -> Delete:
+    """Create a db query to delete every index row
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(character_names)
+
+def trigrams(fragment: str) -> list[str]:
+    """Get the unique three-character sequences in a name fragment, in order
+
+    Args:
+        fragment (str): Part of a name
+
+    Returns:
+        list[str]: Lowercase trigrams of the fragment. Empty if it is shorter than three characters.
+    """
+    text = fragment.strip().lower()
+    return list(dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2)))
+
+def match_expression(fragment: str) -> str:
+    """Turn a name fragment into an FTS5 query that matches any of its trigrams
+
+    Args:
+        fragment (str): Part of a name
+
+    Returns:
+        str: FTS5 query string, or an empty string if the fragment is too short
+    """
+    return " OR ".join('"' + gram.replace('"', '""') + '"' for gram in trigrams(fragment))
+
+def find(fragment: str, limit: int = None, *, indexed: bool = True) -> Select:
+    """Create a db query to get the characters whose name or mnemonic best matches a fragment
+
+    Characters that contain the whole fragment come first. The rest are ordered by their trigram matches,
+    then by name.
+
+    Args:
+        fragment (str): Part of a name
+        limit (int): Maximum number of characters to get. None gets them all. (default: `None`)
+        indexed (bool): Whether the character_names table exists. When False, only the characters containing
+            the whole fragment are found. (default: `True`)
+
+    Returns:
+        Select: Select object for the character query
+    """
+    fragment = fragment.strip()
+    contains = or_(
+        Character.realname.contains(fragment, autoescape=True),
+        Character.mnemonic.contains(fragment, autoescape=True),
+    )
+
+    expression = match_expression(fragment) if indexed else ""
+    if not expression:
+        return select(Character) \
+            .where(contains) \
+            .order_by(Character.realname) \
+            .limit(limit)
+
+    table = literal_column(character_names.name)
+    rank = func.bm25(table, *COLUMN_WEIGHTS)
+    return select(Character) \
+        .join(character_names, character_names.c.rowid == Character.id) \
+        .where(table.op("MATCH")(expression)) \
+        .order_by(~contains, rank, Character.realname) \
+        .limit(limit)
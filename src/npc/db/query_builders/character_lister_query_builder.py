@@ -1,4 +1,4 @@
-from sqlalchemy import Select, select, func
+from sqlalchemy import Select, select
 from sqlalchemy.orm import aliased
 
 from npc.db import character_repository
@@ -106,7 +106,8 @@ class CharacterListerQueryBuilder:
         """Query a tag value
 
         This uses a scalar subquery to get the value of the first matching tag for a character, or None if
-        they have no such tag.
+        they have no such tag. The (character_id, name) index on the tags table already holds each character's
+        tags of one name in ID order, so every subquery is a single index lookup with no sorting.
 
         Args:
             tag_name (str): Name of the tag to query
@@ -139,49 +140,47 @@ class CharacterListerQueryBuilder:
           .order_by(label)
 
     def apply_first_name_partial(self, label: str):
-        """Query the character's first name using the realname property
+        """Query the character's first name using the first_name property
 
-        This uses the custom first_word query function to limit the query to the first word of the character's
-        realname property.
+        The first name is stored when the character's realname is set, so nothing is computed per row.
 
         Args:
             label (str): Label for the first name column
         """
         self.query = self.query \
-          .add_columns(func.first_word(Character.realname).label(label)) \
+          .add_columns(Character.first_name.label(label)) \
           .order_by(label)
 
     def apply_first_initial_partial(self, label: str):
-        """Query the character's first name initial using the realname property
+        """Query the character's first name initial using the first_initial property
 
         Args:
             label (str): Label for the first initial column
         """
         self.query = self.query \
-          .add_columns(func.substr(Character.realname, 1, 1).label(label)) \
+          .add_columns(Character.first_initial.label(label)) \
           .order_by(label)
 
     def apply_last_name_partial(self, label: str):
-        """Query the character's last name using the realname property
+        """Query the character's last name using the last_name property
 
-        This uses the custom last_word query function to limit the query to the last word of the character's
-        realname property.
+        The last name is stored when the character's realname is set, so nothing is computed per row.
 
         Args:
             label (str): Label for the last name column
         """
         self.query = self.query \
-          .add_columns(func.last_word(Character.realname).label(label)) \
+          .add_columns(Character.last_name.label(label)) \
           .order_by(label)
 
     def apply_last_initial_partial(self, label: str):
-        """Query the character's last name initial using the realname property
+        """Query the character's last name initial using the last_initial property
 
         Args:
             label (str): Label for the last initial column
         """
         self.query = self.query \
-          .add_columns(func.substr(func.last_word(Character.realname), 1, 1).label(label)) \
+          .add_columns(Character.last_initial.label(label)) \
           .order_by(label)
 
     def apply_full_name_partial(self, label: str):
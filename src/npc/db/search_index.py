@@ -0,0 +1,230 @@
+"""Full-text search over character names, descriptions, bodies, and tag values
+
+The index is the character_search FTS5 table, with one row per character whose rowid is the character's ID.
+Its rows are not kept up to date by the ORM. Whatever adds, changes, or removes character records must call
+the functions here as well, which CharacterCollection does for seed, refresh, and watcher changes.
+
+Bodies which were deferred when their character was loaded are not read just to index them. Their body
+column is left NULL until fill_bodies() is called, which search() in CharacterCollection does before
+every search.
+
+Search terms from users are turned into an FTS5 query using match_expression(), so that punctuation in a
+name cannot cause a syntax error.
+"""
+
+from dataclasses import dataclass
+from sqlalchemy import select, Select, delete, Delete, insert, update, func, bindparam, literal_column, and_, or_
+from sqlalchemy.orm import Session, selectinload
+
+from npc.characters import Character, Tag
+from .database import character_search
+from . import character_repository
+
+# Relative weight of each column when ranking matches, in table column order: realname, mnemonic,
+# description, body, and tags. A match in the name counts for far more than one in the body.
+COLUMN_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 3.0)
+
+# Number of tokens in each snippet
+SNIPPET_TOKENS = 12
+
+@dataclass
+class SearchResult():
+    """Class for a single character that matched a search
+
+    Attributes:
+        character: The matching character record
+        snippet: Short excerpt of the best matching text, with the matched terms marked
+    """
+    character: Character
+    snippet: str
+
+def match_expression(query: str) -> str:
+    """Turn a user's search terms into an FTS5 query
+
+    Each whitespace-separated term is quoted, so it is matched as plain text. Every term must appear for a
+    character to match. A term ending in * matches any word that starts with it.
+
+    Args:
+        query (str): Search terms
+
+    Returns:
+        str: FTS5 query string, or an empty string if there are no terms
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if not word:
+            continue
+        quoted = '"' + word.replace('"', '""') + '"'
+        terms.append(quoted + ("*" if prefix else ""))
+    return " ".join(terms)
+
+def tag_values(tags: list[Tag]) -> list[str]:
+    """Get the values of a list of tags and all of their subtags
+
+    Args:
+        tags (list[Tag]): Tags to read
+
+    Returns:
+        list[str]: Non-empty tag values, in file order
+    """
+    values = []
+    for tag in tags:
+        if tag.value:
+            values.append(str(tag.value))
+        values.extend(tag_values(tag.subtags))
+    return values
+
+def document(character: Character) -> dict:
+    """Get the text to index for a character
+
+    When the character's body is deferred, the body column is None so that it can be filled in later by
+    fill_bodies(). Otherwise it holds the body, or an empty string if the character has none.
+
+    Args:
+        character (Character): Character to describe
+
+    Returns:
+        dict: Dict of search column names and values
+    """
+    return {
+        "realname": character.realname,
+        "mnemonic": character.mnemonic,
+        "description": character.desc,
+        "body": None if character.body_deferred else (character.file_body or ""),
+        "tags": "\n".join(tag_values(character.tags)),
+    }
+
+def add(session: Session, characters: list[tuple[int, Character]]):
+    """Add index rows for characters, using one executemany statement
+
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to execute the insert in
+        characters (list[tuple[int, Character]]): Pairs of character IDs and the characters to index
+    """
+    rows = [{"rowid": id, **document(character)} for id, character in characters]
+    if rows:
+        session.execute(insert(character_search), rows)
+
+def remove(session: Session, ids: list[int]):
+    """Remove the index rows of some characters, using one executemany statement
+
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to execute the delete in
+        ids (list[int]): IDs of the characters to remove
+    """
+    if ids:
+        stmt = delete(character_search).where(character_search.c.rowid == bindparam("character_id"))
+        session.execute(stmt, [{"character_id": id} for id in ids])
+
+def fill_bodies(session: Session):
+    """Add the deferred bodies of indexed characters to their rows
+
+    Every row whose body is NULL gets the body of its character, which is read from the character's file.
+    This does not commit the session.
+
+    Args:
+        session (Session): Session to update the index in
+    """
+    records = session.scalars(
+        select(Character)
+        .join(character_search, character_search.c.rowid == Character.id)
+        .where(character_search.c.body.is_(None))
+    ).all()
+    if records:
+        stmt = update(character_search) \
+            .where(character_search.c.rowid == bindparam("character_id")) \
+            .values(body=bindparam("new_body"))
+        session.execute(stmt, [{"character_id": record.id, "new_body": record.file_body or ""} for record in records])
+
+def destroy_missing() -> Delete:
+    """Create a db query to delete the index rows of every Character whose file is not in seen_files
+
+    This must be run before character_repository.destroy_missing(), while the records still exist.
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(character_search) \
+        .where(character_search.c.rowid.in_(character_repository.missing_ids()))
+
+def destroy_all() -> Delete:
+    """Create a db query to delete every index row
+
+    Returns:
+        Delete: Delete object for the query
+    """
+    return delete(character_search)
+
+def rebuild(session: Session):
+    """Replace the whole index with rows for every stored character
+
+    Each character's tag tree is loaded in bulk, then indexed. This does not commit the session.
+
+    Args:
+        session (Session): Session to rebuild the index in
+    """
+    session.execute(destroy_all())
+    records = session.scalars(character_repository.all().options(selectinload(Character.tag_tree))).all()
+    for record in records:
+        record.build_tag_tree()
+    add(session, [(record.id, record) for record in records])
+
+def search(expression: str, limit: int = None, *, mark: tuple[str, str] = ("**", "**")) -> Select:
+    """Create a db query to find the characters matching an FTS5 query, best matches first
+
+    Each row holds the Character record and a snippet of its best matching column.
+
+    Args:
+        expression (str): FTS5 query, usually from match_expression()
+        limit (int): Maximum number of characters to get. None gets them all. (default: `None`)
+        mark (tuple[str, str]): Strings to put before and after each matched term in the snippet
+            (default: `("**", "**")`)
+
+    Returns:
+        Select: Select object for the search query
+    """
+    table = literal_column(character_search.name)
+    rank = func.bm25(table, *COLUMN_WEIGHTS)
+    snippet = func.snippet(table, -1, mark[0], mark[1], "...", SNIPPET_TOKENS)
+    return select(Character, snippet.label("snippet")) \
+        .join(character_search, character_search.c.rowid == Character.id) \
+        .where(table.op("MATCH")(expression)) \
+        .order_by(rank) \
+        .limit(limit)
+
+def scan(query: str, limit: int = None) -> Select:
+    """Create a db query to find the characters containing every search term, without the index
+
+    This is for SQLite builds without the FTS5 extension. Each term is matched as a substring of the stored
+    realname, mnemonic, description, body, and tag values, so deferred bodies are not searched. The results
+    are ordered by name, and their snippet is the character's description.
+
+    Args:
+        query (str): Search terms. A trailing * on a term is ignored, since substrings already match.
+        limit (int): Maximum number of characters to get. None gets them all. (default: `None`)
+
+    Returns:
+        Select: Select object for the search query
+    """
+    conditions = []
+    for word in query.split():
+        term = word.rstrip("*")
+        if not term:
+            continue
+        conditions.append(or_(
+            Character.realname.contains(term, autoescape=True),
+            Character.mnemonic.contains(term, autoescape=True),
+            Character.desc.contains(term, autoescape=True),
+            Character._file_body.contains(term, autoescape=True),
+            Character.tag_tree.any(Tag.value.contains(term, autoescape=True)),
+        ))
+    return select(Character, func.coalesce(Character.desc, "").label("snippet")) \
+        .where(and_(*conditions)) \
+        .order_by(Character.realname) \
+        .limit(limit)
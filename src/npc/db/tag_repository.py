@@ -4,7 +4,7 @@ These queries are limited to ones that do not rely on anything from the Characte
 belong to a character, most queries end up in the character repository instead.
 """
 
-from sqlalchemy import select, Select, func, desc, exists, Delete, Update, update
+from sqlalchemy import select, Select, func, desc, exists, delete, Delete, Update, update, or_, case, ColumnElement
 from sqlalchemy.orm import aliased
 from npc.characters import Tag
 
@@ -24,11 +24,47 @@ def value_counts(name: str) -> Select:
         .group_by(Tag.value) \
         .order_by(desc("value_count"))
 
+def under_parent(name: str, parent_name: str) -> ColumnElement:
+    """Create a filter for subtags whose direct parent has the given name
+
+    The parent can be at any depth, so the tag's name_path must either be the parent and tag names, or end
+    with them.
+
+    Args:
+        name (str): Name of the subtag
+        parent_name (str): Name of the subtag's parent tag
+
+    Returns:
+        ColumnElement: Filter expression to use in a where clause
+    """
+    name_path = parent_name + Tag.NAME_PATH_SEPARATOR + name
+    return (Tag.name == name) & or_(
+        Tag.name_path == name_path,
+        Tag.name_path.endswith(Tag.NAME_PATH_SEPARATOR + name_path, autoescape=True),
+    )
+
+def subtags(name: str, parent_name: str) -> Select:
+    """Create a db query to get every instance of a subtag under a named parent
+
+    This gets the named subtag from every character's tag tree, such as all role tags under any org tag. The
+    tags are grouped by character and are in file order within each one.
+
+    Args:
+        name (str): Name of the subtag
+        parent_name (str): Name of the subtag's parent tag
+
+    Returns:
+        Select: Select object for the subtag query
+    """
+    return select(Tag) \
+        .where(under_parent(name, parent_name)) \
+        .order_by(Tag.owner_id, Tag.path)
+
 def subtag_value_counts(name: str, parent_name: str) -> Select:
-    """Create a db query to gt a count of all values for a given subtag
+    """Create a db query to get a count of all values for a given subtag
 
-    This counts the unique values of the named subtag scoped to the parent
-    tag's name.
+    This counts the unique values of the named subtag scoped to the parent tag's name. The parent is found
+    through each tag's name_path, so the query needs no join.
 
     Args:
         name (str): Name of the tag to check
@@ -37,15 +73,8 @@ def subtag_value_counts(name: str, parent_name: str) -> Select:
     Returns:
         Select: Select object for the subtag query
     """
-    parent = aliased(Tag)
-    parent_subq = select(1) \
-        .where(Tag.parent_tag_id == parent.id) \
-        .where(parent.name == parent_name) \
-        .scalar_subquery()
-
     return select(Tag.value, func.count(1).label("value_count")) \
-        .where(Tag.name == name) \
-        .where(parent_subq) \
+        .where(under_parent(name, parent_name)) \
         .group_by(Tag.value) \
         .order_by(desc("value_count"))
 
@@ -64,7 +93,9 @@ def destroy(id: int) -> Delete:
 def update_attrs_by_id(id: int, values: dict) -> Update:
     """Create a db query to update one or more tag attributes
 
-    Builds a query that updates the named attributes on the tag with the given ID.
+    Builds a query that updates the named attributes on the tag with the given ID. When the name changes, the
+    name_path of the tag and of every tag beneath it is rewritten to match, so the statement also covers those
+    descendants. They keep their other attributes.
 
     Args:
         id (int): ID of the tag to update
@@ -73,6 +104,20 @@ def update_attrs_by_id(id: int, values: dict) -> Update:
     Returns:
         Update: Update object for the query
     """
+    if "name" not in values:
+        return update(Tag) \
+            .where(Tag.id == id) \
+            .values(values)
+
+    target = aliased(Tag)
+    target_owner = select(target.owner_id).where(target.id == id).scalar_subquery()
+    target_path = select(target.path).where(target.id == id).scalar_subquery()
+    own_values = {key: case((Tag.id == id, value), else_=getattr(Tag, key)) for key, value in values.items()}
     return update(Tag) \
-        .where(Tag.id == id) \
-        .values(values)
+        .where(or_(
+            Tag.id == id,
+            (Tag.owner_id == target_owner) & Tag.path.startswith(target_path + Tag.PATH_SEPARATOR),
+        )) \
+        .values(own_values | {
+            "name_path": func.replace_name_part(Tag.name_path, target_path, values["name"]),
+        })
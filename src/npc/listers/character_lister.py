@@ -1,17 +1,230 @@
-from jinja2 import Environment
-from typing import TextIO, Callable
+import os
+from jinja2 import Environment, BaseLoader, FileSystemBytecodeCache
+from jinja2.meta import find_referenced_templates
+from typing import TextIO, Callable, Iterator, Sequence, Any
+from dataclasses import dataclass
 from functools import cached_property, cache
-import mistletoe
+from contextlib import ExitStack
+from hashlib import sha256
+from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+import logging
 
-from npc.characters import Character
+from npc.characters import Character, Tag
 from npc.campaign import Campaign, CharacterCollection
+from npc.campaign.character_ingest import resolve_workers
 from npc.templates import CharacterFallbackLoader
-from npc.templates.filters import trim_tags
+from npc.templates.filters import markdown, markdown_inline, cached_markdown
 from npc.db.query_builders import CharacterListerQueryBuilder
-from npc.util import arg_or_default
+from npc.util import arg_or_default, win_sanitize
 from npc.views import CharacterView, GroupView
 
 from .undefined_view import UndefinedView
+from .render_cache import RenderCache
+from .split_manifest import SplitManifest
+
+logger = logging.getLogger(__name__)
+
+# Number of characters sent to a worker process at a time when rendering in parallel
+RENDER_CHUNK_SIZE = 50
+
+# Number of chunks per worker process which may be waiting to be rendered or written at once
+RENDER_CHUNKS_PER_WORKER = 2
+
+# Jinja environment of a worker process, created by start_render_worker()
+worker_environment: Environment = None
+
+# Jinja environments kept between listings, keyed by their template search paths
+shared_environments: dict[tuple, Environment] = {}
+
+def make_environment(loader: BaseLoader, bytecode_dir: Path = None) -> Environment:
+    """Create the Jinja environment used to render listings
+
+    Args:
+        loader (BaseLoader): Loader for the listing templates
+        bytecode_dir (Path): Directory where compiled templates are stored between runs. When None, templates
+            are compiled every time a new environment needs them. (default: `None`)
+
+    Returns:
+        Environment: New Jinja environment with the markdown filters installed
+    """
+    bytecode_cache = None
+    if bytecode_dir:
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+
+    jenv = Environment(
+        loader = loader,
+        auto_reload = False,
+        autoescape = False,
+        undefined = UndefinedView,
+        bytecode_cache = bytecode_cache,
+    )
+    jenv.filters["md"] = markdown
+    jenv.filters["mdi"] = markdown_inline
+    return jenv
+
+@dataclass
+class ListingStats():
+    """Counts of the work done to make a listing
+
+    Attributes:
+        characters: Number of character entries in the listing
+        groups: Number of group headings in the listing
+        cached: Number of entries and headings copied from the render cache
+        markdown_hits: Number of markdown filter calls answered from the filter cache
+        markdown_misses: Number of markdown filter calls which had to parse their value
+    """
+    characters: int = 0
+    groups: int = 0
+    cached: int = 0
+    markdown_hits: int = 0
+    markdown_misses: int = 0
+
+@dataclass
+class SplitFile():
+    """One file of a split listing
+
+    Attributes:
+        file_name: Name of the file within the output directory
+        group: View of the top-level group in the file, or None for the index
+        pieces: Template names, contexts, and render cache keys of the pieces in the file
+        digest: Key made from the keys of every piece, or None if the file must always be written
+    """
+    file_name: str
+    group: GroupView = None
+    pieces: list = None
+    digest: str = None
+
+def split_file_name(group: GroupView, suffix: str, taken: set[str]) -> str:
+    """Get a unique file name for a group of a split listing
+
+    The name comes from the group's title, made safe for every filesystem. When two groups would get the same
+    name, ignoring case, a number is added to the later one.
+
+    Args:
+        group (GroupView): View of the group
+        suffix (str): Template suffix to use as the file extension
+        taken (set[str]): Lowercase file names already in use. The new name is added to this set.
+
+    Returns:
+        str: File name for the group
+    """
+    stem = win_sanitize(group.title or f"No {group.grouping}")
+    file_name = f"{stem}.{suffix}"
+    count = 1
+    while file_name.lower() in taken:
+        count += 1
+        file_name = f"{stem} {count}.{suffix}"
+    taken.add(file_name.lower())
+    return file_name
+
+def write_split_file(path: Path, texts: list[str]):
+    """Write the rendered pieces of one split listing file
+
+    Args:
+        path (Path): Path of the file to write
+        texts (list[str]): Rendered text of each piece, in order
+    """
+    with path.open("w") as target:
+        for text in texts:
+            target.write(text)
+            target.write("\n\n")
+
+def markdown_counts() -> tuple[int, int]:
+    """Get the hit and miss counts of the markdown filter cache in this process
+
+    Returns:
+        tuple[int, int]: Total hits and misses so far
+    """
+    info = cached_markdown.cache_info()
+    return info.hits, info.misses
+
+def start_render_worker(loader: BaseLoader, bytecode_dir: Path = None):
+    """Set up the Jinja environment of a worker process
+
+    Args:
+        loader (BaseLoader): Loader for the listing templates
+        bytecode_dir (Path): Directory where compiled templates are stored between runs
+    """
+    global worker_environment
+    worker_environment = make_environment(loader, bytecode_dir)
+
+def chunk_pieces(pieces: Iterator[tuple[Any, dict]], size: int) -> Iterator[list[tuple[Any, dict]]]:
+    """Split listing pieces into runs holding a set number of characters
+
+    Group headers stay in the same run as the character that follows them. Pieces are only taken from the
+    iterator as they are needed to fill the current run.
+
+    Args:
+        pieces (Iterator[tuple[Any, dict]]): Pairs of data about each listing piece, like its template name,
+            and the context to render it with
+        size (int): Number of characters to put in each run
+
+    Yields:
+        list[tuple[Any, dict]]: Consecutive runs of pieces
+    """
+    chunk = []
+    characters = 0
+    for data, context in pieces:
+        chunk.append((data, context))
+        if "character" in context:
+            characters += 1
+            if characters == size:
+                yield chunk
+                chunk = []
+                characters = 0
+    if chunk:
+        yield chunk
+
+def render_pieces(pieces: list[tuple[str, dict]], jenv: Environment = None) -> tuple[list[str], int, int]:
+    """Render a run of listing pieces
+
+    Args:
+        pieces (list[tuple[str, dict]]): Pairs of template names and the context to render them with
+        jenv (Environment): Jinja environment to use. Defaults to the environment of this worker process.
+
+    Returns:
+        tuple[list[str], int, int]: Rendered text of each piece in order, followed by the number of markdown
+        filter cache hits and misses while rendering them
+    """
+    jenv = jenv or worker_environment
+    hits, misses = markdown_counts()
+    texts = [jenv.get_template(name).render(context) for name, context in pieces]
+    new_hits, new_misses = markdown_counts()
+    return texts, new_hits - hits, new_misses - misses
+
+def tag_content(tags: list[Tag]) -> list:
+    """Get everything about a list of tags that a character view uses
+
+    Args:
+        tags (list[Tag]): Tags to describe
+
+    Returns:
+        list: Nested lists of the name, value, hidden flag, and subtags of each tag
+    """
+    return [[tag.name, tag.value, tag.hidden, tag_content(tag.subtags)] for tag in tags]
+
+def character_content(character: Character) -> list:
+    """Get everything about a character that its listing entry can depend on
+
+    This covers every value that CharacterView reads from the character, including its whole tag tree.
+
+    Args:
+        character (Character): Character to describe
+
+    Returns:
+        list: JSON-compatible list of the character's values
+    """
+    return [
+        character.type_key,
+        character.file_loc or "",
+        character.desc,
+        character.realname,
+        character.mnemonic,
+        tag_content(character.tags),
+    ]
 
 class CharacterLister:
     """Class to create character listings from a character collection
@@ -37,7 +250,9 @@ class CharacterLister:
         lang: str = None,
         group_by: list[str] = None,
         sort_by: list[str] = None,
-        base_header_level: int = None):
+        base_header_level: int = None,
+        workers: int = None,
+        render_cache: bool = None):
         """Create a character lister
 
         Args:
@@ -45,6 +260,10 @@ class CharacterLister:
             lang (str): Output language to use. Defaults to the value in the settings key
                 "campaign.characters.listing.format". If this language is not in SUPPORTED_LANGUAGES, it will
                 be treated as the template file suffix.
+            workers (int): Number of processes to render with. Zero means one per CPU. Defaults to the value
+                in the settings key "campaign.characters.listing.render_workers".
+            render_cache (bool): Whether to reuse rendered pieces from earlier listings. Defaults to the value
+                in the settings key "campaign.characters.listing.render_cache".
         """
         self.collection: CharacterCollection = collection
         self.campaign: Campaign = collection.campaign
@@ -54,8 +273,15 @@ class CharacterLister:
         self.group_by: list[str] = arg_or_default(group_by, settings.get("campaign.characters.listing.group_by"))
         self.sort_by: list[str] = arg_or_default(sort_by, settings.get("campaign.characters.listing.sort_by"))
         self.base_header_level: int = arg_or_default(base_header_level, settings.get("campaign.characters.listing.base_header_level"))
+        if workers is None:
+            workers = settings.get("campaign.characters.listing.render_workers", 1)
+        self.workers: int = workers
+        if render_cache is None:
+            render_cache = settings.get("campaign.characters.listing.render_cache", False)
+        self.render_cache: bool = render_cache
+        self.stats: ListingStats = ListingStats()
 
-    def list(self, target: TextIO, progress_callback: Callable = None):
+    def list(self, target: TextIO, progress_callback: Callable = None, *, rebuild: bool = False):
         """Generate a complete listing of all characters
 
         This gets the characters and generates a listing entry for each one, emitting it to the given target.
@@ -63,26 +289,390 @@ class CharacterLister:
         Grouping headers are created automatically for each level of group criteria. Whenever that criterion
         changes, a new header is emitted.
 
+        This is the same as calling list_many() with our lang and the target.
+
         Args:
             target            (TextIO):   Target to receive the emitted listings
             progress_callback (Callable): Optional callback to update a progress bar
+            rebuild           (bool):     Whether to empty the render cache first, so every piece is rendered
+        """
+        self.list_many([(self.lang, target)], progress_callback, rebuild=rebuild)
+
+    def list_many(self, outputs: Sequence[tuple[str, TextIO]], progress_callback: Callable = None, *, rebuild: bool = False):
+        """Generate complete listings of all characters in several languages at once
+
+        The characters are queried, grouped, and turned into views just once. Each piece of the listing is then
+        rendered in the language of every output and emitted to that output's target, in the order given.
+
+        When the render cache is used, pieces which were rendered by an earlier listing from the same
+        templates and content are copied from the cache instead of being rendered again. Each language and
+        target uses its own scope within the cache.
+
+        Templates come from the shared environment for our campaign. See environment().
+
+        Counts of the work done are put in self.stats, replacing those from any earlier listing. Characters
+        and groups are counted once, no matter how many outputs they are rendered into.
+
+        The listing is streamed in chunks of RENDER_CHUNK_SIZE characters. Each chunk is checked against the
+        render cache and emitted as soon as its remaining pieces are rendered, so only a few chunks are held in
+        memory at once.
+
+        When more than one worker is used, chunks with pieces left to render are sent to a pool of processes.
+        At most RENDER_CHUNKS_PER_WORKER chunks per worker are waiting at any time. The headers are still
+        decided here, and chunks are emitted in order, so the output is the same as from a single process.
+
+        Args:
+            outputs           (Sequence[tuple[str, TextIO]]): Pairs of the language to use and the target to
+                receive the emitted listing in that language
+            progress_callback (Callable): Optional callback to update a progress bar, called once per character
+            rebuild           (bool):     Whether to empty the render cache first, so every piece is rendered
+        """
+        def default_progress():
+            pass
+        if progress_callback is None:
+            progress_callback = default_progress
+
+        jenv = self.environment()
+        workers = resolve_workers(self.workers)
+        stats = ListingStats()
+        self.stats = stats
+
+        render_caches = [self.open_render_cache(lang, target=self.target_name(target)) for lang, target in outputs]
+        if rebuild:
+            for render_cache in render_caches:
+                if render_cache:
+                    render_cache.clear()
+        suffixes = [self.lang_suffix(lang) for lang, _ in outputs]
+
+        template_digests = {}
+        def prepare(stem: str, context: dict, content: Any) -> tuple[list, dict]:
+            renders = []
+            for (lang, _), suffix, render_cache in zip(outputs, suffixes, render_caches):
+                name = f"{stem}.{suffix}"
+                key = None
+                text = None
+                if render_cache:
+                    if name not in template_digests:
+                        template_digests[name] = self.template_digest(jenv, name)
+                    if template_digests[name]:
+                        key = render_cache.make_key(
+                            template_digests[name], lang, self.base_header_level, context["header_level"], content)
+                        text = render_cache.get(key)
+                renders.append((name, key, text))
+            return renders, context
+
+        def write(chunk: list[tuple[list, dict]], result: tuple[list[str], int, int]):
+            texts, hits, misses = result
+            stats.markdown_hits += hits
+            stats.markdown_misses += misses
+            rendered = iter(texts)
+            for renders, context in chunk:
+                for (_, target), render_cache, (name, key, text) in zip(outputs, render_caches, renders):
+                    if text is None:
+                        text = next(rendered)
+                        if key:
+                            render_cache.store(key, text)
+                    target.write(text)
+                    target.write("\n\n")
+                if "character" in context:
+                    stats.characters += 1
+                    progress_callback()
+                else:
+                    stats.groups += 1
+
+        prepared = (prepare(stem, context, content) for stem, context, content in self.pieces())
+        in_flight = deque()
+        with ExitStack() as stack:
+            pool = None
+            for chunk in chunk_pieces(prepared, RENDER_CHUNK_SIZE):
+                missing = [
+                    (name, context)
+                    for renders, context in chunk
+                    for name, _, text in renders
+                    if text is None]
+                stats.cached += sum(len(renders) for renders, _ in chunk) - len(missing)
+
+                if workers == 1 or not missing:
+                    future = Future()
+                    future.set_result(render_pieces(missing, jenv))
+                else:
+                    if pool is None:
+                        pool = stack.enter_context(ProcessPoolExecutor(
+                            max_workers=workers,
+                            initializer=start_render_worker,
+                            initargs=(jenv.loader, self.bytecode_dir)))
+                    future = pool.submit(render_pieces, missing)
+                in_flight.append((chunk, future))
+
+                while in_flight and (in_flight[0][1].done() or len(in_flight) > workers * RENDER_CHUNKS_PER_WORKER):
+                    chunk, future = in_flight.popleft()
+                    write(chunk, future.result())
+
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                write(chunk, future.result())
+
+        for render_cache in render_caches:
+            if render_cache:
+                render_cache.save()
+        logger.info(f"Listing stats: {stats}")
+
+    def split(self, directory: Path, progress_callback: Callable = None, *, rebuild: bool = False) -> Sequence[Path]:
+        """Generate a listing with one file for each top-level group, plus an index
+
+        Each file holds the heading of one value of the first group_by criterion, followed by everything in
+        that group, just as it appears in a complete listing. The files are named after their groups. The index
+        file, named "index" with our template suffix, links to every group file using the group_index
+        template.
+
+        A digest of every piece in each file is kept in the campaign's cache dir. Files whose digest has not
+        changed since the last split listing into the same directory, and which still exist, are not written
+        again. Files from the last split listing whose group is gone are deleted.
+
+        The changed files are rendered here, one after another, using the render cache just like in list().
+        Rendering stays on this thread because the markdown filters are not thread-safe. Only writing the
+        finished files is handed to a pool of threads, so the next file can be rendered while earlier ones
+        are still being written.
+
+        Counts of the work done are put in self.stats, replacing those from any earlier listing.
+
+        Args:
+            directory         (Path):     Directory to hold the listing files. It is created if needed.
+            progress_callback (Callable): Optional callback to update a progress bar, called once per character
+            rebuild           (bool):     Whether to ignore the digests and render cache, so every file is
+                rendered and written
+
+        Returns:
+            Sequence[Path]: Paths of the files which were written, in order
+
+        Raises:
+            ValueError: Raised when we have no group_by criteria to split by
         """
+        if not self.group_by:
+            raise ValueError("Cannot split a listing without any group_by criteria")
+
         def default_progress():
             pass
         if progress_callback is None:
             progress_callback = default_progress
 
-        jenv = Environment(
-            loader = CharacterFallbackLoader(self.campaign),
-            auto_reload = False,
-            autoescape = False,
-            undefined = UndefinedView,
-        )
-        jenv.filters["md"] = mistletoe.markdown
-        jenv.filters["mdi"] = lambda v: trim_tags(mistletoe.markdown(v))
-        gt = jenv.get_template
-        write = target.write
+        jenv = self.environment()
+        stats = ListingStats()
+        self.stats = stats
+        suffix = self.template_suffix
+        directory.mkdir(parents=True, exist_ok=True)
+
+        render_cache = self.open_render_cache(mode="split", target=str(directory.resolve()))
+        if render_cache and rebuild:
+            render_cache.clear()
+        manifest = SplitManifest(self.campaign.cache_dir)
+        old_digests = {} if rebuild else manifest.digests(directory)
+
+        index = SplitFile(file_name=f"index.{suffix}")
+        taken = {index.file_name.lower()}
+        files = []
+        template_digests = {}
+
+        def piece_key(name: str, header_level: int, content: Any) -> str:
+            if name not in template_digests:
+                template_digests[name] = self.template_digest(jenv, name)
+            if not template_digests[name]:
+                return None
+            return RenderCache.make_key(
+                template_digests[name], self.lang, self.base_header_level, header_level, content)
+
+        for stem, context, content in self.pieces():
+            if "group" in context and context["header_level"] == self.base_header_level:
+                group = context["group"]
+                files.append(SplitFile(file_name=split_file_name(group, suffix, taken), group=group, pieces=[]))
+            if "character" in context:
+                stats.characters += 1
+            else:
+                stats.groups += 1
+            name = f"{stem}.{suffix}"
+            files[-1].pieces.append((name, context, piece_key(name, context["header_level"], content)))
+
+        entries = [{"group": split.group, "file": split.file_name} for split in files]
+        index.pieces = [(f"group_index.{suffix}", {
+            "header_level": self.base_header_level,
+            "groups": entries,
+        }, piece_key(f"group_index.{suffix}", self.base_header_level, [
+            [entry["group"].title, entry["group"].grouping, entry["file"]] for entry in entries
+        ]))]
+        files.append(index)
+
+        for split in files:
+            keys = [key for _, _, key in split.pieces]
+            if all(keys):
+                split.digest = RenderCache.make_key(split.file_name, *keys)
+
+        def characters_in(split: SplitFile) -> int:
+            return sum(1 for _, context, _ in split.pieces if "character" in context)
+
+        written = []
+        hits, misses = markdown_counts()
+        with ThreadPoolExecutor() as pool:
+            writes = []
+            for split in files:
+                path = directory / split.file_name
+                if split.digest and old_digests.get(split.file_name) == split.digest and path.exists():
+                    for _ in range(characters_in(split)):
+                        progress_callback()
+                    continue
+
+                texts = []
+                for name, context, key in split.pieces:
+                    text = render_cache.get(key) if render_cache and key else None
+                    if text is None:
+                        text = jenv.get_template(name).render(context)
+                        if render_cache and key:
+                            render_cache.store(key, text)
+                    else:
+                        stats.cached += 1
+                    texts.append(text)
+                writes.append(pool.submit(write_split_file, path, texts))
+                written.append(path)
+                for _ in range(characters_in(split)):
+                    progress_callback()
+
+            for write in writes:
+                write.result()
+
+        new_hits, new_misses = markdown_counts()
+        stats.markdown_hits += new_hits - hits
+        stats.markdown_misses += new_misses - misses
+
+        current = {split.file_name for split in files}
+        for file_name in old_digests.keys() - current:
+            (directory / file_name).unlink(missing_ok=True)
+        manifest.set_digests(directory, {split.file_name: split.digest for split in files if split.digest})
+
+        if render_cache:
+            render_cache.save()
+        logger.info(f"Listing stats: {stats}")
+        return written
+
+    @property
+    def bytecode_dir(self) -> Path:
+        """Get the directory where compiled templates are stored
+
+        Returns:
+            Path: Path to the template bytecode cache within the campaign's cache dir
+        """
+        return self.campaign.cache_dir / "templates"
+
+    def environment(self) -> Environment:
+        """Get the Jinja environment for our campaign's templates
+
+        Environments are shared by every lister in this process which uses the same template directories, so
+        long-running processes like npc serve only load and compile each template once. A shared environment
+        is replaced as soon as any template file is added, removed, or changed.
+
+        Compiled templates are also stored in the campaign's cache dir, so new environments can skip
+        compiling templates which have not changed since an earlier run.
+
+        Returns:
+            Environment: Jinja environment for rendering listings
+        """
+        loader = CharacterFallbackLoader(self.campaign)
+        key = tuple(loader.searchpath)
+        jenv = shared_environments.get(key)
+        if jenv is None or not jenv.loader.is_current():
+            jenv = make_environment(loader, self.bytecode_dir)
+            shared_environments[key] = jenv
+        return jenv
+
+    def open_render_cache(self, lang: str = None, *, mode: str = "full", target: str = None) -> RenderCache:
+        """Open the render cache for this campaign
+
+        The cache file is stored in the campaign's cache dir. Its scope is the language, our base header level,
+        the kind of listing, and where it goes. Saving a listing only prunes entries from its own scope, so
+        full and split listings, or listings to different places, do not evict each other's pieces.
+
+        Args:
+            lang (str): Language of the listing which will use the cache. Defaults to our lang.
+            mode (str): Kind of listing, either "full" or "split" (default: `"full"`)
+            target (str): Name of the file or directory receiving the listing, if it has one (default: `None`)
+
+        Returns:
+            RenderCache: The render cache object, or None if the cache is turned off
+        """
+        if not self.render_cache:
+            return None
+
+        if lang is None:
+            lang = self.lang
+        self.campaign.cache_dir.mkdir(parents=True, exist_ok=True)
+        scope = f"{lang}:{self.base_header_level}:{mode}:{target or ''}"
+        return RenderCache(self.campaign.cache_dir / RenderCache.FILENAME, scope)
+
+    @staticmethod
+    def target_name(target: TextIO) -> str:
+        """Get a name for the place a listing is emitted to
+
+        Files opened by path give their absolute path. Streams like stdout give the name they report, like
+        "<stdout>", and those without one give None.
+
+        Args:
+            target (TextIO): Target of a listing
+
+        Returns:
+            str: Name of the target, or None if it has no name
+        """
+        name = getattr(target, "name", None)
+        if not isinstance(name, str):
+            return None
+        if name.startswith("<"):
+            return name
+        return os.path.abspath(name)
+
+    @staticmethod
+    def template_digest(jenv: Environment, name: str) -> str:
+        """Get a hash of the source of a template and every template it uses
 
+        The template is resolved through the environment's loader, so the hash is of whichever file would be
+        rendered, including any fallback. Templates named in extends, include, and import tags are followed as
+        well.
+
+        Args:
+            jenv (Environment): Jinja environment which loads the templates
+            name (str): Name of the template
+
+        Returns:
+            str: Hex digest of the template sources, or None if the template uses a template whose name is only
+            known when it is rendered
+        """
+        digest = sha256()
+        seen = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+
+            source, _, _ = jenv.loader.get_source(jenv, current)
+            digest.update(current.encode("utf-8") + b"\0" + source.encode("utf-8") + b"\0")
+            for referenced in find_referenced_templates(jenv.parse(source)):
+                if referenced is None:
+                    return None
+                pending.append(referenced)
+        return digest.hexdigest()
+
+    def pieces(self) -> Iterator[tuple[str, dict, Any]]:
+        """Get the template stems and contexts for every piece of the listing, in order
+
+        Group headers are yielded whenever one of the group values changes, followed by each character in
+        the group. The contexts only hold views, so they can be rendered in another process.
+
+        Each piece also comes with a description of its content, which identifies the piece in the render cache.
+
+        The template stem is the template name without its language suffix, so the same pieces can be rendered
+        in any language.
+
+        Yields:
+            tuple[str, dict, Any]: Template stem, the context to render it with, and the piece's content
+        """
         builder = CharacterListerQueryBuilder()
         builder.group_by(*self.group_by)
         builder.sort_by(*self.sort_by)
@@ -92,38 +682,26 @@ class CharacterLister:
         current_group_values: list[str] = []
         results = self.collection.apply_query(builder.query)
 
-        group_template = gt(self.group_template_name)
         for row in results:
             for group_index in range(num_groups):
                 row_value = row[group_index + 1]
                 if group_index >= len(current_group_values) or current_group_values[group_index] != row_value:
                     current_group_values[group_index::] = [row_value]
-                    write(
-                        group_template.render(
-                            {
-                                "header_level": self.base_header_level + group_index,
-                                "group": GroupView(
-                                    title=row_value,
-                                    grouping=builder.grouped_by[group_index]),
-                            }
-                        )
-                    )
-                    write("\n\n")
+                    yield "group_heading", {
+                        "header_level": self.base_header_level + group_index,
+                        "group": GroupView(
+                            title=row_value,
+                            grouping=builder.grouped_by[group_index]),
+                    }, [row_value, builder.grouped_by[group_index]]
 
             character = row[0]
+            character.build_tag_tree()
             character_view = CharacterView(character)
-            character_template = gt(self.character_template_name(character_view.type))
-            write(
-                character_template.render(
-                    {
-                        "header_level": character_header_level,
-                        "character": character_view,
-                        "has": character_view.has,
-                    }
-                )
-            )
-            write("\n\n")
-            progress_callback()
+            yield character_view.type, {
+                "header_level": character_header_level,
+                "character": character_view,
+                "has": character_view.has,
+            }, character_content(character)
 
     @cached_property
     def template_suffix(self) -> str:
@@ -135,7 +713,19 @@ class CharacterLister:
         Returns:
             str: File suffix string
         """
-        return self.LANG_SUFFIXES.get(self.lang, self.lang)
+        return self.lang_suffix(self.lang)
+
+    @classmethod
+    def lang_suffix(cls, lang: str) -> str:
+        """Get the template suffix for a language
+
+        Args:
+            lang (str): Name of the language
+
+        Returns:
+            str: Suffix from LANG_SUFFIXES for the built-in languages, or the language itself for any other
+        """
+        return cls.LANG_SUFFIXES.get(lang, lang)
 
     @property
     def group_template_name(self) -> str:
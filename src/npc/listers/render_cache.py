@@ -0,0 +1,153 @@
+import json
+from hashlib import sha256
+from pathlib import Path
+from sqlalchemy import create_engine, bindparam, select, delete, insert, MetaData, Table, Column, String, Text
+from sqlalchemy.pool import SingletonThreadPool
+
+from npc import __version__ as npc_version
+
+metadata = MetaData()
+
+rendered_pieces = Table(
+    "rendered_pieces",
+    metadata,
+    Column("scope", Text, primary_key=True),
+    Column("key", String(64), primary_key=True),
+    Column("text", Text, nullable=False),
+)
+
+cache_meta = Table(
+    "cache_meta",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("value", Text),
+)
+
+class RenderCache():
+    """Persistent cache of rendered listing pieces
+
+    Each group heading and character entry is stored under a key made from everything that went into
+    rendering it: the template sources, the language, the header level, and the content of the character or
+    group. A piece whose key is found does not need to be rendered again.
+
+    Entries belong to a scope, which describes the listing that made them: its language, base header level,
+    kind, and target. Saving prunes every entry of the same scope which was not used since the cache was
+    opened, so the cache only ever holds the pieces of the latest listing in each scope. The same piece can
+    be stored in several scopes.
+
+    Everything in the cache is thrown out when the package version or the cache layout change.
+    """
+
+    FILENAME = "rendered_listing.sqlite"
+    FORMAT = 2
+
+    def __init__(self, db_path: Path, scope: str):
+        self.db_path = db_path
+        self.scope = scope
+        self.engine = create_engine(f"sqlite:///{db_path}", poolclass=SingletonThreadPool)
+        metadata.create_all(self.engine)
+        if self.stored_version != self.version_key():
+            metadata.drop_all(self.engine)
+            metadata.create_all(self.engine)
+            self.clear()
+
+        self._entries: dict[str, str] = None
+        self._used: set[str] = set()
+        self._changed: dict[str, str] = {}
+
+    @classmethod
+    def version_key(cls) -> str:
+        """Get a key for the layout of the cache and the code that renders listings
+
+        Returns:
+            str: Hex digest of the cache format and package version
+        """
+        data = [cls.FORMAT, npc_version]
+        return sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Combine the inputs of a rendered piece into a single key
+
+        Args:
+            parts: JSON-compatible values that determine the piece's output
+
+        Returns:
+            str: Hex digest of the parts
+        """
+        return sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def stored_version(self) -> str:
+        """Get the version key stored in the cache file
+
+        Returns:
+            str: Stored version key, or None if the cache is new
+        """
+        query = select(cache_meta.c.value).where(cache_meta.c.key == "version")
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    def clear(self):
+        """Remove every entry from the cache and store the current version key"""
+        with self.engine.begin() as conn:
+            conn.execute(delete(rendered_pieces))
+            conn.execute(delete(cache_meta))
+            conn.execute(insert(cache_meta).values(key="version", value=self.version_key()))
+        self._entries = None
+
+    @property
+    def entries(self) -> dict[str, str]:
+        """Get the stored entries in our scope, loading them on first use
+
+        Returns:
+            dict[str, str]: Dict of keys and their rendered text
+        """
+        if self._entries is None:
+            query = select(rendered_pieces.c.key, rendered_pieces.c.text) \
+                .where(rendered_pieces.c.scope == self.scope)
+            with self.engine.connect() as conn:
+                self._entries = {row[0]: row[1] for row in conn.execute(query)}
+        return self._entries
+
+    def get(self, key: str) -> str:
+        """Get the rendered text for a key
+
+        Args:
+            key (str): Key of the piece, from make_key()
+
+        Returns:
+            str: The stored text, or None if the piece must be rendered
+        """
+        self._used.add(key)
+        return self._changed.get(key, self.entries.get(key))
+
+    def store(self, key: str, text: str):
+        """Remember the rendered text for a key
+
+        Args:
+            key (str): Key of the piece, from make_key()
+            text (str): Rendered text of the piece
+        """
+        self._used.add(key)
+        self._changed[key] = text
+
+    def save(self):
+        """Write new entries and prune the unused entries of our scope"""
+        removed = self.entries.keys() - self._used
+        with self.engine.begin() as conn:
+            if removed:
+                conn.execute(
+                    delete(rendered_pieces)
+                        .where(rendered_pieces.c.scope == self.scope)
+                        .where(rendered_pieces.c.key == bindparam("removed_key")),
+                    [{"removed_key": key} for key in removed],
+                )
+            if self._changed:
+                conn.execute(
+                    insert(rendered_pieces).prefix_with("OR REPLACE"),
+                    [{"key": key, "scope": self.scope, "text": text} for key, text in self._changed.items()],
+                )
+        self._entries = None
+        self._used = set()
+        self._changed = {}
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from npc.util import PersistentCache
+
+class SplitManifest(PersistentCache):
+    """Record of the files written by split listings
+
+    For each output directory, this stores the name of every file a split listing wrote there, along with a
+    digest of everything that went into the file. A file whose digest has not changed does not need to be
+    written again.
+
+    Directories are stored by their resolved path. Since paths contain periods, the data is read and written
+    directly instead of through period-delimited keys.
+    """
+
+    FILENAME = "split_listing.yaml"
+
+    def __init__(self, cache_dir: Path):
+        super().__init__(cache_dir / self.FILENAME)
+        self.load()
+
+    def digests(self, directory: Path) -> dict[str, str]:
+        """Get the stored file digests for a directory
+
+        Args:
+            directory (Path): Output directory of a split listing
+
+        Returns:
+            dict[str, str]: Dict of file names and their digests. Empty if nothing was written to the directory.
+        """
+        return dict(self.data.get(str(directory.resolve()), {}))
+
+    def set_digests(self, directory: Path, digests: dict[str, str]):
+        """Replace the file digests for a directory and save
+
+        Args:
+            directory (Path): Output directory of a split listing
+            digests (dict[str, str]): Dict of file names and their digests
+        """
+        self.data[str(directory.resolve())] = dict(digests)
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.save()
@@ -1 +1,2 @@
 from .fallback_loader import FallbackLoader, CharacterFallbackLoader
+from .indexed_loader import IndexedFileSystemLoader
@@ -1,8 +1,9 @@
-from jinja2 import BaseLoader, FileSystemLoader, TemplateNotFound
+from jinja2 import BaseLoader, TemplateNotFound
 from pathlib import Path
 # from importlib import resources
 
 from npc.campaign import Campaign
+from .indexed_loader import IndexedFileSystemLoader
 
 import logging
 logger = logging.getLogger(__name__)
@@ -82,13 +83,14 @@ class CharacterFallbackLoader(FallbackLoader):
     9. <user settings>/templates/characters/character.html
     10. <npc package>/templates/characters/character.html
 
-    Since in the worst case this results in 10 file lookups for every template request, it's a good idea to
-    set up the environment with auto_reload=False and call env.cache.clear() as needed.
+    The directories are scanned once by an IndexedFileSystemLoader, so even the worst case is just two table
+    lookups. It's still a good idea to set up the environment with auto_reload=False. Use is_current() to find
+    out when the template files have changed and a new loader is needed.
     """
     def __init__(self, campaign: Campaign):
         personal_templates = campaign.settings.personal_dir / "templates" / "characters"
         internal_templates = campaign.settings.install_base / "templates" / "characters"
-        self.loader = FileSystemLoader([
+        self.loader = IndexedFileSystemLoader([
             campaign.settings_dir / "templates" / "characters",
             personal_templates / campaign.system_key,
             internal_templates / campaign.system_key,
@@ -97,3 +99,20 @@ class CharacterFallbackLoader(FallbackLoader):
         ])
         self.fallback_stem = "character"
         self.system_key = campaign.system_key
+
+    @property
+    def searchpath(self) -> list[Path]:
+        """Get the directories searched for templates, in order
+
+        Returns:
+            list[Path]: List of template directories
+        """
+        return self.loader.searchpath
+
+    def is_current(self) -> bool:
+        """Get whether the template files are the same as when they were first looked up
+
+        Returns:
+            bool: True if no template file has been added, removed, or changed since the first lookup
+        """
+        return self.loader.is_current()
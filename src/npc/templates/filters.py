@@ -1,3 +1,9 @@
+from functools import lru_cache
+import mistletoe
+
+# Most distinct strings the markdown filters remember
+MARKDOWN_CACHE_SIZE = 2048
+
 def trim_tags(value: str) -> str:
     """Filter function to remove leading and trailing tags
 
@@ -16,3 +22,44 @@ def trim_tags(value: str) -> str:
         return value[start:end]
     except ValueError as e:
         return value
+
+@lru_cache(maxsize=MARKDOWN_CACHE_SIZE)
+def cached_markdown(value: str) -> str:
+    """Convert a string of markdown to HTML, remembering recent results
+
+    Args:
+        value (str): Markdown string to convert
+
+    Returns:
+        str: HTML for the string
+    """
+    return mistletoe.markdown(value)
+
+def markdown(value) -> str:
+    """Filter function to convert markdown to a block of HTML
+
+    Strings are converted through cached_markdown(), so values shared by many characters, like org names and
+    boilerplate descriptions, are only parsed once. Anything else is converted without the cache.
+
+    Args:
+        value (str): Markdown to convert
+
+    Returns:
+        str: HTML for the value
+    """
+    if isinstance(value, str):
+        return cached_markdown(value)
+    return mistletoe.markdown(value)
+
+def markdown_inline(value) -> str:
+    """Filter function to convert markdown to inline HTML
+
+    This uses the same cache as markdown(), then removes the outer tag with trim_tags().
+
+    Args:
+        value (str): Markdown to convert
+
+    Returns:
+        str: Inline HTML for the value
+    """
+    return trim_tags(markdown(value))
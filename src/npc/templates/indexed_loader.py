@@ -0,0 +1,105 @@
+import os
+from pathlib import Path
+from jinja2 import BaseLoader, TemplateNotFound
+from jinja2.loaders import split_template_path
+
+class IndexedFileSystemLoader(BaseLoader):
+    """Jinja template loader which finds every template in its search paths with a single scan
+
+    This resolves template names the same way as Jinja's FileSystemLoader: the first search path holding a
+    file with the template's name wins. Instead of probing each search path on every lookup, it walks all of
+    them once and keeps a table of template names and the files they resolve to.
+
+    The scan also records the size and modification time of every file. Use is_current() to check whether any
+    template file has been added, removed, or changed since then.
+    """
+    def __init__(self, searchpath: list[Path], encoding: str = "utf-8"):
+        self.searchpath: list[Path] = [Path(path) for path in searchpath]
+        self.encoding: str = encoding
+        self._table: dict[str, Path] = None
+        self._stamps: list = None
+
+    def scan(self) -> tuple[dict[str, Path], list]:
+        """Walk the search paths to find every template file
+
+        Returns:
+            tuple[dict[str, Path], list]: Table of template names and their files, and a sorted list of
+            (path, size, mtime_ns) tuples for every file found
+        """
+        table = {}
+        stamps = []
+        for base in self.searchpath:
+            for dir_path, dir_names, file_names in os.walk(base):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    path = Path(dir_path, file_name)
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    stamps.append((str(path), stat.st_size, stat.st_mtime_ns))
+                    table.setdefault(path.relative_to(base).as_posix(), path)
+        return table, sorted(stamps)
+
+    @property
+    def table(self) -> dict[str, Path]:
+        """Get the table of template names and the files they resolve to, scanning on first use
+
+        Returns:
+            dict[str, Path]: Dict of template names and template file paths
+        """
+        if self._table is None:
+            self._table, self._stamps = self.scan()
+        return self._table
+
+    def is_current(self) -> bool:
+        """Get whether the template files are the same as when they were scanned
+
+        A loader which has not looked up any templates yet has nothing to be out of date, so it is current.
+
+        Returns:
+            bool: True if no template file has been added, removed, or changed since the scan
+        """
+        if self._table is None:
+            return True
+        return self.scan()[1] == self._stamps
+
+    def get_source(self, environment, template: str) -> tuple:
+        """Get the source of a template from its file
+
+        Args:
+            environment (Environment): Jinja env for template compilation
+            template (str): Name of the template to get
+
+        Returns:
+            tuple: The template source, its file path, and a function that says whether the file is unchanged
+
+        Raises:
+            TemplateNotFound: Raised if no search path has a file with the template's name
+        """
+        name = "/".join(split_template_path(template))
+        path = self.table.get(name)
+        if path is None:
+            raise TemplateNotFound(template)
+
+        try:
+            source = path.read_text(encoding=self.encoding)
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            raise TemplateNotFound(template)
+
+        def uptodate() -> bool:
+            try:
+                return path.stat().st_mtime == mtime
+            except OSError:
+                return False
+
+        return source, os.path.normpath(path), uptodate
+
+    def list_templates(self) -> list[str]:
+        """Get the names of every template
+
+        Returns:
+            list[str]: Sorted list of template names
+        """
+        return sorted(self.table)
@@ -1,14 +1,18 @@
 from pathlib import Path
 
 from npc.characters import Character
+from .tag_view import tag_data
 from .tag_view_collection import TagViewCollection
 
 class CharacterView:
     """A static representation of a character's values and tags
 
-    This class dynamically creates attributes for each tag name during initialization. This lets templates
-    easily access tag values. With the similar setup of the TagView class, this allows for a fluent-style
-    interface within templates.
+    Each tag name can be read as an attribute holding a TagViewCollection. This lets templates easily access
+    tag values. With the similar setup of the TagView class, this allows for a fluent-style interface within
+    templates.
+
+    The character's visible tags are copied when the view is created, but their views are only made the first
+    time each tag name is used.
 
     Examples:
         character.realname                  # Fred
@@ -16,12 +20,15 @@ class CharacterView:
         character.org.first().role.all()    # Teller, Janitor, ...
         character.org.rest()                # Olympus Mons Bowling Club, ...
     """
+    __slots__ = ("type", "file_path", "description", "realname", "mnemonic", "_tags")
+
     def __init__(self, character: Character):
         self.type: str = character.type_key
         self.file_path = character.file_path or Path("")
         self.description: str = character.desc or ""
         self.realname: str = character.realname or ""
         self.mnemonic: str = character.mnemonic or ""
+        self._tags: dict = {}
 
         for tag in character.tags:
             if tag.hidden:
@@ -31,9 +38,32 @@ class CharacterView:
                 self.type = tag.value
                 continue
 
-            if not hasattr(self, tag.name):
-                setattr(self, tag.name, TagViewCollection())
-            getattr(self, tag.name).append_tag(tag)
+            self._tags.setdefault(tag.name, []).append(tag_data(tag))
+
+    def __getattr__(self, tag_name: str) -> TagViewCollection:
+        """Get the collection of tags with a given name
+
+        Names starting with an underscore are never tags.
+
+        Args:
+            tag_name (str): Name of the tags to get
+
+        Returns:
+            TagViewCollection: Collection of views for every visible tag with that name
+
+        Raises:
+            AttributeError: Raised when the character has no visible tag with that name
+        """
+        if tag_name.startswith("_"):
+            raise AttributeError(tag_name)
+        try:
+            tags = self._tags[tag_name]
+        except KeyError:
+            raise AttributeError(tag_name) from None
+        if not isinstance(tags, TagViewCollection):
+            tags = TagViewCollection.from_data(tags)
+            self._tags[tag_name] = tags
+        return tags
 
     def __str__(self) -> str:
         """Return a printable representation of this view
@@ -49,7 +79,7 @@ class CharacterView:
     def has(self, tag_name: str) -> bool:
         """Get whether a named tag is present
 
-        This is just a convenience wrapper around hasattr.
+        This works like hasattr, without creating the tag views.
 
         Args:
             tag_name (str): Name of the tag to check
@@ -57,7 +87,7 @@ class CharacterView:
         Returns:
             bool: True if this character has at least one tag with the given name, false otherwise
         """
-        return hasattr(self, tag_name)
+        return tag_name in self._tags or hasattr(self, tag_name)
 
     def first(self, tag_name: str) -> str:
         """Get the first possible value for the given tag
@@ -1,21 +1,95 @@
 from npc.characters import Tag
 
+def tag_data(tag: Tag) -> tuple:
+    """Get a compact copy of a tag and all of its subtags
+
+    Views keep these tuples instead of the tags themselves, so they stay the same when the tags change and
+    can be sent to other processes.
+
+    Args:
+        tag (Tag): The tag to copy
+
+    Returns:
+        tuple: The tag's name, value, and a tuple of the same for each of its subtags
+    """
+    return (tag.name, tag.value, tuple(tag_data(subtag) for subtag in tag.subtags))
+
+def group_data(tags: tuple) -> dict[str, list]:
+    """Group tag data by tag name
+
+    Args:
+        tags (tuple): Tag data tuples, from tag_data()
+
+    Returns:
+        dict[str, list]: Dict of tag names and the data for every tag with that name, in order
+    """
+    groups = {}
+    for data in tags:
+        groups.setdefault(data[0], []).append(data)
+    return groups
+
 class TagView:
     """A static representation of a tag's values and subtags
 
-    This class dynamically creates attributes for each subtag name during initialization. This lets templates
-    easily access subtag values.
+    Each subtag name can be read as an attribute holding a TagViewCollection. This lets templates easily access
+    subtag values. The collections are only made when they are first used, from a copy of the subtags taken
+    when the view is created.
     """
+    __slots__ = ("name", "value", "_subtags")
+
     def __init__(self, tag: Tag):
-        from .tag_view_collection import TagViewCollection
+        self._load(tag_data(tag))
+
+    @classmethod
+    def from_data(cls, data: tuple) -> "TagView":
+        """Create a view from copied tag data
 
-        self.name: str = tag.name
-        self.value: str = tag.value
+        Args:
+            data (tuple): Tag data tuple, from tag_data()
+
+        Returns:
+            TagView: New view of the tag data
+        """
+        view = cls.__new__(cls)
+        view._load(data)
+        return view
+
+    def _load(self, data: tuple):
+        """Set up this view from copied tag data
+
+        Args:
+            data (tuple): Tag data tuple, from tag_data()
+        """
+        self.name: str = data[0]
+        self.value: str = data[1]
+        self._subtags: dict = group_data(data[2])
+
+    def __getattr__(self, tag_name: str):
+        """Get the collection of subtags with a given name
+
+        Names starting with an underscore are never subtags.
+
+        Args:
+            tag_name (str): Name of the subtags to get
+
+        Returns:
+            TagViewCollection: Collection of views for every subtag with that name
+
+        Raises:
+            AttributeError: Raised when there is no subtag with that name
+        """
+        from .tag_view_collection import TagViewCollection
 
-        for subtag in tag.subtags:
-            if not hasattr(self, subtag.name):
-                setattr(self, subtag.name, TagViewCollection())
-            getattr(self, subtag.name).append_tag(subtag)
+        if tag_name.startswith("_"):
+            raise AttributeError(tag_name)
+        try:
+            subtags = self._subtags[tag_name]
+        except KeyError:
+            raise AttributeError(tag_name) from None
+        if not isinstance(subtags, TagViewCollection):
+            subtags = TagViewCollection.from_data(subtags)
+            self._subtags[tag_name] = subtags
+        return subtags
 
     def __str__(self) -> str:
         """Return a printable representation of this view
@@ -31,7 +105,7 @@ class TagView:
     def has(self, tag_name: str) -> bool:
         """Get whether a named subtag is present
 
-        This is just a convenience wrapper around hasattr.
+        This works like hasattr, without creating the subtag views.
 
         Args:
             tag_name (str): Name of the subtag to check
@@ -39,4 +113,4 @@ class TagView:
         Returns:
             bool: True if this tag has at least one subtag with the given name, false otherwise
         """
-        return hasattr(self, tag_name)
+        return tag_name in self._subtags or hasattr(self, tag_name)
@@ -1,18 +1,35 @@
 from npc.characters import Tag
-from .tag_view import TagView
+from .tag_view import TagView, tag_data
 
 class TagViewCollection:
     """Stores related TagViews
 
-    All TagView objects in a collection should have the same name.
+    All TagView objects in a collection should have the same name. Each view is only made when it is first
+    used, from a copy of its tag's data.
     """
-    def __init__(self, tags: list[TagView] = None):
-        self.tag_views: list[TagView] = []
+    __slots__ = ("_entries",)
+
+    def __init__(self, tags: list[Tag] = None):
+        self._entries: list = []
 
         if tags:
             for tag in tags:
                 self.append_tag(tag)
 
+    @classmethod
+    def from_data(cls, tags: list[tuple]) -> "TagViewCollection":
+        """Create a collection from copied tag data
+
+        Args:
+            tags (list[tuple]): Tag data tuples, from tag_data()
+
+        Returns:
+            TagViewCollection: New collection holding a view for each tag
+        """
+        collection = cls()
+        collection._entries = list(tags)
+        return collection
+
     def __str__(self) -> str:
         """Return the value of this collection's first tag view
 
@@ -24,18 +41,41 @@ class TagViewCollection:
         Returns:
             str: The value of our first tag
         """
-        if self.tag_views:
+        if self._entries:
             return str(self.first())
         return ""
 
+    def _view(self, index: int) -> TagView:
+        """Get the view at an index, making it if needed
+
+        Args:
+            index (int): Index of the view
+
+        Returns:
+            TagView: The view at that index
+        """
+        entry = self._entries[index]
+        if not isinstance(entry, TagView):
+            entry = TagView.from_data(entry)
+            self._entries[index] = entry
+        return entry
+
+    @property
+    def tag_views(self) -> list[TagView]:
+        """Get all stored TagView objects
+
+        Returns:
+            list[TagView]: List of TagView objects
+        """
+        return [self._view(index) for index in range(len(self._entries))]
+
     def append_tag(self, tag: Tag):
         """Add a TagView to this collection using data from the passed tag
 
         Args:
             tag (Tag): The tag to use for the new TagView
         """
-        view = TagView(tag)
-        self.tag_views.append(view)
+        self._entries.append(tag_data(tag))
 
     def all(self) -> list[TagView]:
         """Get all stored TagView objects
@@ -51,7 +91,7 @@ class TagViewCollection:
         Returns:
             TagView: The first TagView object in this collection
         """
-        return self.tag_views[0]
+        return self._view(0)
 
     def rest(self) -> list[TagView]:
         """Get all TagView objects after the first
@@ -2,11 +2,22 @@
 Package for the npc command-line program
 """
 
-try:
-    from rich.traceback import install
-    import click, sqlalchemy
-    install(suppress=[click, sqlalchemy])
-except ImportError:
-    pass
-
-from .commands.main_group import cli
+def __getattr__(name: str):
+    """Load the cli command group on first use
+
+    Importing the commands is slow, so it is put off until something asks for them. This lets the
+    lightweight npc_cli.client module be imported on its own.
+    """
+    if name != "cli":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        from rich.traceback import install
+        import click, sqlalchemy
+        install(suppress=[click, sqlalchemy])
+    except ImportError:
+        pass
+
+    from .commands.main_group import cli
+    globals()["cli"] = cli
+    return cli
@@ -0,0 +1,187 @@
+"""Entry point for the npc command which hands commands to a running npc serve process
+
+Importing the full CLI takes far longer than most commands need once a campaign is loaded. This module only
+uses the standard library, so it can find a campaign's server and forward the command to it without loading
+any of NPC. When no server is running, or the command cannot be forwarded, the normal CLI is run instead.
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+import getpass
+import hashlib
+import tempfile
+from pathlib import Path
+
+SOCKET_NAME = "serve.sock"
+MAX_SOCKET_PATH = 100
+CONNECT_TIMEOUT = 0.5
+
+def find_campaign_root(starting_dir: str) -> Path:
+    """Find the root dir of a campaign
+
+    This works the same way as npc.campaign.find_campaign_root, without importing it.
+
+    Args:
+        starting_dir (str): Path whose parents will be searched
+
+    Returns:
+        Path: Directory of the campaign's root dir, or None if no config dir was found
+    """
+    current_dir = os.path.abspath(starting_dir)
+    while not os.path.isdir(os.path.join(current_dir, ".npc")):
+        parent = os.path.dirname(current_dir)
+        if parent == current_dir:
+            return None
+        current_dir = parent
+    return Path(current_dir)
+
+def runtime_dir() -> Path:
+    """Get the directory for the sockets of campaigns whose own path is too long
+
+    This is an npc directory within $XDG_RUNTIME_DIR when that is set. Otherwise it is a directory in the
+    system temp dir named after the current user's ID. Either way, the server creates it so that only the
+    current user can use it.
+
+    Returns:
+        Path: Path to the directory, which may not exist yet
+    """
+    xdg_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if xdg_dir and os.path.isabs(xdg_dir):
+        return Path(xdg_dir) / "npc"
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return Path(tempfile.gettempdir()) / f"npc-{user}"
+
+def private_socket(path: Path) -> bool:
+    """Check that nobody else can put a socket where ours is expected
+
+    Sockets in a campaign's cache dir are as private as the campaign itself. A socket in the runtime_dir() is
+    only trusted when that directory is a real directory owned by the current user, with no permissions for
+    anyone else.
+
+    Args:
+        path (Path): Path of a campaign's server socket
+
+    Returns:
+        bool: True if the socket is safe to use, False if other users could have made or swapped it
+    """
+    if path.parent != runtime_dir() or not hasattr(os, "getuid"):
+        return True
+    try:
+        info = os.lstat(path.parent)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+def socket_path(campaign_root: Path) -> Path:
+    """Get the path of the socket a campaign's server listens on
+
+    The socket lives in the campaign's cache dir. Since socket paths have a short length limit, campaigns
+    with very long paths use a socket in the runtime_dir() instead, named after the campaign's path.
+
+    Args:
+        campaign_root (Path): Root dir of the campaign
+
+    Returns:
+        Path: Path to the campaign's server socket
+    """
+    path = Path(campaign_root) / ".npc" / "cache" / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return path
+
+    digest = hashlib.sha256(str(campaign_root).encode("utf-8")).hexdigest()[:16]
+    return runtime_dir() / f"{digest}.sock"
+
+def forwardable(args: list[str]) -> bool:
+    """Get whether a command can be run by a campaign server
+
+    Only commands which read the campaign without asking for input or launching other programs are
+    forwarded. Those are list, find, lint without --edit, report values, and reorg with --batch. Help output
+    is never forwarded.
+
+    Args:
+        args (list[str]): Command line arguments, without the program name
+
+    Returns:
+        bool: True if the command can be forwarded, False if it must run here
+    """
+    if not args or "--help" in args:
+        return False
+
+    command, rest = args[0], args[1:]
+    match command:
+        case "list" | "find":
+            return True
+        case "lint":
+            return "--edit" not in rest
+        case "report":
+            return rest[:1] == ["values"]
+        case "reorg":
+            return "--batch" in rest
+    return False
+
+def send_request(path: Path, request: dict) -> dict:
+    """Send a request to a campaign server and wait for its response
+
+    Args:
+        path (Path): Path to the server's socket
+        request (dict): Request data
+
+    Returns:
+        dict: Response data
+
+    Raises:
+        OSError: Raised when the server cannot be reached
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONNECT_TIMEOUT)
+        client.connect(str(path))
+        client.settimeout(None)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while chunk := client.recv(64 * 1024):
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+def forward(args: list[str], cwd: str) -> dict:
+    """Run a command using the server for the campaign containing cwd
+
+    Args:
+        args (list[str]): Command line arguments, without the program name
+        cwd (str): Directory to run the command in
+
+    Returns:
+        dict: Response with the command's output, errors, and exit_code, or None if no server could run it
+    """
+    if not forwardable(args) or not hasattr(socket, "AF_UNIX"):
+        return None
+
+    campaign_root = find_campaign_root(cwd)
+    if not campaign_root:
+        return None
+
+    path = socket_path(campaign_root.resolve())
+    if not path.exists() or not private_socket(path):
+        return None
+
+    try:
+        return send_request(path, {"args": args, "cwd": cwd})
+    except (OSError, ValueError):
+        return None
+
+def main():
+    """Run an npc command, using a campaign server when possible"""
+    response = forward(sys.argv[1:], os.getcwd())
+    if response is not None:
+        sys.stdout.write(response["output"])
+        sys.stdout.flush()
+        sys.stderr.write(response.get("errors", ""))
+        sys.stderr.flush()
+        sys.exit(response["exit_code"])
+
+    from npc_cli import cli
+    cli()
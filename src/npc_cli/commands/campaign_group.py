@@ -1,4 +1,5 @@
 import click
+import socket
 from click import echo
 from pathlib import Path
 
@@ -6,6 +7,7 @@ import npc
 from npc_cli.presenters import directory_list, campaign_info
 from npc_cli.helpers import campaign_or_fail, find_or_make_settings_file
 from npc_cli.errors import CampaignNotFoundException
+from npc_cli.server import CampaignServer, stop_server
 
 from .main_group import cli, arg_settings, pass_settings
 
@@ -112,3 +114,50 @@ def latest(settings, planning_type: str):
 
     files = [campaign.get_latest_planning_file(key) for key in keys]
     npc.util.edit_files(files, settings = settings)
+
+###################
+# Serve a campaign
+###################
+
+@cli.command()
+@click.option("--stop",
+    is_flag=True,
+    default=False,
+    help="Stop the server that is running for this campaign")
+@click.option("--poll",
+    is_flag=True,
+    default=False,
+    help="Scan for character changes instead of using inotify")
+@pass_settings
+def serve(settings, stop, poll):
+    """Keep this campaign loaded to speed up other commands
+
+    This command only works within an existing campaign.
+
+    While the server runs, the list, lint, report values, and reorg --batch
+    commands are handed to it instead of loading the campaign themselves.
+    Character files are watched for changes, and the campaign is reloaded
+    when its settings change. Press Ctrl+C or run serve --stop to quit.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise click.ClickException("The server is not supported on this system")
+
+    campaign = campaign_or_fail(settings)
+
+    if stop:
+        if stop_server(campaign.root):
+            echo("Stopped the server")
+        else:
+            echo("No server is running for this campaign")
+        return
+
+    def ready():
+        echo(f"Serving {campaign.name}. Press Ctrl+C to stop.")
+
+    server = CampaignServer(campaign.root, polling=poll)
+    try:
+        server.serve_forever(ready_callback=ready)
+    except RuntimeError as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        pass
@@ -1,10 +1,11 @@
 import click
 from click import echo, ClickException
+from pathlib import Path
 
 from npc import characters, linters, listers
 from npc.util import edit_files, prune_empty_dirs
 from npc.campaign.reorganizers import CharacterReorganizer
-from npc_cli.presenters import type_list, tabularize
+from npc_cli.presenters import type_list, tabularize, search_results
 from npc_cli.helpers import campaign_or_fail, write_new_character
 from npc_cli.errors import BadCharacterTypeException
 
@@ -79,15 +80,19 @@ def new(settings, type_key, name, mnemonic, desc, tags):
 @click.option("--edit/--no-edit",
     default=False,
     help="Whether to open all character files with errors (default False)")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
 @pass_settings
-def lint(settings, edit):
+def lint(settings, edit, jobs):
     """Check character files for errors
 
     This command only works within an existing campaign.
     """
     campaign = campaign_or_fail(settings)
 
-    campaign.characters.seed()
+    campaign.characters.load(workers=jobs)
 
     error_characters = []
     for character in campaign.characters.all():
@@ -102,6 +107,129 @@ def lint(settings, edit):
     if edit and error_characters:
         edit_files(error_characters, settings = settings)
 
+#########################
+# Watch character files
+#########################
+
+@cli.command()
+@click.option("--poll",
+    is_flag=True,
+    default=False,
+    help="Scan for changes instead of using inotify")
+@click.option("-i", "--interval",
+    type=click.FloatRange(min=0.05),
+    default=1.0,
+    help="Seconds between checks for changes")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
+@pass_settings
+def watch(settings, poll, interval, jobs):
+    """Keep the character index up to date as files change
+
+    This command only works within an existing campaign.
+
+    The persistent character index is updated whenever a character file is
+    created, changed, moved, or deleted, until you press Ctrl+C. Other
+    commands that use the persistent index then start without reading any
+    character files.
+    """
+    campaign = campaign_or_fail(settings)
+
+    campaign.characters.open_index()
+    campaign.characters.refresh(workers=jobs)
+    echo(f"Watching {campaign.characters.count} characters. Press Ctrl+C to stop.")
+
+    def report(summary):
+        echo(f"Loaded {len(summary.loaded)} and removed {len(summary.removed)} character records")
+
+    try:
+        campaign.characters.watch(report, interval=interval, polling=poll, workers=jobs)
+    except KeyboardInterrupt:
+        pass
+
+###################
+# Search characters
+###################
+
+@cli.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option("-n", "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    help="Maximum number of characters to show (default 20)")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
+@pass_settings
+def find(settings, query, limit, jobs):
+    """Search the text of every character
+
+    This command only works within an existing campaign.
+
+    Names, mnemonics, descriptions, file bodies, and tag values are all
+    searched. Every term in QUERY must appear for a character to match. End
+    a term with * to match any word that starts with it. The best matches
+    are shown first, each with a snippet of its matching text.
+    """
+    campaign = campaign_or_fail(settings)
+
+    campaign.characters.load(workers=jobs)
+
+    results = campaign.characters.search(" ".join(query), limit)
+    if not results:
+        echo("No characters found")
+        return
+
+    echo(search_results(results, campaign.root))
+
+##################
+# Open a character
+##################
+
+@cli.command("open")
+@click.argument("name", nargs=-1, required=True)
+@click.option("-n", "--limit",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Maximum number of characters to choose from (default 10)")
+@click.option("--first",
+    is_flag=True,
+    default=False,
+    help="Open the best match without asking")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
+@pass_settings
+def open_character(settings, name, limit, first, jobs):
+    """Open a character file by name
+
+    This command only works within an existing campaign.
+
+    NAME can be any part of a character's name or mnemonic, and small typos
+    are forgiven. When more than one character matches, you'll be asked
+    which one to open unless --first is given.
+    """
+    campaign = campaign_or_fail(settings)
+
+    campaign.characters.load(workers=jobs)
+
+    matches = campaign.characters.find_by_name(" ".join(name), limit)
+    if not matches:
+        echo("No characters found")
+        return
+
+    choice = 1
+    if len(matches) > 1 and not first:
+        for index, character in enumerate(matches, start=1):
+            echo(f"{index:>3}. {character.realname} - {character.mnemonic}")
+        choice = click.prompt("Which character?", type=click.IntRange(1, len(matches)), default=1)
+
+    edit_files([matches[choice - 1].file_path], settings = settings)
+
 #######################
 # List character files
 #######################
@@ -109,7 +237,8 @@ def lint(settings, edit):
 @cli.command()
 @click.option("-f", "--format", "lang",
     default=None,
-    help="The format to use.")
+    multiple=True,
+    help="The format to use. Give one for each output to write several formats at once.")
 @click.option("-g", "--group-by", "group",
     default=None,
     multiple=True,
@@ -124,36 +253,82 @@ def lint(settings, edit):
     help="The minimum header level to use.")
 @click.option("-o", "--output",
     type=click.File('w'),
-    required=True,
-    help='Where to put the listing. Use "-" for STDOUT.')
+    multiple=True,
+    help='Where to put the listing. Use "-" for STDOUT. Can be repeated along with --format.')
+@click.option("--split-by-group", "split_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Instead of --output, write one file for each top-level group into this directory, plus an index.")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading and rendering characters. Use 0 for one per CPU.")
+@click.option("--rebuild",
+    is_flag=True,
+    default=False,
+    help="Render every character, instead of reusing unchanged entries from the last listing.")
 @pass_settings
-def list(settings, lang, group, sort, output, header_level):
+def list(settings, lang, group, sort, output, split_dir, header_level, jobs, rebuild):
     """Generate a public listing of characters
 
     This command only works within an existing campaign.
 
     All options default to getting their values from your settings. Use the keys under
     campaign.characters.listing to see and change these default values.
+
+    To write more than one format at once, give a --format and an --output for each
+    one. They are paired up in order, so "-f html -o list.html -f markdown -o list.md"
+    writes both listings while only reading the characters once.
+
+    With --split-by-group, the listing is split into one file per value of the first
+    group. Files whose characters have not changed since the last split are left alone.
     """
     campaign = campaign_or_fail(settings)
 
-    campaign.characters.seed()
+    if split_dir:
+        if output:
+            raise click.BadParameter("cannot be used with --split-by-group", param_hint=["-o", "--output"])
+        if len(lang) > 1:
+            raise click.BadParameter("only one format can be split by group", param_hint=["-f", "--format"])
+    elif not output:
+        raise click.BadParameter("give an --output or use --split-by-group", param_hint=["-o", "--output"])
+    if len(lang) > 1 and len(lang) != len(output):
+        raise click.BadParameter("give one --output for each --format", param_hint=["-o", "--output"])
+    if len(lang) < 2 and len(output) > 1:
+        raise click.BadParameter("give one --format for each --output", param_hint=["-f", "--format"])
+
+    campaign.characters.load(workers=jobs)
 
     lister = listers.CharacterLister(
         campaign.characters,
-        lang=lang,
+        lang=lang[0] if lang else None,
         group_by=group,
         sort_by=sort,
-        base_header_level=header_level)
+        base_header_level=header_level,
+        workers=jobs)
 
-    if output.name != '<stdout>':
+    if split_dir:
+        if not lister.group_by:
+            raise click.BadParameter("a group is needed to split the listing", param_hint=["-g", "--group-by"])
         with click.progressbar(length=campaign.characters.count) as bar:
             def progress():
                 bar.update(1)
 
-            lister.list(target=output, progress_callback=progress)
+            lister.split(split_dir, progress_callback=progress, rebuild=rebuild)
+        return
+
+    outputs = [(lister.lang, output[0])]
+    if len(lang) > 1:
+        outputs = tuple(zip(lang, output))
+
+    if all(target.name != '<stdout>' for target in output):
+        with click.progressbar(length=campaign.characters.count) as bar:
+            def progress():
+                bar.update(1)
+
+            lister.list_many(outputs, progress_callback=progress, rebuild=rebuild)
     else:
-        lister.list(target=output)
+        lister.list_many(outputs, rebuild=rebuild)
 
 #############################
 # Reorganize character files
@@ -169,8 +344,12 @@ def list(settings, lang, group, sort, output, header_level):
 @click.option("--use-existing/--add-folders",
     default=True,
     help="Whether to only use existing ones or allow making new folders")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
 @pass_settings
-def reorg(settings, keep_empty, interactive, use_existing):
+def reorg(settings, keep_empty, interactive, use_existing, jobs):
     """Reorganize character files
 
     This command only works within an existing campaign.
@@ -185,7 +364,7 @@ def reorg(settings, keep_empty, interactive, use_existing):
     """
     campaign = campaign_or_fail(settings)
 
-    campaign.characters.seed()
+    campaign.characters.load(workers=jobs)
 
     reorganizer = CharacterReorganizer(campaign, exists=use_existing)
     reorganizer.gather_paths()
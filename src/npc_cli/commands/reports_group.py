@@ -26,8 +26,12 @@ def report():
     help="Tag to analyze")
 @click.option("-c", "--context",
     help="Parent context if tag is a subtag. Use '*' to disregard parent.")
+@click.option("-j", "--jobs",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes to use for reading character files. Use 0 for one per CPU.")
 @pass_settings
-def values(settings, tag_name, context):
+def values(settings, tag_name, context, jobs):
     """Show a how many times each unique value appears for the given tag
 
     This command only works within an existing campaign
@@ -36,7 +40,7 @@ def values(settings, tag_name, context):
     """
     campaign = campaign_or_fail(settings)
 
-    campaign.characters.seed()
+    campaign.characters.load(workers=jobs)
 
     spec = campaign.get_tag(tag_name)
     if spec.needs_context and context != "*":
@@ -15,12 +15,17 @@ logger = logging.getLogger(__name__)
 
 arg_settings: Settings = app_settings()
 
+# Campaigns kept loaded by a running server, keyed by their resolved root dir
+warm_campaigns: dict[Path, Campaign] = {}
+
 def get_campaign(settings: Settings) -> Campaign:
     """Make a campaign object for the nearest campaign to the current dir
 
     If the current dir or any of its parents is a campaign, return a new Campaign object. Otherwise, warn and
     return None.
 
+    When the campaign is in warm_campaigns, that object is returned instead of making a new one.
+
     Args:
         settings (Settings): Settings file to use when constructing the campaign
 
@@ -33,6 +38,9 @@ def get_campaign(settings: Settings) -> Campaign:
         return None
     logger.info(f"Found campaign root at {campaign_root}")
 
+    if warm := warm_campaigns.get(campaign_root.resolve()):
+        return warm
+
     campaign = Campaign(campaign_root, settings = settings)
     if not settings.package_outdated("campaign"):
         npc_version = settings.versions.get("package")
@@ -1,5 +1,6 @@
 from click import wrap_text
 from typing import Generator
+from pathlib import Path
 
 from npc.campaign import Campaign
 
@@ -119,3 +120,25 @@ def tag_table_data(tags: dict) -> Generator[tuple, None, None]:
         for subtag_name in tag.subtags:
             subtag = tags.get(subtag_name).in_context(tag.name)
             yield [f"\u2514 {subtag.name}", subtag.desc]
+
+def search_results(results: list, root: Path) -> str:
+    """Format the results of a character search
+
+    Each character is shown with its file path relative to root, followed by an indented snippet of its
+    matching text on one line.
+
+    Args:
+        results (list): SearchResult objects to show
+        root (Path): Directory to show file paths relative to
+
+    Returns:
+        str: Description of each result
+    """
+    lines: list[str] = []
+    for result in results:
+        path = result.character.file_path
+        if path.is_relative_to(root):
+            path = path.relative_to(root)
+        lines.append(f"{result.character.realname} ({path})")
+        lines.append("    " + " ".join(result.snippet.split()))
+    return "\n".join(lines)
@@ -0,0 +1,274 @@
+"""Long-running server that keeps a campaign loaded for CLI commands
+
+The server builds the campaign and loads its characters once, then answers commands sent by npc_cli.client
+over a Unix domain socket. A watcher keeps the characters current between commands, and the whole campaign is
+rebuilt whenever its settings change.
+"""
+
+import os
+import json
+import time
+import socket
+import struct
+import traceback
+from pathlib import Path
+from click.testing import CliRunner
+
+from npc.campaign import Campaign
+from npc.settings import app_settings
+from npc_cli import helpers
+from npc_cli.client import socket_path, send_request, runtime_dir, private_socket, forwardable
+
+# Seconds a client has to send its whole request before it is dropped
+REQUEST_TIMEOUT = 5.0
+
+class CampaignServer():
+    """Server which runs CLI commands against a warm campaign
+
+    Requests are JSON objects with the command's args and the cwd to run it in. Responses are JSON objects
+    with the command's output, its errors, and its exit_code. A request of {"stop": true} shuts the server
+    down.
+
+    Only the commands that npc_cli.client.forwardable() allows are run. The socket can only be used by the
+    user running the server, and connections from any other user are closed without an answer.
+
+    Requests are handled one at a time, since commands change the working directory while they run. A client
+    which does not finish sending its request within REQUEST_TIMEOUT seconds is dropped, so that it cannot
+    hold up everyone else.
+    """
+
+    def __init__(self, campaign_root: Path, *, polling: bool = False):
+        self.campaign_root = Path(campaign_root).resolve()
+        self.socket_path = socket_path(self.campaign_root)
+        self.polling = polling
+        self.personal_dir: Path = app_settings().personal_dir
+        self.campaign: Campaign = None
+        self.fingerprint: list = None
+        self.running = False
+
+    def settings_fingerprint(self) -> list:
+        """Get the size and modification time of every settings file the campaign uses
+
+        This covers the campaign's settings dir, except for its cache, and the user's personal settings dir.
+
+        Returns:
+            list: Sorted list of (path, size, mtime_ns) tuples
+        """
+        campaign_dir = self.campaign_root / ".npc"
+        cache_dir = str(campaign_dir / "cache")
+
+        fingerprint = []
+        for settings_dir in (campaign_dir, self.personal_dir):
+            for dir_path, dir_names, file_names in os.walk(settings_dir):
+                dir_names[:] = [d for d in dir_names if os.path.join(dir_path, d) != cache_dir]
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        return sorted(fingerprint)
+
+    def warm_up(self):
+        """Build the campaign and load its characters
+
+        Any campaign from a previous warm up is discarded first. The new campaign is put in the CLI helpers'
+        registry, so that commands use it instead of building their own.
+        """
+        self.cool_down()
+
+        fingerprint = self.settings_fingerprint()
+        campaign = Campaign(self.campaign_root, settings=app_settings())
+        campaign.characters.load()
+        campaign.characters.attach_watcher(polling=self.polling)
+
+        helpers.warm_campaigns[self.campaign_root] = campaign
+        self.campaign = campaign
+        self.fingerprint = fingerprint
+
+    def cool_down(self):
+        """Discard the warm campaign, if there is one"""
+        if self.campaign:
+            self.campaign.characters.detach_watcher()
+        helpers.warm_campaigns.pop(self.campaign_root, None)
+        self.campaign = None
+
+    def handle(self, request: dict) -> dict:
+        """Run a single request
+
+        When the request's args are not a command that forwardable() allows, or its cwd cannot be entered,
+        the command is not run and an error response is returned instead.
+
+        The command's stdout is returned in the output key, and its stderr in the errors key.
+
+        Args:
+            request (dict): Request data
+
+        Returns:
+            dict: Response data
+        """
+        if request.get("stop"):
+            self.running = False
+            return {"output": "Server stopped\n", "errors": "", "exit_code": 0}
+
+        args = request.get("args", [])
+        if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args) or not forwardable(args):
+            return {"output": "", "errors": f"The server cannot run this command: {args}\n", "exit_code": 1}
+
+        if self.campaign is None or self.settings_fingerprint() != self.fingerprint:
+            self.warm_up()
+
+        from npc_cli import cli
+
+        old_cwd = os.getcwd()
+        cwd = request.get("cwd", self.campaign_root)
+        try:
+            os.chdir(cwd)
+        except (OSError, TypeError) as err:
+            return {"output": "", "errors": f"Cannot run command in {cwd}: {err}\n", "exit_code": 1}
+        try:
+            result = CliRunner(mix_stderr=False).invoke(cli, args)
+        finally:
+            os.chdir(old_cwd)
+
+        errors = result.stderr
+        if result.exception and not isinstance(result.exception, SystemExit):
+            errors += "".join(traceback.format_exception(result.exception))
+        return {"output": result.stdout, "errors": errors, "exit_code": result.exit_code}
+
+    def serve_forever(self, ready_callback = None):
+        """Listen for requests until a stop request arrives
+
+        The campaign is warmed up before the socket is opened, so the first command is as fast as the rest.
+
+        Args:
+            ready_callback (Callable): Optional function that is called once the socket is accepting requests
+
+        Raises:
+            RuntimeError: Raised when another server is already running for this campaign, or when the socket
+                would be in a shared directory that other users can get into
+        """
+        mode = 0o700 if self.socket_path.parent == runtime_dir() else 0o777
+        self.socket_path.parent.mkdir(mode=mode, parents=True, exist_ok=True)
+        if not private_socket(self.socket_path):
+            raise RuntimeError(f"Refusing to use {self.socket_path.parent}, since other users can access it")
+        if self.socket_path.exists():
+            if server_running(self.socket_path):
+                raise RuntimeError(f"A server is already running at {self.socket_path}")
+            self.socket_path.unlink()
+
+        self.warm_up()
+        self.running = True
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            listener.listen()
+            listener.settimeout(1.0)
+            if ready_callback:
+                ready_callback()
+            try:
+                while self.running:
+                    try:
+                        conn, _ = listener.accept()
+                    except socket.timeout:
+                        continue
+                    with conn:
+                        self.respond(conn)
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+                self.cool_down()
+
+    def respond(self, conn: socket.socket):
+        """Read a request from a connection and send back the response
+
+        Connections that close without sending anything, like the probe from server_running(), are ignored.
+        So are clients that take longer than REQUEST_TIMEOUT seconds to send their request.
+
+        Errors from running the request are sent back as the response, instead of stopping the server.
+
+        Connections from a different user than the one running the server are closed without reading them.
+
+        Args:
+            conn (socket.socket): Connection from a client
+        """
+        uid = peer_uid(conn)
+        if uid is not None and uid != os.getuid():
+            return
+
+        deadline = time.monotonic() + REQUEST_TIMEOUT
+        chunks = []
+        try:
+            while True:
+                conn.settimeout(max(deadline - time.monotonic(), 0.001))
+                chunk = conn.recv(64 * 1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError:
+            return
+        if not chunks:
+            return
+
+        try:
+            request = json.loads(b"".join(chunks))
+        except ValueError:
+            response = {"output": "", "errors": "Malformed request\n", "exit_code": 1}
+        else:
+            try:
+                response = self.handle(request)
+            except Exception:
+                response = {"output": "", "errors": traceback.format_exc(), "exit_code": 1}
+
+        try:
+            conn.settimeout(REQUEST_TIMEOUT)
+            conn.sendall(json.dumps(response).encode("utf-8"))
+        except OSError:
+            pass
+
+def peer_uid(conn: socket.socket) -> int:
+    """Get the ID of the user on the other end of a Unix socket connection
+
+    Args:
+        conn (socket.socket): Connection from a client
+
+    Returns:
+        int: User ID of the client, or None if this system cannot tell
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+def server_running(path: Path) -> bool:
+    """Check whether a server is listening on a socket
+
+    Args:
+        path (Path): Path to the socket
+
+    Returns:
+        bool: True if something accepted a connection on the socket
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(1.0)
+            probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+def stop_server(campaign_root: Path) -> bool:
+    """Ask the server for a campaign to stop
+
+    Args:
+        campaign_root (Path): Root dir of the campaign
+
+    Returns:
+        bool: True if a server was told to stop, False if none was running
+    """
+    try:
+        send_request(socket_path(Path(campaign_root).resolve()), {"stop": True})
+    except (OSError, ValueError):
+        return False
+    return True
@@ -21,6 +21,22 @@ class CharactersTableModel(QAbstractTableModel):
         self.resource_views = [self.view_klass(c) for c in self.collection.all()]
         self.endResetModel()
 
+    def search(self, query: str):
+        """Show only the characters matching a search, best matches first
+
+        A blank query shows every character again.
+
+        Args:
+            query (str): Search terms for CharacterCollection.search()
+        """
+        if not query.strip():
+            self.reload()
+            return
+
+        self.beginResetModel()
+        self.resource_views = [self.view_klass(r.character) for r in self.collection.search(query)]
+        self.endResetModel()
+
     def data(self, index: QModelIndex, role: int = None):
         view = self.resource_views[index.row()]
         tag = self.tag_names[index.column()]
@@ -48,7 +64,7 @@ class CharactersTableModel(QAbstractTableModel):
                 return section
 
     def rowCount(self, index: QModelIndex = QModelIndex()):
-        return self.collection.count
+        return len(self.resource_views)
 
     def columnCount(self, index: QModelIndex = QModelIndex()):
         return len(self._headers)
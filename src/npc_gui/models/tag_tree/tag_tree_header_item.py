@@ -2,7 +2,7 @@ from ..abstract_tree import TreeItem
 from .tag_tree_item import TagTreeItem
 
 from npc.db import DB
-from npc.characters import Tag
+from npc.characters import Character, Tag
 
 class TagTreeHeaderItem(TreeItem):
     def __init__(self, character_id: int, db: DB = None):
@@ -23,9 +23,10 @@ class TagTreeHeaderItem(TreeItem):
             return False
 
         for row in range(count):
-            tag = Tag(name="", character_id = self.character_id)
+            tag = Tag(name="")
             with self.db.session() as session:
-                session.add(tag)
+                character = session.get(Character, self.character_id)
+                character.add_tag(tag)
                 session.commit()
             item = TagTreeItem(tag.id, parent=self, db=self.db)
 
@@ -37,9 +37,10 @@ class TagTreeItem(TreeItem):
             return False
 
         for row in range(count):
-            tag = Tag(parent_tag_id=self.tag_id)
+            tag = Tag(name="")
             with self.db.session() as session:
-                session.add(tag)
+                parent_tag = session.get(Tag, self.tag_id)
+                parent_tag.add_tag(tag)
                 session.commit()
             item = TagTreeItem(tag, parent=self, db=self.db)
 
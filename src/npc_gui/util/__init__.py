@@ -1 +1,2 @@
 from .recent_campaigns import RecentCampaigns
+from .watch_thread import WatchThread
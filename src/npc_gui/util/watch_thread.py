@@ -0,0 +1,40 @@
+from PySide6.QtCore import QThread, Signal
+
+class WatchThread(QThread):
+    """Thread which waits for character file changes away from the UI
+
+    Runs the watcher's changes() method over and over and emits the changed paths. Scanning and waiting
+    happen on this thread, while the slots connected to the changed signal run on the main thread. Those
+    slots should apply the changes, since the database is only used from the main thread.
+
+    Attributes:
+        changed: Signal emitted with the set of changed paths
+    """
+
+    changed = Signal(object)
+
+    def __init__(self, watcher, interval: float = 1.0, parent = None):
+        """Create a new WatchThread
+
+        Args:
+            watcher (InotifyWatcher|PollingWatcher): Watcher to check for changes
+            interval (float): Seconds to wait between checks (default: `1.0`)
+            parent (QObject): Parent object (default: `None`)
+        """
+        super().__init__(parent)
+        self.watcher = watcher
+        self.interval = interval
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            paths = self.watcher.changes(self.interval)
+            if paths and not self.isInterruptionRequested():
+                self.changed.emit(paths)
+
+    def stop(self):
+        """Ask the thread to finish and wait until it has
+
+        The watcher is not closed, so that can be done safely afterwards.
+        """
+        self.requestInterruption()
+        self.wait()
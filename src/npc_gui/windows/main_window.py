@@ -4,21 +4,22 @@ from PySide6.QtWidgets import (
     QLabel, QWidget, QFileDialog, QMessageBox, QPushButton, QSizePolicy,
     QFormLayout, QGroupBox
 )
-from PySide6.QtCore import QSize, Qt, QUrl
+from PySide6.QtCore import QSize, Qt, QUrl, QTimer
 from PySide6.QtGui import QAction, QIcon, QDesktopServices
 
 import click
 
 from ..helpers import fetch_icon, find_settings_file
-from ..widgets import ActionButton, ResourceTable, LoadingBar
+from ..widgets import ActionButton, ResourceTable, LoadingBar, DebounceLineEdit
 from ..widgets.size_policies import *
-from ..util import RecentCampaigns
+from ..util import RecentCampaigns, WatchThread
 from . import (
     NewCampaignDialog, NewCharacterDialog, SettingsOutdatedDialog,
     SettingsMigrationPrompt, PostMigrationDialog, NoCampaignDialog
 )
 import npc
 from npc import campaign
+from npc.campaign.character_watcher import make_watcher
 from npc import __version__ as npc_version
 from npc.settings import app_settings
 from npc.settings.migrations import SettingsMigrator
@@ -34,6 +35,14 @@ class MainWindow(QMainWindow):
         self.campaign_actions: list[QAction] = []
         self.actions: dict[str, QAction] = {}
 
+        self.character_watcher = None
+        self.watch_thread = None
+        self.pending_changes: set[str] = set()
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(1000)
+        self.watch_timer.timeout.connect(self.apply_character_changes)
+
         self.setWindowTitle(self.tr("NPC Campaign Manager"))
         self.setMinimumSize(QSize(700, 600))
 
@@ -286,8 +295,13 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(hello_container)
 
     def exit_app(self, _parent = None):
+        self.stop_watching()
         QApplication.quit()
 
+    def closeEvent(self, event):
+        self.stop_watching()
+        super().closeEvent(event)
+
     def browse_docs(self, _parent):
         QDesktopServices.openUrl(QUrl("https://npc.readthedocs.io/en/stable/"))
 
@@ -369,6 +383,37 @@ class MainWindow(QMainWindow):
         self.init_recent_campaigns()
         self.init_tables()
         self.update_campaign_availability()
+        self.start_watching()
+
+    def start_watching(self):
+        self.stop_watching()
+        self.character_watcher = make_watcher(self.campaign.characters)
+        self.watch_thread = WatchThread(self.character_watcher, parent = self)
+        self.watch_thread.changed.connect(self.queue_character_changes)
+        self.watch_thread.start()
+
+    def stop_watching(self):
+        if self.watch_thread:
+            self.watch_thread.stop()
+            self.watch_thread = None
+        self.watch_timer.stop()
+        self.pending_changes = set()
+        if self.character_watcher:
+            self.character_watcher.close()
+            self.character_watcher = None
+
+    def queue_character_changes(self, changed: set[str]):
+        self.pending_changes.update(changed)
+        self.watch_timer.start()
+
+    def apply_character_changes(self):
+        if not self.pending_changes:
+            return
+
+        summary = self.campaign.characters.apply_changes(self.pending_changes)
+        self.pending_changes = set()
+        if summary:
+            self.search_characters(self.characters_search.text())
 
     def update_campaign_availability(self):
         campaign_available = self.campaign != None
@@ -419,6 +464,13 @@ class MainWindow(QMainWindow):
 
         characters_tab = QWidget()
         characters_layout = QVBoxLayout(characters_tab)
+
+        self.characters_search = DebounceLineEdit()
+        self.characters_search.setPlaceholderText("Search names, descriptions, notes, and tags")
+        self.characters_search.setClearButtonEnabled(True)
+        self.characters_search.debouncedText.connect(self.search_characters)
+        characters_layout.addWidget(self.characters_search)
+
         columns = self.settings.get("gui.columns.characters")
         self.characters_table = ResourceTable(
             self.campaign.characters,
@@ -452,6 +504,10 @@ class MainWindow(QMainWindow):
         self.campaign.characters.refresh()
         self.characters_table.model.reload()
 
+    def search_characters(self, query: str):
+        self.characters_table.model.search(query)
+        self.characters_count_label.setText(f"{self.characters_table.model.rowCount()} characters")
+
     def new_campaign(self, _parent):
         campaign_path = QFileDialog.getExistingDirectory(self, "Choose campaign directory")
         if not campaign_path:
@@ -462,6 +518,7 @@ class MainWindow(QMainWindow):
         picker.open()
 
     def close_campaign(self, _parent = None):
+        self.stop_watching()
         self.campaign = None
         self.update_campaign_availability()
         self.init_hello()
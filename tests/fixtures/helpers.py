@@ -1,4 +1,5 @@
 import os
+import shutil
 import pytest
 from contextlib import contextmanager
 from importlib import resources
@@ -25,6 +26,24 @@ def fixture_file(*fixture_path: list[str]) -> Path:
     base: Path = resources.files("tests.fixtures")
     return base.joinpath("data", *fixture_path)
 
+def fixture_campaign(tmp_path: Path, *fixture_path: list[str]) -> Campaign:
+    """Get a campaign object for a copy of a fixture campaign
+
+    The fixture is copied into tmp_path, without its cache dir, so that anything the test writes to the
+    campaign stays out of the source tree.
+
+    Args:
+        tmp_path (Path): Temporary path for the copy, provided by the tmp_path pytest fixture
+        fixture_path (list[str]): One or more path components naming the fixture campaign
+
+    Returns:
+        Campaign: Campaign class rooted to the copy of the fixture
+    """
+    source = fixture_file(*fixture_path)
+    dest = tmp_path / source.name
+    shutil.copytree(source, dest, ignore=shutil.ignore_patterns("cache"))
+    return Campaign(dest)
+
 @pytest.fixture
 def db() -> DB:
     """Pytest fixture to supply an isolated database object
@@ -135,3 +154,31 @@ class ProgressCounter:
         Pass this as the progress_callback to test that it was called.
         """
         self.count += 1
+
+def query_plan(db: DB, query) -> list[str]:
+    """Get the steps SQLite would take to run a query
+
+    The query is compiled with its parameters inlined and passed to EXPLAIN QUERY PLAN.
+
+    Args:
+        db (DB): Database to plan the query against
+        query (Executable): Query to plan
+
+    Returns:
+        list[str]: Detail strings of each step in the query plan, like "SEARCH tags USING INDEX ..."
+    """
+    compiled = query.compile(db.engine, compile_kwargs={"literal_binds": True})
+    with db.engine.connect() as conn:
+        return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")]
+
+def scans_table(plan: list[str], table: str) -> bool:
+    """Get whether a query plan reads every row of a table without an index
+
+    Args:
+        plan (list[str]): Query plan from query_plan()
+        table (str): Name of the table
+
+    Returns:
+        bool: True if the plan includes a full scan of the table
+    """
+    return any(step == f"SCAN {table}" for step in plan)
@@ -0,0 +1,150 @@
+from tests.fixtures import tmp_campaign, db
+from npc.db import character_repository
+
+from npc.campaign import CharacterCollection
+
+def write_character(path, contents="@type person\n"):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+def stored_locations(db):
+    with db.session() as session:
+        return sorted(c.file_loc for c in session.scalars(character_repository.all()))
+
+def test_loads_new_files(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    collection.apply_changes([str(loc)])
+
+    assert stored_locations(db) == [str(loc)]
+
+def test_replaces_changed_files(tmp_campaign, db):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    write_character(loc, "@type person\n@org Someone\n")
+
+    collection.apply_changes([str(loc)])
+
+    with db.session() as session:
+        character = session.scalars(character_repository.all()).one()
+        assert [t.value for t in character.tags if t.name == "org"] == ["Someone"]
+
+def test_removes_deleted_files(tmp_campaign, db):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc.unlink()
+
+    summary = collection.apply_changes([str(loc)])
+
+    assert stored_locations(db) == []
+    assert summary.removed == [str(loc)]
+
+def test_removes_files_in_deleted_directories(tmp_campaign, db):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    loc = write_character(subdir / "Test Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc.unlink()
+    subdir.rmdir()
+
+    collection.apply_changes([str(subdir)])
+
+    assert stored_locations(db) == []
+
+def test_loads_files_in_new_directories(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    loc = write_character(subdir / "Test Mann.npc")
+
+    collection.apply_changes([str(subdir)])
+
+    assert stored_locations(db) == [str(loc)]
+
+def test_leaves_other_files_alone(tmp_campaign, db):
+    other = write_character(tmp_campaign.characters_dir / "Other Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    with db.session() as session:
+        other_id = session.scalars(character_repository.all()).one().id
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    collection.apply_changes([str(loc)])
+
+    with db.session() as session:
+        assert session.scalar(character_repository.get(other_id)).file_loc == str(other)
+
+def test_skips_ignored_files(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"ignore_subpaths": ["Archive"]}})
+    archive = tmp_campaign.characters_dir / "Archive"
+    archive.mkdir()
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc = write_character(archive / "Test Mann.npc")
+
+    collection.apply_changes([str(loc)])
+
+    assert stored_locations(db) == []
+
+def test_updates_count(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    collection.apply_changes([str(loc)])
+
+    assert collection.count == 1
+
+def test_keeps_id_of_changed_file(tmp_campaign, db):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    with db.session() as session:
+        old_id = session.scalars(character_repository.all()).one().id
+    write_character(loc, "@type person\n@org Someone\n")
+
+    summary = collection.apply_changes([str(loc)])
+
+    with db.session() as session:
+        assert session.scalars(character_repository.all()).one().id == old_id
+    assert summary.removed == []
+    assert collection.count == 1
+
+def test_leaves_files_in_sibling_directories_alone(tmp_campaign, db):
+    gone_dir = tmp_campaign.characters_dir / "Guild"
+    gone_dir.mkdir()
+    gone = write_character(gone_dir / "Test Mann.npc")
+    other_dir = tmp_campaign.characters_dir / "Guild Hall"
+    other_dir.mkdir()
+    other = write_character(other_dir / "Other Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    gone.unlink()
+    gone_dir.rmdir()
+
+    collection.apply_changes([str(gone_dir)])
+
+    assert stored_locations(db) == [str(other)]
+
+def test_treats_like_wildcards_literally(tmp_campaign, db):
+    wild_dir = tmp_campaign.characters_dir / "G_ild%"
+    wild_dir.mkdir()
+    gone = write_character(wild_dir / "Test Mann.npc")
+    other_dir = tmp_campaign.characters_dir / "Guild Hall"
+    other_dir.mkdir()
+    other = write_character(other_dir / "Other Mann.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    gone.unlink()
+    wild_dir.rmdir()
+
+    collection.apply_changes([str(wild_dir)])
+
+    assert stored_locations(db) == [str(other)]
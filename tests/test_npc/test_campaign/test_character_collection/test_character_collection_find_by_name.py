@@ -0,0 +1,59 @@
+from tests.fixtures import tmp_campaign, db
+
+from npc.campaign import CharacterCollection
+
+def write_character(campaign, name: str):
+    loc = campaign.characters_dir / name
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+    return loc
+
+def names(characters) -> list:
+    return [character.realname for character in characters]
+
+def test_finds_seeded_characters(tmp_campaign, db):
+    write_character(tmp_campaign, "Martha Pike - keeper.npc")
+    write_character(tmp_campaign, "Jonas Grimsby - clerk.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    result = collection.find_by_name("marhta")
+
+    assert names(result) == ["Martha Pike"]
+
+def test_forgets_removed_characters(tmp_campaign, db):
+    loc = write_character(tmp_campaign, "Martha Pike - keeper.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    loc.unlink()
+
+    collection.refresh()
+
+    assert collection.find_by_name("martha") == []
+
+def test_follows_updated_names(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    character_id = collection.create(realname="Martha Pike", type_key="person")
+
+    collection.update(character_id, realname="Jonas Grimsby")
+
+    assert collection.find_by_name("martha") == []
+    assert names(collection.find_by_name("grimsby")) == ["Jonas Grimsby"]
+
+def test_blank_fragment_finds_nothing(tmp_campaign, db):
+    write_character(tmp_campaign, "Martha Pike - keeper.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    assert collection.find_by_name(" ") == []
+
+def test_finds_substrings_without_trigrams(tmp_campaign, db, monkeypatch):
+    monkeypatch.setattr("npc.db.database.sqlite_supports", lambda ddl: False)
+    write_character(tmp_campaign, "Martha Pike - keeper.npc")
+    write_character(tmp_campaign, "Jonas Grimsby - clerk.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    result = collection.find_by_name("pike")
+
+    assert names(result) == ["Martha Pike"]
@@ -0,0 +1,37 @@
+from tests.fixtures import tmp_campaign, db
+from npc.db import DB
+
+from npc.campaign import CharacterCollection
+
+def test_index_path_in_cache_dir(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    assert collection.index_path.parent == tmp_campaign.cache_dir
+
+def test_fingerprint_is_stable(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    assert collection.index_fingerprint == collection.index_fingerprint
+
+def test_fingerprint_changes_with_tags(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    old_fingerprint = collection.index_fingerprint
+
+    tmp_campaign.patch_campaign_settings({"tags": {"fancy": {"desc": "A new tag"}}})
+
+    assert collection.index_fingerprint != old_fingerprint
+
+def test_open_index_replaces_singleton(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    index_db = collection.open_index()
+
+    assert DB() is index_db
+    assert collection.db is index_db
+
+def test_open_index_stores_fingerprint(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    index_db = collection.open_index()
+
+    assert index_db.fingerprint == collection.index_fingerprint
@@ -0,0 +1,33 @@
+from tests.fixtures import tmp_campaign
+
+def test_accepts_character_file(tmp_campaign):
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+    loc.touch()
+
+    assert tmp_campaign.characters.is_character_file(str(loc))
+
+def test_rejects_missing_file(tmp_campaign):
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+
+    assert not tmp_campaign.characters.is_character_file(str(loc))
+
+def test_rejects_wrong_suffix(tmp_campaign):
+    loc = tmp_campaign.characters_dir / "Test Mann.png"
+    loc.touch()
+
+    assert not tmp_campaign.characters.is_character_file(str(loc))
+
+def test_rejects_ignored_file(tmp_campaign):
+    tmp_campaign.patch_campaign_settings({"characters": {"ignore_subpaths": ["Archive"]}})
+    archive = tmp_campaign.characters_dir / "Archive" / "Old"
+    archive.mkdir(parents=True)
+    loc = archive / "Test Mann.npc"
+    loc.touch()
+
+    assert not tmp_campaign.characters.is_character_file(str(loc))
+
+def test_rejects_file_outside_root(tmp_campaign):
+    loc = tmp_campaign.root / "Test Mann.npc"
+    loc.touch()
+
+    assert not tmp_campaign.characters.is_character_file(str(loc))
@@ -0,0 +1,45 @@
+from tests.fixtures import tmp_campaign, db, ProgressCounter
+from npc.db import DB, character_repository
+
+from npc.campaign import CharacterCollection
+
+def write_character(tmp_campaign):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+    return loc
+
+def test_seeds_memory_db_by_default(tmp_campaign, db):
+    write_character(tmp_campaign)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.load()
+
+    assert collection.db is db
+    with db.session() as session:
+        result = session.execute(character_repository.all()).all()
+        assert len(result) == 1
+
+def test_uses_persistent_index_when_enabled(tmp_campaign, db):
+    write_character(tmp_campaign)
+    tmp_campaign.patch_campaign_settings({"characters": {"persistent_index": True}})
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.load()
+
+    assert collection.db.db_path == collection.index_path
+    with collection.db.session() as session:
+        result = session.execute(character_repository.all()).all()
+        assert len(result) == 1
+
+def test_warm_load_skips_unchanged_files(tmp_campaign, db):
+    write_character(tmp_campaign)
+    tmp_campaign.patch_campaign_settings({"characters": {"persistent_index": True}})
+    CharacterCollection(tmp_campaign, db=db).load()
+    collection = CharacterCollection(tmp_campaign, db=db)
+    counter = ProgressCounter()
+
+    collection.load(progress_callback=counter.progress)
+
+    assert counter.count == 0
+    assert collection.count == 1
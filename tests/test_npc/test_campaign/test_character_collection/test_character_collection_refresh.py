@@ -1,5 +1,8 @@
+import os
+from sqlalchemy import select
+
 from tests.fixtures import tmp_campaign, db, ProgressCounter
-from npc.characters import CharacterReader
+from npc.characters import CharacterReader, RawTag, Tag
 from npc.db import character_repository
 
 from npc.campaign import CharacterCollection
@@ -79,3 +82,86 @@ def test_updates_progress(tmp_campaign, db):
     collection.refresh(progress_callback = counter.progress)
 
     assert counter.count == 1
+
+def test_deletes_tags_of_record_without_file(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.create(realname="Fido", type_key="person", tags=[RawTag("org", "Dogs")])
+
+    collection.refresh()
+
+    with db.session() as session:
+        result = session.scalars(select(Tag)).all()
+        assert len(result) == 0
+
+def test_keeps_id_of_updated_file(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person\n@org Foo")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    with db.session() as session:
+        old_id = session.execute(character_repository.all()).scalar().id
+    collection.update(old_id, file_mtime = loc.stat().st_mtime - 10)
+    with loc.open('a', newline="\n") as file:
+        file.write("\n@org Bar")
+
+    collection.refresh()
+
+    with db.session() as session:
+        result = session.execute(character_repository.all()).scalar()
+        assert result.id == old_id
+        assert [tag.value for tag in result.tags] == ["Foo", "Bar"]
+    assert collection.count == 1
+
+def test_deletes_subtags_of_record_without_file(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.create(realname="Fido", type_key="person", tags=[RawTag("org", "Dogs"), RawTag("role", "Good Boy")])
+
+    collection.refresh()
+
+    with db.session() as session:
+        result = session.scalars(select(Tag)).all()
+        assert len(result) == 0
+
+def test_keeps_tags_of_records_with_files(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person\n@org Foo\n@role Bar")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.create(realname="Fido", type_key="person", tags=[RawTag("org", "Dogs"), RawTag("role", "Good Boy")])
+
+    collection.refresh()
+
+    with db.session() as session:
+        result = session.scalars(select(Tag.value).order_by(Tag.id)).all()
+        assert result == ["Foo", "Bar"]
+
+def test_reloads_file_with_older_mtime(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    loc.write_text("@type person\n@location Here\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    stat = loc.stat()
+    loc.write_text("@type person\n@location Elsewhere\n")
+    os.utime(loc, (stat.st_atime, stat.st_mtime - 100))
+
+    collection.refresh()
+
+    with db.session() as session:
+        tag = session.scalars(select(Tag).where(Tag.name == "location")).one()
+        assert tag.value == "Elsewhere"
+
+def test_reloads_file_with_new_size(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    loc.write_text("@type person\n@location Here\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    stat = loc.stat()
+    loc.write_text("@type person\n@location Over There\n")
+    os.utime(loc, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    collection.refresh()
+
+    with db.session() as session:
+        tag = session.scalars(select(Tag).where(Tag.name == "location")).one()
+        assert tag.value == "Over There"
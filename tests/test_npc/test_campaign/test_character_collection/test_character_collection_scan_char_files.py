@@ -0,0 +1,123 @@
+import os
+from tests.fixtures import tmp_campaign, db
+
+from npc.campaign import CharacterCollection
+
+def write_file(loc):
+    loc.parent.mkdir(parents=True, exist_ok=True)
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+
+def test_yields_dir_entries(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    write_file(loc)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = list(collection.scan_character_files())
+
+    assert [entry.path for entry in result] == [str(loc)]
+
+def test_entries_have_stat_results(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    write_file(loc)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = list(collection.scan_character_files())
+
+    assert result[0].stat().st_mtime == loc.stat().st_mtime
+
+def test_includes_deep_subdirs(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "a" / "b" / "c" / "Test Mann - tester.npc"
+    write_file(loc)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = [entry.path for entry in collection.scan_character_files()]
+
+    assert str(loc) in result
+
+def test_skips_nested_ignored_dirs(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({
+        "characters": {
+            "ignore_subpaths": ["a/noplz"]
+        }
+    })
+    loc = tmp_campaign.characters_dir / "a" / "noplz" / "deeper" / "Test Mann - tester.npc"
+    write_file(loc)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = [entry.path for entry in collection.scan_character_files()]
+
+    assert str(loc) not in result
+
+def test_does_not_descend_into_ignored_dirs(tmp_campaign, db, monkeypatch):
+    tmp_campaign.patch_campaign_settings({
+        "characters": {
+            "ignore_subpaths": ["noplz"]
+        }
+    })
+    write_file(tmp_campaign.characters_dir / "noplz" / "Test Mann - tester.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    scanned = []
+    real_scandir = os.scandir
+    def spy_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", spy_scandir)
+
+    list(collection.scan_character_files())
+
+    assert str(tmp_campaign.characters_dir / "noplz") not in scanned
+
+def test_skips_directories_with_allowed_suffix(tmp_campaign, db):
+    (tmp_campaign.characters_dir / "weird.npc").mkdir()
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = list(collection.scan_character_files())
+
+    assert result == []
+
+def test_handles_missing_root(tmp_campaign, db):
+    tmp_campaign.characters_dir.rmdir()
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = list(collection.scan_character_files())
+
+    assert result == []
+
+def test_survives_symlink_loops(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "sub" / "Test Mann - tester.npc"
+    write_file(loc)
+    (tmp_campaign.characters_dir / "sub" / "loop").symlink_to("..", target_is_directory=True)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = [entry.path for entry in collection.scan_character_files()]
+
+    assert result == [str(loc)]
+
+def test_does_not_follow_symlinked_dirs(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "real" / "Test Mann - tester.npc"
+    write_file(loc)
+    (tmp_campaign.characters_dir / "alias").symlink_to("real", target_is_directory=True)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    result = [entry.path for entry in collection.scan_character_files()]
+
+    assert result == [str(loc)]
+
+def test_skips_unreadable_dirs(tmp_campaign, db, monkeypatch):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    write_file(loc)
+    write_file(tmp_campaign.characters_dir / "locked" / "Other Mann - tester.npc")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    real_scandir = os.scandir
+    def locked_scandir(path):
+        if path == str(tmp_campaign.characters_dir / "locked"):
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", locked_scandir)
+
+    result = [entry.path for entry in collection.scan_character_files()]
+
+    assert result == [str(loc)]
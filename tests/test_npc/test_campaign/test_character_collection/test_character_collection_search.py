@@ -0,0 +1,172 @@
+import os
+import pytest
+from tests.fixtures import tmp_campaign, db
+
+from npc.campaign import CharacterCollection
+from npc.characters import Character
+from npc.db import search_index
+
+def write_character(campaign, name: str, contents: str):
+    loc = campaign.characters_dir / name
+    with loc.open('w', newline="\n") as file:
+        file.write(contents)
+    return loc
+
+def names(results) -> list:
+    return [result.character.realname for result in results]
+
+def test_finds_seeded_characters(tmp_campaign, db):
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    write_character(tmp_campaign, "Other Mann.npc", "@type person\n\nSells fish")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    results = collection.search("lighthouse")
+
+    assert names(results) == ["Test Mann"]
+
+def test_finds_deferred_bodies(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"defer_bodies": True, "search_index": True}})
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n--Notes--\nKeeps the old lighthouse lit\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    results = collection.search("lighthouse")
+
+    assert names(results) == ["Test Mann"]
+
+def test_seed_skips_reading_deferred_bodies(tmp_campaign, db, monkeypatch):
+    tmp_campaign.patch_campaign_settings({"characters": {"defer_bodies": True, "search_index": True}})
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n--Notes--\nKeeps the old lighthouse lit\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    loads = []
+    load_body = Character.load_body
+    def record_load(self):
+        loads.append(self.realname)
+        return load_body(self)
+    monkeypatch.setattr(Character, "load_body", record_load)
+
+    collection.seed()
+
+    assert loads == []
+
+def test_fills_deferred_bodies_once(tmp_campaign, db, monkeypatch):
+    tmp_campaign.patch_campaign_settings({"characters": {"defer_bodies": True, "search_index": True}})
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n--Notes--\nKeeps the old lighthouse lit\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loads = []
+    load_body = Character.load_body
+    def record_load(self):
+        loads.append(self.realname)
+        return load_body(self)
+    monkeypatch.setattr(Character, "load_body", record_load)
+
+    collection.search("lighthouse")
+    collection.search("lighthouse")
+
+    assert loads == ["Test Mann"]
+
+def test_refresh_updates_changed_files(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"search_index": True}})
+    loc = write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nMends nets")
+    stat = loc.stat()
+    os.utime(loc, (stat.st_atime, stat.st_mtime + 10))
+
+    collection.refresh()
+
+    assert collection.search("lighthouse") == []
+    assert names(collection.search("nets")) == ["Test Mann"]
+
+def test_refresh_removes_missing_files(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"search_index": True}})
+    loc = write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    loc.unlink()
+
+    collection.refresh()
+
+    assert collection.search("lighthouse") == []
+
+def test_apply_changes_updates_index(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"search_index": True}})
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc = write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+
+    collection.apply_changes([str(loc)])
+
+    assert names(collection.search("lighthouse")) == ["Test Mann"]
+
+def test_rebuilds_index_when_not_maintained(tmp_campaign, db):
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    results = collection.search("lighthouse")
+
+    assert names(results) == ["Test Mann"]
+
+def test_blank_query_finds_nothing(tmp_campaign, db):
+    write_character(tmp_campaign, "Test Mann.npc", "@type person")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+
+    assert collection.search("  ") == []
+
+def test_builds_index_once(tmp_campaign, db, monkeypatch):
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    rebuilds = []
+    rebuild = search_index.rebuild
+    def record_rebuild(session):
+        rebuilds.append(session)
+        rebuild(session)
+    monkeypatch.setattr(search_index, "rebuild", record_rebuild)
+
+    collection.search("lighthouse")
+    collection.search("light*")
+
+    assert len(rebuilds) == 1
+
+def test_built_index_follows_refresh(tmp_campaign, db, monkeypatch):
+    loc = write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+    collection.search("lighthouse")
+    monkeypatch.setattr(search_index, "rebuild", lambda session: pytest.fail("should not rebuild"))
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nMends nets")
+    stat = loc.stat()
+    os.utime(loc, (stat.st_atime, stat.st_mtime + 10))
+
+    collection.refresh()
+
+    assert collection.search("lighthouse") == []
+    assert names(collection.search("nets")) == ["Test Mann"]
+
+def test_built_index_follows_apply_changes(tmp_campaign, db, monkeypatch):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    collection.search("lighthouse")
+    monkeypatch.setattr(search_index, "rebuild", lambda session: pytest.fail("should not rebuild"))
+    loc = write_character(tmp_campaign, "Test Mann.npc", "@type person\n\nKeeps the old lighthouse lit")
+
+    collection.apply_changes([str(loc)])
+
+    assert names(collection.search("lighthouse")) == ["Test Mann"]
+
+def test_scans_records_without_fts5(tmp_campaign, db, monkeypatch):
+    monkeypatch.setattr("npc.db.database.sqlite_supports", lambda ddl: False)
+    tmp_campaign.patch_campaign_settings({"characters": {"search_index": True}})
+    write_character(tmp_campaign, "Test Mann.npc", "@type person\n@location Misty Bay\n--Notes--\nKeeps the old lighthouse lit\n")
+    write_character(tmp_campaign, "Other Mann.npc", "@type person\n--Notes--\nSells fish\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.refresh()
+
+    assert names(collection.search("lighthouse")) == ["Test Mann"]
+    assert names(collection.search("misty mann")) == ["Test Mann"]
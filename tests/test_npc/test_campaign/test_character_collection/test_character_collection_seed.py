@@ -1,7 +1,10 @@
 from tests.fixtures import tmp_campaign, db, ProgressCounter
-from npc.db import character_repository
+from sqlalchemy import text
+from npc.db import DB, character_repository
+from npc.characters import Character, ParseCache
 
 from npc.campaign import CharacterCollection
+from npc.campaign.character_ingest import parse_character_files
 
 def test_creates_character_records(tmp_campaign, db):
     loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
@@ -38,3 +41,135 @@ def test_updates_progress(tmp_campaign, db):
     collection.seed(progress_callback = counter.progress)
 
     assert counter.count == 1
+
+def test_parallel_load_matches_serial(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"parse_cache": False}})
+    for index in range(6):
+        loc = tmp_campaign.characters_dir / f"Test Mann {index} - tester.npc"
+        with loc.open('w', newline="\n") as file:
+            file.write(f"@type person\n@org Org {index}\n@role Role {index}\n@role Other {index}\n@location Here")
+
+    def snapshot(workers):
+        target_db = DB(clearSingleton=True)
+        CharacterCollection(tmp_campaign, db=target_db).seed(workers=workers)
+        with target_db.session() as session:
+            return [
+                (c.file_loc, [(t.name, t.value, [(s.name, s.value) for s in t.subtags]) for t in c.tags])
+                for c in session.scalars(character_repository.all().order_by(Character.id))
+            ]
+
+    serial = snapshot(1)
+    parallel = snapshot(2)
+
+    assert parallel == serial
+
+def test_passes_zero_workers(tmp_campaign, db, monkeypatch):
+    tmp_campaign.patch_campaign_settings({"characters": {"ingest_workers": 3}})
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    seen = []
+    def fake_parse(paths, workers, **kwargs):
+        seen.append(workers)
+        return parse_character_files(paths, 1, **kwargs)
+    monkeypatch.setattr("npc.campaign.character_collection.parse_character_files", fake_parse)
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.seed(workers=0)
+
+    assert seen == [0]
+
+def test_parallel_updates_progress(tmp_campaign, db):
+    for index in range(3):
+        loc = tmp_campaign.characters_dir / f"Test Mann {index} - tester.npc"
+        with loc.open('w', newline="\n") as file:
+            file.write("@type person")
+    collection = CharacterCollection(tmp_campaign, db=db)
+    counter = ProgressCounter()
+
+    collection.seed(progress_callback = counter.progress, workers=2)
+
+    assert counter.count == 3
+
+def test_cached_load_matches_fresh_load(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"parse_cache": True}})
+    for index in range(3):
+        loc = tmp_campaign.characters_dir / f"Test Mann {index} - tester.npc"
+        with loc.open('w', newline="\n") as file:
+            file.write(f"@type person\n@org Org {index}\n@role Role {index}\n\n  --Notes--  \nHi {index}\n")
+
+    def snapshot():
+        target_db = DB(clearSingleton=True)
+        CharacterCollection(tmp_campaign, db=target_db).seed()
+        with target_db.session() as session:
+            return [
+                (c.file_loc, c.realname, c.mnemonic, c.file_body, [(t.name, t.value) for t in c.tags])
+                for c in session.scalars(character_repository.all().order_by(Character.id))
+            ]
+
+    fresh = snapshot()
+    cached = snapshot()
+
+    assert cached == fresh
+
+def test_skips_parsing_cached_files(tmp_campaign, db, monkeypatch):
+    tmp_campaign.patch_campaign_settings({"characters": {"parse_cache": True}})
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+    CharacterCollection(tmp_campaign, db=db).seed()
+    parsed = []
+    monkeypatch.setattr(
+        "npc.campaign.character_ingest.read_character_file",
+        lambda path, body=True: parsed.append(path))
+    collection = CharacterCollection(tmp_campaign, db=DB(clearSingleton=True))
+
+    collection.seed()
+
+    assert parsed == []
+    assert collection.count == 1
+
+def test_skips_cache_by_default(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.seed()
+
+    assert not (tmp_campaign.cache_dir / ParseCache.FILENAME).exists()
+
+def test_ignores_cache_when_turned_off(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"parse_cache": False}})
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.seed()
+
+    assert not (tmp_campaign.cache_dir / ParseCache.FILENAME).exists()
+
+def test_deferred_bodies_are_not_stored(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"defer_bodies": True}})
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person\n--Notes--\nhi\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.seed()
+
+    with db.session() as session:
+        stored = session.execute(text("SELECT file_body, body_offset FROM characters")).one()
+    assert stored == (None, 13)
+
+def test_deferred_bodies_load_on_access(tmp_campaign, db):
+    tmp_campaign.patch_campaign_settings({"characters": {"defer_bodies": True}})
+    loc = tmp_campaign.characters_dir / "Test Mann - tester.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person\n--Notes--\nhi\n")
+    collection = CharacterCollection(tmp_campaign, db=db)
+
+    collection.seed()
+
+    with db.session() as session:
+        character = session.scalars(character_repository.all()).one()
+        assert character.file_body == "--Notes--hi\n"
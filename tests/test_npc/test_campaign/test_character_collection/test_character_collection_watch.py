@@ -0,0 +1,41 @@
+import pytest
+from threading import Event, Timer
+
+from tests.fixtures import tmp_campaign, db
+from npc.db import character_repository
+
+from npc.campaign import CharacterCollection
+
+def write_character(path, contents="@type person\n"):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_applies_changes(tmp_campaign, db, polling):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    collection.seed()
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+    stop = Event()
+    summaries = []
+    def callback(summary):
+        summaries.append(summary)
+        stop.set()
+    writer = Timer(0.1, write_character, [loc])
+    timeout = Timer(5, stop.set)
+    writer.start()
+    timeout.start()
+
+    collection.watch(callback, stop=stop, debounce=0.05, interval=0.05, polling=polling)
+    timeout.cancel()
+
+    assert summaries[0].loaded == [loc]
+    with db.session() as session:
+        assert session.scalars(character_repository.all()).one().file_loc == str(loc)
+
+def test_returns_when_stopped(tmp_campaign, db):
+    collection = CharacterCollection(tmp_campaign, db=db)
+    stop = Event()
+    stop.set()
+
+    collection.watch(stop=stop, polling=True)
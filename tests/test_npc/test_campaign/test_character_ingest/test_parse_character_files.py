@@ -0,0 +1,33 @@
+from tests.fixtures import tmp_campaign
+
+from npc.campaign.character_ingest import parse_character_files
+
+def make_files(tmp_campaign, count: int) -> list:
+    paths = []
+    for index in range(count):
+        loc = tmp_campaign.characters_dir / f"Test Mann {index} - tester.npc"
+        with loc.open('w', newline="\n") as file:
+            file.write(f"@type person\n@org Org {index}\n@role Role {index}\n--Notes--\nNumber {index}")
+        paths.append(loc)
+    return paths
+
+def test_parses_serially(tmp_campaign):
+    paths = make_files(tmp_campaign, 3)
+
+    results = list(parse_character_files(paths, 1))
+
+    assert [r.path for r in results] == paths
+    assert results[1].realname == "Test Mann 1"
+
+def test_parallel_matches_serial(tmp_campaign):
+    paths = make_files(tmp_campaign, 12)
+
+    serial = list(parse_character_files(paths, 1))
+    parallel = list(parse_character_files(paths, 3))
+
+    assert parallel == serial
+
+def test_handles_no_paths(tmp_campaign):
+    results = list(parse_character_files([], 4))
+
+    assert results == []
@@ -0,0 +1,12 @@
+import os
+
+from npc.campaign.character_ingest import resolve_workers
+
+def test_zero_uses_cpu_count():
+    assert resolve_workers(0) == (os.cpu_count() or 1)
+
+def test_keeps_positive_number():
+    assert resolve_workers(3) == 3
+
+def test_never_below_one():
+    assert resolve_workers(-2) == 1
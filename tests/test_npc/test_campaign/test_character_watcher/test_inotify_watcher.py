@@ -0,0 +1,122 @@
+import os
+import pytest
+
+from tests.fixtures import tmp_campaign
+
+from npc.campaign import character_watcher
+from npc.campaign.character_watcher import InotifyWatcher, inotify_available
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+def write_character(path, contents="@type person\n"):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+class RefusingLibc():
+    """Stand-in for libc whose inotify_add_watch fails for one directory"""
+
+    def __init__(self, libc, refused: str):
+        self.libc = libc
+        self.refused = refused
+
+    def __getattr__(self, name):
+        return getattr(self.libc, name)
+
+    def inotify_add_watch(self, fd, path, mask):
+        if os.fsdecode(path) == self.refused:
+            return -1
+        return self.libc.inotify_add_watch(fd, path, mask)
+
+def refuse_watch(monkeypatch, path):
+    libc = character_watcher.load_libc()
+    monkeypatch.setattr(character_watcher, "load_libc", lambda: RefusingLibc(libc, str(path)))
+
+def test_reports_nothing_without_changes(tmp_campaign):
+    watcher = InotifyWatcher(tmp_campaign.characters)
+
+    assert watcher.changes(0) == set()
+    watcher.close()
+
+def test_reports_created_files(tmp_campaign):
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    assert str(loc) in watcher.changes(1)
+    watcher.close()
+
+def test_reports_deleted_files(tmp_campaign):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    loc.unlink()
+
+    assert str(loc) in watcher.changes(1)
+    watcher.close()
+
+def test_reports_both_sides_of_a_move(tmp_campaign):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    moved = loc.rename(tmp_campaign.characters_dir / "Other Mann.npc")
+
+    assert watcher.changes(1) >= {str(loc), str(moved)}
+    watcher.close()
+
+def test_watches_new_directories(tmp_campaign):
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    watcher.changes(1)
+    loc = write_character(subdir / "Test Mann.npc")
+
+    assert str(loc) in watcher.changes(1)
+    watcher.close()
+
+def test_skips_ignored_directories(tmp_campaign):
+    tmp_campaign.patch_campaign_settings({"characters": {"ignore_subpaths": ["Archive"]}})
+    archive = tmp_campaign.characters_dir / "Archive"
+    archive.mkdir()
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    write_character(archive / "Test Mann.npc")
+
+    assert watcher.changes(0.2) == set()
+    watcher.close()
+
+def test_polls_directories_it_cannot_watch(tmp_campaign, monkeypatch):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    refuse_watch(monkeypatch, subdir)
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    loc = write_character(subdir / "Test Mann.npc")
+
+    assert str(loc) in watcher.changes(0)
+    watcher.close()
+
+def test_logs_directories_it_cannot_watch(tmp_campaign, monkeypatch, caplog):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    refuse_watch(monkeypatch, subdir)
+
+    watcher = InotifyWatcher(tmp_campaign.characters)
+
+    assert str(subdir) in caplog.text
+    watcher.close()
+
+def test_checks_pollers_while_waiting(tmp_campaign, monkeypatch):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    refuse_watch(monkeypatch, subdir)
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    loc = write_character(subdir / "Test Mann.npc")
+
+    assert str(loc) in watcher.changes(None)
+    watcher.close()
+
+def test_still_watches_other_directories(tmp_campaign, monkeypatch):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    refuse_watch(monkeypatch, subdir)
+    watcher = InotifyWatcher(tmp_campaign.characters)
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    assert str(loc) in watcher.changes(1)
+    watcher.close()
@@ -0,0 +1,59 @@
+import os
+
+from tests.fixtures import tmp_campaign
+
+from npc.campaign.character_watcher import PollingWatcher
+
+def write_character(path, contents="@type person\n"):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+def test_reports_nothing_without_changes(tmp_campaign):
+    write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = PollingWatcher(tmp_campaign.characters)
+
+    assert watcher.changes(0) == set()
+
+def test_reports_created_files(tmp_campaign):
+    watcher = PollingWatcher(tmp_campaign.characters)
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+
+    assert watcher.changes(0) == {str(loc)}
+
+def test_reports_modified_files(tmp_campaign):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = PollingWatcher(tmp_campaign.characters)
+    write_character(loc, "@type person\n@org Someone\n")
+
+    assert watcher.changes(0) == {str(loc)}
+
+def test_reports_deleted_files(tmp_campaign):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = PollingWatcher(tmp_campaign.characters)
+    loc.unlink()
+
+    assert watcher.changes(0) == {str(loc)}
+
+def test_reports_both_sides_of_a_move(tmp_campaign):
+    loc = write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher = PollingWatcher(tmp_campaign.characters)
+    moved = loc.rename(tmp_campaign.characters_dir / "Other Mann.npc")
+
+    assert watcher.changes(0) == {str(loc), str(moved)}
+
+def test_only_reports_changes_once(tmp_campaign):
+    watcher = PollingWatcher(tmp_campaign.characters)
+    write_character(tmp_campaign.characters_dir / "Test Mann.npc")
+    watcher.changes(0)
+
+    assert watcher.changes(0) == set()
+
+def test_only_scans_start_dir(tmp_campaign):
+    subdir = tmp_campaign.characters_dir / "Group"
+    subdir.mkdir()
+    watcher = PollingWatcher(tmp_campaign.characters, str(subdir))
+    loc = write_character(subdir / "Test Mann.npc")
+    write_character(tmp_campaign.characters_dir / "Other Mann.npc")
+
+    assert watcher.changes(0) == {str(loc)}
@@ -1,10 +1,9 @@
-from tests.fixtures import fixture_file, db
-from npc.campaign import Campaign
+from tests.fixtures import fixture_campaign, db
 
 from npc.campaign.reorganizers import CharacterReorganizer
 
-def test_updates_db(db):
-    campaign = Campaign(fixture_file("reorg", "allow_new"))
+def test_updates_db(db, tmp_path):
+    campaign = fixture_campaign(tmp_path, "reorg", "allow_new")
     campaign.characters.refresh()
     reorganizer = CharacterReorganizer(campaign, db, exists=False)
     reorganizer.gather_paths()
@@ -1,10 +1,9 @@
-from tests.fixtures import fixture_file, db
-from npc.campaign import Campaign
+from tests.fixtures import fixture_campaign, db
 
 from npc.campaign.reorganizers import CharacterReorganizer
 
-def test_gathers_all_characters(db):
-    campaign = Campaign(fixture_file("reorg", "only_existing"))
+def test_gathers_all_characters(db, tmp_path):
+    campaign = fixture_campaign(tmp_path, "reorg", "only_existing")
     campaign.characters.refresh()
     reorganizer = CharacterReorganizer(campaign, db)
 
@@ -12,8 +11,8 @@ def test_gathers_all_characters(db):
 
     assert len(reorganizer.relocations) == 2
 
-def test_gets_ideal_paths_that_exist(db):
-    campaign = Campaign(fixture_file("reorg", "only_existing"))
+def test_gets_ideal_paths_that_exist(db, tmp_path):
+    campaign = fixture_campaign(tmp_path, "reorg", "only_existing")
     campaign.characters.refresh()
     reorganizer = CharacterReorganizer(campaign, db, exists=True)
 
@@ -22,8 +21,8 @@ def test_gets_ideal_paths_that_exist(db):
     for reloc in reorganizer.relocations:
         assert reloc.satisfied
 
-def test_gets_ideal_paths_that_dont_exist(db):
-    campaign = Campaign(fixture_file("reorg", "allow_new"))
+def test_gets_ideal_paths_that_dont_exist(db, tmp_path):
+    campaign = fixture_campaign(tmp_path, "reorg", "allow_new")
     campaign.characters.refresh()
     reorganizer = CharacterReorganizer(campaign, db, exists=False)
 
@@ -0,0 +1,31 @@
+from npc.characters import Character, Tag
+
+def test_places_tag_after_existing_tags():
+    character = Character(realname="Test Mann")
+    character.add_tag(Tag(name="org", value="Foo"))
+    tag = Tag(name="location", value="Here")
+
+    character.add_tag(tag)
+
+    assert tag.path == "00001"
+    assert tag.owner is character
+
+def test_places_assigned_tags():
+    character = Character(realname="Test Mann")
+    tags = [Tag(name="org", value="Foo"), Tag(name="location", value="Here")]
+
+    character.tags = tags
+
+    assert [tag.path for tag in tags] == ["00000", "00001"]
+
+def test_skips_position_of_removed_tag():
+    character = Character(realname="Test Mann")
+    first = Tag(name="org", value="Foo")
+    character.add_tag(first)
+    character.add_tag(Tag(name="org", value="Bar"))
+    character.tags.remove(first)
+    tag = Tag(name="location", value="Here")
+
+    character.add_tag(tag)
+
+    assert tag.path == "00002"
@@ -0,0 +1,35 @@
+from sqlalchemy import event
+from tests.fixtures import tmp_campaign, db, create_character
+from npc.characters import Character
+
+def test_fills_tags_and_subtags(tmp_campaign, db):
+    tags = [("org", "Foo"), ("role", "Bar"), ("location", "Here"), ("region", "There"), ("locale", "Everywhere")]
+    character = create_character(tags, tmp_campaign, db)
+
+    with db.session() as session:
+        record = session.get(Character, character.id)
+        record.build_tag_tree()
+
+        assert [tag.name for tag in record.tags] == ["org", "location"]
+        assert [tag.name for tag in record.tags[1].subtags] == ["region"]
+        assert [tag.name for tag in record.tags[1].subtags[0].subtags] == ["locale"]
+
+def test_loads_tree_with_one_query(tmp_campaign, db):
+    tags = [("org", "Foo"), ("role", "Bar"), ("location", "Here"), ("region", "There"), ("locale", "Everywhere")]
+    character = create_character(tags, tmp_campaign, db)
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with db.session() as session:
+        record = session.get(Character, character.id)
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            record.build_tag_tree()
+            names = [subtag.name for tag in record.tags for subtag in tag.subtags]
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+
+    assert names == ["role", "region"]
+    assert len(statements) == 1
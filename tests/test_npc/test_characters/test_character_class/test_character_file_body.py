@@ -0,0 +1,58 @@
+import os
+
+from npc.characters import Character, CharacterReader
+
+def write_character(path, contents):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+def deferred_character(path):
+    reader = CharacterReader(path)
+    char = Character(id=5, realname="Test Mann", type_key="generic", body_offset=reader.body_offset())
+    char.file_path = path
+    return char
+
+def test_returns_stored_body(tmp_path):
+    char = Character(id=5, realname="Test Mann", type_key="generic", file_body="--Notes--hi")
+
+    assert char.file_body == "--Notes--hi"
+
+def test_stored_body_wins_over_offset(tmp_path):
+    loc = write_character(tmp_path / "Test Mann.npc", "@type person\n--Notes--\nfrom file\n")
+    char = deferred_character(loc)
+    char.file_body = "from db"
+
+    assert char.file_body == "from db"
+
+def test_reads_deferred_body(tmp_path):
+    loc = write_character(tmp_path / "Test Mann.npc", "@type person\n--Notes--\nfrom file\n")
+    char = deferred_character(loc)
+
+    assert char.file_body == CharacterReader(loc).body()
+
+def test_keeps_deferred_body(tmp_path):
+    loc = write_character(tmp_path / "Test Mann.npc", "@type person\n--Notes--\nfrom file\n")
+    char = deferred_character(loc)
+    char.file_body
+
+    loc.unlink()
+
+    assert char.file_body == "--Notes--from file\n"
+
+def test_reparses_modified_file(tmp_path):
+    loc = write_character(tmp_path / "Test Mann.npc", "@type person\n--Notes--\nfrom file\n")
+    char = deferred_character(loc)
+    write_character(loc, "@type person\n@org Longer Now\n--Notes--\nchanged\n")
+    stat = loc.stat()
+    os.utime(loc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    assert char.file_body == "--Notes--changed\n"
+
+def test_empty_for_missing_file(tmp_path):
+    loc = write_character(tmp_path / "Test Mann.npc", "@type person\n--Notes--\nfrom file\n")
+    char = deferred_character(loc)
+
+    loc.unlink()
+
+    assert char.file_body == ""
@@ -0,0 +1,33 @@
+from npc.characters import Character
+
+def test_sets_first_and_last_names():
+    char = Character(realname="Test Q. Mann")
+
+    assert char.first_name == "Test"
+    assert char.last_name == "Mann"
+
+def test_sets_initials():
+    char = Character(realname="Test Q. Mann")
+
+    assert char.first_initial == "T"
+    assert char.last_initial == "M"
+
+def test_single_word_is_both_names():
+    char = Character(realname="Mann")
+
+    assert char.first_name == "Mann"
+    assert char.last_name == "Mann"
+
+def test_updates_when_realname_changes():
+    char = Character(realname="Test Mann")
+
+    char.realname = "Other Person"
+
+    assert char.last_name == "Person"
+    assert char.first_initial == "O"
+
+def test_empty_name_has_empty_parts():
+    char = Character(realname="")
+
+    assert char.first_name == ""
+    assert char.last_initial == ""
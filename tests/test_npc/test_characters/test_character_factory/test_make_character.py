@@ -480,3 +480,22 @@ class TestMetadataSeparator():
         character = factory.make("Test Mann", tags=tags)
 
         assert character.tags[0].subtags[0].name == "job"
+
+def test_uses_given_mtime(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+    loc.touch()
+
+    character = factory.make("Test Mann", path = loc, mtime = 12.5)
+
+    assert character.file_loc == str(loc)
+    assert character.file_mtime == 12.5
+
+def test_reads_mtime_without_given_mtime(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+    loc.touch()
+
+    character = factory.make("Test Mann", path = loc)
+
+    assert character.file_mtime == loc.stat().st_mtime
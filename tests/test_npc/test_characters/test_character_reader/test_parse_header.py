@@ -0,0 +1,64 @@
+import pytest
+
+from tests.fixtures import fixture_file
+
+from npc.characters import CharacterReader
+
+SAMPLES = [
+    "@type person\n@title The Testiest\n\n@sticky\n--Notes--\nhi\n",
+    "Some description\n  @type person  \n\n   --Notes--   \nhi\n",
+    "@title Überprüfer\r\n@type person\r\n--Notes--\r\nhi\r\n",
+    "@type person\n@org Nobody",
+    "",
+]
+
+@pytest.mark.parametrize("contents", SAMPLES)
+def test_matches_full_parse(tmp_path, contents):
+    file = tmp_path / "Test Mann.npc"
+    file.write_bytes(contents.encode("utf-8"))
+    full = CharacterReader(file)
+    header = CharacterReader(file, header_only=True)
+
+    header.parse_header()
+
+    assert header._tags == full.tags()
+    assert header._body_offset == full.body_offset()
+
+@pytest.mark.parametrize("contents", SAMPLES)
+def test_matches_full_parse_across_chunks(tmp_path, monkeypatch, contents):
+    monkeypatch.setattr(CharacterReader, "CHUNK_SIZE", 3)
+    file = tmp_path / "Test Mann.npc"
+    file.write_bytes(contents.encode("utf-8"))
+    full = CharacterReader(file)
+    header = CharacterReader(file, header_only=True)
+
+    header.parse_header()
+
+    assert header._tags == full.tags()
+    assert header._body_offset == full.body_offset()
+
+def test_does_not_read_body(tmp_path):
+    file = tmp_path / "Test Mann.npc"
+    file.write_bytes(b"@type person\n--Notes--\n" + b"\xff" * CharacterReader.CHUNK_SIZE * 4)
+    reader = CharacterReader(file, header_only=True)
+
+    reader.parse_header()
+
+    assert reader._tags[0].value == "person"
+    assert reader._body == ""
+
+def test_reads_body_on_request():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    full = CharacterReader(file)
+    header = CharacterReader(file, header_only=True)
+
+    assert header.body() == full.body()
+
+def test_tags_use_header_parse():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    reader = CharacterReader(file, header_only=True)
+
+    reader.tags()
+
+    assert reader._body == ""
+    assert reader._body_offset is not None
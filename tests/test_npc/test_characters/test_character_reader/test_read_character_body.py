@@ -0,0 +1,34 @@
+import pytest
+
+from tests.fixtures import fixture_file
+
+from npc.characters import CharacterReader, read_character_body
+
+@pytest.mark.parametrize("contents", [
+    "@type person\n--Notes--\nhi\n",
+    "@type person\n\n   --Notes--   \nhi\n",
+    "@title Überprüfer\r\n--Notes--\r\nhi\r\n",
+    "@type person\n--Notes--",
+])
+def test_matches_reader(tmp_path, contents):
+    file = tmp_path / "Test Mann.npc"
+    file.write_bytes(contents.encode("utf-8"))
+    reader = CharacterReader(file)
+
+    result = read_character_body(file, reader.body_offset())
+
+    assert result == reader.body()
+
+def test_matches_reader_fixture():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    reader = CharacterReader(file)
+
+    result = read_character_body(file, reader.body_offset())
+
+    assert result == reader.body()
+
+def test_empty_without_offset(tmp_path):
+    file = tmp_path / "Test Mann.npc"
+    file.write_text("@type person\n")
+
+    assert read_character_body(file, None) == ""
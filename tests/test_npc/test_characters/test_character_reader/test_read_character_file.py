@@ -0,0 +1,43 @@
+from tests.fixtures import fixture_file
+
+from npc.characters import CharacterReader, read_character_file
+
+def test_matches_reader():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    reader = CharacterReader(file)
+
+    result = read_character_file(file)
+
+    assert result.realname == reader.name()
+    assert result.mnemonic == reader.mnemonic()
+    assert result.tags == reader.tags()
+    assert result.body == reader.body()
+
+def test_includes_path():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+
+    result = read_character_file(file)
+
+    assert result.path == file
+
+def test_includes_body_offset():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    reader = CharacterReader(file)
+
+    result = read_character_file(file)
+
+    assert result.body_offset == reader.body_offset()
+
+def test_can_skip_body():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+
+    result = read_character_file(file, body=False)
+
+    assert result.body is None
+
+def test_empty_skipped_body_without_header():
+    file = fixture_file("sheets", "reader", "Blank Mann - nada.npc")
+
+    result = read_character_file(file, body=False)
+
+    assert result.body == ""
@@ -0,0 +1,33 @@
+from tests.fixtures import fixture_file
+
+from npc.characters import CharacterReader
+
+def test_points_to_section_header():
+    file = fixture_file("sheets", "reader", "Test Mann - testing bro.npc")
+    reader = CharacterReader(file)
+
+    offset = reader.body_offset()
+
+    assert file.read_bytes()[offset:].startswith(b"--Notes--")
+
+def test_skips_header_indentation(tmp_path):
+    file = tmp_path / "Test Mann.npc"
+    file.write_text("@type person\n  --Notes--\n", encoding="utf-8")
+    reader = CharacterReader(file)
+
+    assert reader.body_offset() == 15
+
+def test_counts_bytes_not_characters(tmp_path):
+    file = tmp_path / "Test Mann.npc"
+    file.write_text("@title Überprüfer\n--Notes--\n", encoding="utf-8")
+    reader = CharacterReader(file)
+
+    offset = reader.body_offset()
+
+    assert file.read_bytes()[offset:] == b"--Notes--\n"
+
+def test_none_without_body():
+    file = fixture_file("sheets", "reader", "Blank Mann - nada.npc")
+    reader = CharacterReader(file)
+
+    assert reader.body_offset() is None
@@ -0,0 +1,81 @@
+import os
+
+from npc.characters import ParseCache, read_character_file
+
+def write_character(path, contents):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+def stored_cache(tmp_path, *files):
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+    for file in files:
+        cache.store(read_character_file(file), file.stat())
+    cache.save()
+    return ParseCache(tmp_path / ParseCache.FILENAME)
+
+def test_misses_unknown_file(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n")
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+
+    assert cache.lookup(file, file.stat()) is None
+
+def test_hits_unchanged_file(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n--Notes--\nhi\n")
+    cache = stored_cache(tmp_path, file)
+
+    result = cache.lookup(file, file.stat())
+
+    assert result == read_character_file(file)
+
+def test_misses_changed_file(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n")
+    cache = stored_cache(tmp_path, file)
+    write_character(file, "@type ghost\n@org Something\n")
+
+    assert cache.lookup(file, file.stat()) is None
+
+def test_misses_touched_file(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n")
+    cache = stored_cache(tmp_path, file)
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    assert cache.lookup(file, file.stat()) is None
+
+def test_misses_renamed_file(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n")
+    cache = stored_cache(tmp_path, file)
+    renamed = file.rename(tmp_path / "Other Mann - renamed.npc")
+
+    assert cache.lookup(renamed, renamed.stat()) is None
+
+def test_does_not_read_missed_file(tmp_path, monkeypatch):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n")
+    cache = stored_cache(tmp_path, file)
+    write_character(file, "@type ghost\n@org Something\n")
+    stat = file.stat()
+    opened = []
+    monkeypatch.setattr("pathlib.Path.open", lambda *args, **kwargs: opened.append(args))
+    monkeypatch.setattr("pathlib.Path.read_bytes", lambda *args, **kwargs: opened.append(args))
+
+    cache.lookup(file, stat)
+
+    assert opened == []
+
+def test_reads_current_body(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n--Notes--\nhi\n")
+    cache = stored_cache(tmp_path, file)
+
+    result = cache.lookup(file, file.stat())
+
+    assert result.body == "--Notes--hi\n"
+
+def test_can_skip_body(tmp_path):
+    file = write_character(tmp_path / "Test Mann - tester.npc", "@type person\n--Notes--\nhi\n")
+    cache = stored_cache(tmp_path, file)
+
+    result = cache.lookup(file, file.stat(), body=False)
+
+    assert result.body is None
+    assert result.body_offset == 13
@@ -0,0 +1,25 @@
+from npc.characters import ParseCache, read_character_file
+
+def test_removes_missing_paths(tmp_path):
+    file = tmp_path / "Test Mann - tester.npc"
+    file.write_text("@type person\n")
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+    cache.store(read_character_file(file), file.stat())
+    cache.save()
+
+    cache.prune(set())
+    cache.save()
+
+    assert cache.entries == {}
+
+def test_keeps_seen_paths(tmp_path):
+    file = tmp_path / "Test Mann - tester.npc"
+    file.write_text("@type person\n")
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+    cache.store(read_character_file(file), file.stat())
+    cache.save()
+
+    cache.prune({str(file)})
+    cache.save()
+
+    assert list(cache.entries.keys()) == [str(file)]
@@ -0,0 +1,33 @@
+import re
+
+from npc.characters import ParseCache, CharacterReader, read_character_file
+
+def test_changes_with_tag_pattern(monkeypatch):
+    before = ParseCache.version_key()
+    monkeypatch.setattr(CharacterReader, "TAG_RE", re.compile(r"^#(?P<name>\w+)(\s+(?P<value>.*))?$"))
+
+    assert ParseCache.version_key() != before
+
+def test_changes_with_section_pattern(monkeypatch):
+    before = ParseCache.version_key()
+    monkeypatch.setattr(CharacterReader, "SECTION_HEADER_RE", re.compile(r"^=="))
+
+    assert ParseCache.version_key() != before
+
+def test_changes_with_version(monkeypatch):
+    before = ParseCache.version_key()
+    monkeypatch.setattr("npc.characters.parse_cache.npc_version", "0.0.0")
+
+    assert ParseCache.version_key() != before
+
+def test_clears_entries_on_mismatch(tmp_path, monkeypatch):
+    file = tmp_path / "Test Mann - tester.npc"
+    file.write_text("@type person\n")
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+    cache.store(read_character_file(file), file.stat())
+    cache.save()
+    monkeypatch.setattr("npc.characters.parse_cache.npc_version", "0.0.0")
+
+    cache = ParseCache(tmp_path / ParseCache.FILENAME)
+
+    assert cache.entries == {}
@@ -0,0 +1,41 @@
+from sqlalchemy.orm.attributes import instance_state
+from npc.characters import Tag
+
+from npc.characters.tag_class import assemble_tree
+
+def make_tags() -> list[Tag]:
+    return [
+        Tag(id=1, name="org", value="Foo", path="00000"),
+        Tag(id=3, name="role", value="Bar", parent_tag_id=1, path="00000.00000"),
+        Tag(id=4, name="role", value="Baz", parent_tag_id=1, path="00000.00001"),
+        Tag(id=2, name="location", value="Here", path="00001"),
+        Tag(id=5, name="region", value="There", parent_tag_id=2, path="00001.00000"),
+    ]
+
+def test_returns_top_level_tags():
+    tags = make_tags()
+
+    result = assemble_tree(tags)
+
+    assert [tag.name for tag in result] == ["org", "location"]
+
+def test_fills_subtags_in_order():
+    tags = make_tags()
+
+    result = assemble_tree(tags)
+
+    assert [tag.value for tag in result[0].subtags] == ["Bar", "Baz"]
+
+def test_gives_leaves_empty_subtags():
+    tags = make_tags()
+
+    assemble_tree(tags)
+
+    assert tags[1].subtags == []
+
+def test_does_not_mark_subtags_changed():
+    tags = make_tags()
+
+    assemble_tree(tags)
+
+    assert "subtags" not in instance_state(tags[0]).committed_state
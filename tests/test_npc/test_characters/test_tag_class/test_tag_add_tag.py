@@ -0,0 +1,88 @@
+from npc.characters import Character, Tag
+
+def test_appends_to_subtags():
+    tag = Tag(name="org", value="Foo")
+    subtag = Tag(name="role", value="Bar")
+
+    tag.add_tag(subtag)
+
+    assert tag.subtags == [subtag]
+
+def test_builds_path_from_parent():
+    character = Character(realname="Test Mann")
+    character.add_tag(Tag(name="location", value="Here"))
+    tag = Tag(name="org", value="Foo")
+    character.add_tag(tag)
+    tag.add_tag(Tag(name="role", value="Bar"))
+    subtag = Tag(name="role", value="Baz")
+
+    tag.add_tag(subtag)
+
+    assert subtag.path == "00001.00001"
+
+def test_builds_name_path_from_parent():
+    character = Character(realname="Test Mann")
+    tag = Tag(name="location", value="Here")
+    character.add_tag(tag)
+    subtag = Tag(name="region", value="There")
+    tag.add_tag(subtag)
+    subsubtag = Tag(name="locale", value="Everywhere")
+
+    subtag.add_tag(subsubtag)
+
+    assert subsubtag.name_path == "location>>region>>locale"
+
+def test_gives_subtag_the_same_owner():
+    character = Character(realname="Test Mann")
+    tag = Tag(name="org", value="Foo")
+    character.add_tag(tag)
+    subtag = Tag(name="role", value="Bar")
+
+    tag.add_tag(subtag)
+
+    assert subtag.owner is character
+
+def test_unplaced_parent_uses_its_name():
+    tag = Tag(name="org", value="Foo")
+    subtag = Tag(name="role", value="Bar")
+
+    tag.add_tag(subtag)
+
+    assert subtag.name_path == "org>>role"
+
+def test_skips_position_of_removed_sibling():
+    character = Character(realname="Test Mann")
+    tag = Tag(name="org", value="Foo")
+    character.add_tag(tag)
+    first = Tag(name="role", value="Bar")
+    tag.add_tag(first)
+    tag.add_tag(Tag(name="role", value="Baz"))
+    tag.subtags.remove(first)
+    subtag = Tag(name="role", value="Qux")
+
+    tag.add_tag(subtag)
+
+    assert [sub.path for sub in tag.subtags] == ["00000.00001", "00000.00002"]
+
+def test_places_subtags_when_parent_is_placed():
+    character = Character(realname="Test Mann")
+    tag = Tag(name="org", value="Foo")
+    subtag = Tag(name="role", value="Bar")
+    tag.add_tag(subtag)
+
+    character.add_tag(Tag(name="location", value="Here"))
+    character.add_tag(tag)
+
+    assert subtag.path == "00001.00000"
+    assert subtag.owner is character
+
+def test_places_assigned_subtags():
+    character = Character(realname="Test Mann")
+    tag = Tag(name="org", value="Foo")
+    character.add_tag(tag)
+    subtags = [Tag(name="role", value="Bar"), Tag(name="role", value="Baz")]
+
+    tag.subtags = subtags
+
+    assert [sub.name_path for sub in subtags] == ["org>>role", "org>>role"]
+    assert [sub.path for sub in subtags] == ["00000.00000", "00000.00001"]
@@ -1,5 +1,6 @@
 import pytest
 import re
+from sqlalchemy import event
 
 from tests.fixtures import tmp_campaign, create_character, db
 from npc.characters import Character
@@ -113,3 +114,20 @@ def test_includes_hide_tags(tmp_campaign, db):
 
     assert "@title True Bro" in result
     assert "@hide title" in result
+
+def test_queries_tags_once(tmp_campaign, db):
+    character = create_character([
+        ("title", "True Bro"),
+        ("hide", "title"),
+        ("asdf", "literally what"),
+    ], tmp_campaign, db)
+    writer = CharacterWriter(tmp_campaign, db=db)
+    statements = []
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", count_statement)
+
+    writer.tag_strings(character)
+
+    event.remove(db.engine, "before_cursor_execute", count_statement)
+    assert len(statements) == 1
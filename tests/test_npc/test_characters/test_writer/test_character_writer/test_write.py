@@ -57,3 +57,16 @@ def test_writes_body(tmp_campaign, db):
     with loc.open() as f:
         contents = f.read()
     assert "contents!" in contents
+
+def test_keeps_deferred_body(tmp_campaign, db):
+    loc = tmp_campaign.characters_dir / "Test Mann.npc"
+    with loc.open('w', newline="\n") as file:
+        file.write("@type person\n--Notes--\nkeep me\n")
+    character = create_character([], tmp_campaign, db, path=loc, body_offset=13)
+    writer = CharacterWriter(tmp_campaign, db=db)
+
+    writer.write(character)
+
+    with loc.open() as f:
+        contents = f.read()
+    assert contents.endswith("--Notes--keep me\n")
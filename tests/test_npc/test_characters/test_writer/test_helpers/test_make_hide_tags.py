@@ -62,3 +62,13 @@ def test_makes_hide_one_nested(db):
     result_tags = make_hide_tags(character, db=db)
 
     assert result_tags[0].value == "brains >> abby normal >> nerd >> nah"
+
+def test_uses_passed_tags_without_query():
+    character = Character(realname="bumblor", type_key="person", file_loc="/dev/null")
+    tag1 = Tag(name="test", value="yes")
+    tag2 = Tag(name="brains", value="abby normal", hidden="one")
+    character.tags = [tag1, tag2]
+
+    result_tags = make_hide_tags(character, tags=[tag1, tag2])
+
+    assert result_tags[0].value == "brains >> abby normal"
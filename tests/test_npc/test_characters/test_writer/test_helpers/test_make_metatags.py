@@ -110,3 +110,28 @@ def test_returns_used_ids_from_multiple(db):
     assert 4 in result_ids
     assert 5 in result_ids
     assert 6 in result_ids
+
+def test_uses_passed_tags_without_query():
+    metatag_def = {
+        "desc": "A testing tag",
+        "static": {
+            "test": "yes"
+        },
+        "match": ["brains", "brawn"],
+        "greedy": True,
+    }
+    metaspec = MetatagSpec("monster", metatag_def)
+    character = Character(realname="bumblor", type_key="person", file_loc="/dev/null")
+    tags = [
+        Tag(id=1, name="test", value="yes"),
+        Tag(id=2, name="brains", value="abby normal"),
+        Tag(id=3, name="brawn", value="chonk"),
+        Tag(id=4, name="test", value="yes"),
+        Tag(id=5, name="brains", value="mega"),
+        Tag(id=6, name="brawn", value="meh"),
+    ]
+
+    result_tags = make_metatags(metaspec, character, [2], tags=tags)
+
+    assert len(result_tags) == 1
+    assert result_tags[0].tag_ids == [1, 3, 5]
@@ -0,0 +1,24 @@
+from npc.characters import Tag
+
+from npc.characters.writer.helpers import unhandled_tags
+
+def test_keeps_unhandled_tags():
+    tags = [Tag(id=1, name="test"), Tag(id=2, name="brains"), Tag(id=3, name="brawn")]
+
+    result = unhandled_tags(tags, [2])
+
+    assert [tag.id for tag in result] == [1, 3]
+
+def test_keeps_all_without_handled_ids():
+    tags = [Tag(id=1, name="test"), Tag(id=2, name="brains")]
+
+    result = unhandled_tags(tags, [])
+
+    assert result == tags
+
+def test_excludes_all_after_none_id():
+    tags = [Tag(id=1, name="test"), Tag(id=2, name="brains")]
+
+    result = unhandled_tags(tags, [None, 2])
+
+    assert result == []
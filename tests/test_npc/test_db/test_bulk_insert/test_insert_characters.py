@@ -0,0 +1,86 @@
+from sqlalchemy import text
+from tests.fixtures import tmp_campaign, db
+
+from npc.db import DB
+from npc.characters import CharacterFactory, RawTag
+
+from npc.db.bulk_insert import insert_characters
+
+def make_characters(campaign) -> list:
+    factory = CharacterFactory(campaign)
+    return [
+        factory.make(
+            "Test Mann",
+            type_key="person",
+            mnemonic="tester",
+            body="--Notes--",
+            tags=[
+                RawTag("org", "Foo"),
+                RawTag("role", "Bar"),
+                RawTag("role", "Baz"),
+                RawTag("location", "Here"),
+                RawTag("region", "There"),
+                RawTag("locale", "Everywhere"),
+                RawTag("hide", "org >> Foo >> role"),
+            ]),
+        factory.make("Other Mann", tags=[RawTag("org", "Qux"), RawTag("role", "Zip"), RawTag("delist", None)]),
+        factory.make("Plain Mann"),
+    ]
+
+def dump(target_db: DB) -> tuple:
+    with target_db.session() as session:
+        characters = session.execute(text("SELECT * FROM characters ORDER BY id")).all()
+        tags = session.execute(text("SELECT * FROM tags ORDER BY id")).all()
+    return (characters, tags)
+
+def test_matches_orm_insert(tmp_campaign):
+    orm_db = DB(clearSingleton=True)
+    with orm_db.session() as session:
+        session.add_all(make_characters(tmp_campaign))
+        session.commit()
+    bulk_db = DB(clearSingleton=True)
+
+    with bulk_db.session() as session:
+        insert_characters(session, make_characters(tmp_campaign))
+        session.commit()
+
+    assert dump(bulk_db) == dump(orm_db)
+
+def test_returns_new_ids(tmp_campaign, db):
+    with db.session() as session:
+        result = insert_characters(session, make_characters(tmp_campaign))
+        session.commit()
+
+    assert result == [1, 2, 3]
+
+def test_continues_after_existing_ids(tmp_campaign, db):
+    with db.session() as session:
+        insert_characters(session, make_characters(tmp_campaign))
+        result = insert_characters(session, make_characters(tmp_campaign))
+        session.commit()
+
+        assert result == [4, 5, 6]
+        assert session.scalar(text("SELECT count(DISTINCT id) FROM tags")) == 16
+
+def test_links_subtags_to_parents(tmp_campaign, db):
+    with db.session() as session:
+        insert_characters(session, make_characters(tmp_campaign))
+        session.commit()
+
+        query = text("SELECT parent.name FROM tags JOIN tags AS parent ON tags.parent_tag_id = parent.id WHERE tags.name = 'locale'")
+        assert session.scalar(query) == "region"
+
+def test_handles_empty_list(db):
+    with db.session() as session:
+        result = insert_characters(session, [])
+
+    assert result == []
+
+def test_subtags_get_owner_id(tmp_campaign, db):
+    with db.session() as session:
+        ids = insert_characters(session, make_characters(tmp_campaign))
+        session.commit()
+
+    with db.session() as session:
+        owners = session.execute(text("SELECT DISTINCT owner_id FROM tags WHERE name = 'locale'")).scalars().all()
+    assert owners == [ids[0]]
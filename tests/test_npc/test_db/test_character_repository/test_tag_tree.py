@@ -0,0 +1,30 @@
+from tests.fixtures import tmp_campaign, db, create_character
+
+from npc.db.character_repository import tag_tree
+
+def test_includes_tags_at_every_depth(tmp_campaign, db):
+    tags = [("location", "Here"), ("region", "There"), ("locale", "Everywhere")]
+    character = create_character(tags, tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.scalars(tag_tree(character)).all()
+
+    assert [tag.name for tag in result] == ["location", "region", "locale"]
+
+def test_orders_by_file_position(tmp_campaign, db):
+    tags = [("org", "Foo"), ("role", "Bar"), ("role", "Baz"), ("location", "Here"), ("region", "There")]
+    character = create_character(tags, tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.scalars(tag_tree(character)).all()
+
+    assert [tag.value for tag in result] == ["Foo", "Bar", "Baz", "Here", "There"]
+
+def test_excludes_other_characters(tmp_campaign, db):
+    character = create_character([("org", "Foo"), ("role", "Bar")], tmp_campaign, db)
+    create_character([("org", "Qux"), ("role", "Zip")], tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.scalars(tag_tree(character)).all()
+
+    assert [tag.value for tag in result] == ["Foo", "Bar"]
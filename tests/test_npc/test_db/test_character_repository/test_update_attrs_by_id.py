@@ -0,0 +1,24 @@
+from tests.fixtures import tmp_campaign, db, create_character
+from npc.characters import Character
+
+from npc.db.character_repository import update_attrs_by_id
+
+def test_updates_name_parts_with_realname(tmp_campaign, db):
+    character = create_character([], tmp_campaign, db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(character.id, {"realname": "Other Person"}))
+        session.commit()
+        record = session.get(Character, character.id)
+        assert record.first_name == "Other"
+        assert record.last_name == "Person"
+        assert record.last_initial == "P"
+
+def test_leaves_name_parts_alone_without_realname(tmp_campaign, db):
+    character = create_character([], tmp_campaign, db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(character.id, {"desc": "Some guy"}))
+        session.commit()
+        record = session.get(Character, character.id)
+        assert record.last_name == "Mann"
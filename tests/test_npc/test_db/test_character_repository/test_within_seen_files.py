@@ -0,0 +1,30 @@
+from sqlalchemy import insert
+from tests.fixtures import db
+from npc.characters import Character
+
+from npc.db.character_repository import seen_files, within_seen_files
+
+def stored_within(db, records: list[str], paths: list[str]) -> list[str]:
+    with db.session() as session:
+        session.add_all(Character(realname="Test Mann", type_key="person", file_loc=loc) for loc in records)
+        session.flush()
+        connection = session.connection()
+        seen_files.create(connection)
+        session.execute(insert(seen_files), [{"file_loc": path} for path in paths])
+        result = session.scalars(within_seen_files()).all()
+        return sorted(record.file_loc for record in result)
+
+def test_gets_exact_files(db):
+    result = stored_within(db, ["/c/Test Mann.npc", "/c/Other.npc"], ["/c/Test Mann.npc"])
+
+    assert result == ["/c/Test Mann.npc"]
+
+def test_gets_files_within_directories(db):
+    result = stored_within(db, ["/c/a/Test Mann.npc", "/c/a/b/Deep.npc", "/c/Other.npc"], ["/c/a"])
+
+    assert result == ["/c/a/Test Mann.npc", "/c/a/b/Deep.npc"]
+
+def test_skips_directories_sharing_a_prefix(db):
+    result = stored_within(db, ["/c/a/Test Mann.npc", "/c/ab/Other.npc", "/c/a0/Other.npc"], ["/c/a"])
+
+    assert result == ["/c/a/Test Mann.npc"]
@@ -0,0 +1,137 @@
+from sqlalchemy import select, func
+from tests.fixtures import tmp_campaign, db
+
+from npc.characters import Character, CharacterFactory, RawTag, Tag
+from npc.db import character_repository
+
+from npc.db.character_sync import sync_character
+
+def store(db, campaign, *args, **kwargs) -> int:
+    character = CharacterFactory(campaign).make(*args, **kwargs)
+    with db.session() as session:
+        session.add(character)
+        session.commit()
+        return character.id
+
+def sync(db, campaign, character_id, *args, **kwargs):
+    character = CharacterFactory(campaign).make(*args, **kwargs)
+    with db.session() as session:
+        record = session.get(Character, character_id)
+        sync_character(record, character)
+        session.commit()
+
+def tree(tags) -> list:
+    return [
+        (tag.name, tag.value, tag.hidden, tree(tag.subtags))
+        for tag in sorted(tags, key=lambda tag: tag.id)
+    ]
+
+def stored_tree(db, character_id) -> list:
+    with db.session() as session:
+        return tree(session.get(Character, character_id).tags)
+
+def tag_ids(db, character_id) -> list:
+    with db.session() as session:
+        return [tag.id for tag in session.scalars(character_repository.tags(session.get(Character, character_id)))]
+
+def test_keeps_character_id(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person")
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person", tags=[RawTag("org", "Foo")])
+
+    with db.session() as session:
+        assert session.scalars(select(Character.id)).all() == [character_id]
+
+def test_updates_columns(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person")
+
+    sync(db, tmp_campaign, character_id, "Other Mann", type_key="person", tags=[RawTag("delist", None)])
+
+    with db.session() as session:
+        record = session.get(Character, character_id)
+        assert record.realname == "Other Mann"
+        assert record.delist == True
+
+def test_keeps_unchanged_tags(tmp_campaign, db):
+    tags = [RawTag("org", "Foo"), RawTag("location", "Here")]
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person", tags=tags)
+    old_ids = tag_ids(db, character_id)
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person", tags=tags)
+
+    assert tag_ids(db, character_id) == old_ids
+
+def test_updates_changed_tag_in_place(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("org", "Bar"), RawTag("org", "Baz")])
+    old_ids = tag_ids(db, character_id)
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("org", "Qux"), RawTag("org", "Baz")])
+
+    assert tag_ids(db, character_id) == old_ids
+    assert stored_tree(db, character_id)[1] == ("org", "Qux", None, [])
+
+def test_deletes_removed_tag(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("org", "Bar"), RawTag("org", "Baz")])
+    old_ids = tag_ids(db, character_id)
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("org", "Baz")])
+
+    assert tag_ids(db, character_id) == [old_ids[0], old_ids[2]]
+
+def test_appends_new_tag(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person", tags=[RawTag("org", "Foo")])
+    old_ids = tag_ids(db, character_id)
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("location", "Here")])
+
+    new_ids = tag_ids(db, character_id)
+    assert new_ids[0] == old_ids[0]
+    assert len(new_ids) == 2
+
+def test_deletes_subtags_of_removed_tag(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("role", "Bar")])
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person")
+
+    with db.session() as session:
+        assert session.scalar(select(func.count(Tag.id))) == 0
+
+def test_matches_new_character_tags(tmp_campaign, db):
+    old_tags = [
+        RawTag("org", "Foo"),
+        RawTag("role", "Bar"),
+        RawTag("role", "Baz"),
+        RawTag("location", "Here"),
+        RawTag("region", "There"),
+    ]
+    new_tags = [
+        RawTag("location", "Here"),
+        RawTag("org", "Foo"),
+        RawTag("role", "Baz"),
+        RawTag("org", "Qux"),
+        RawTag("role", "Zip"),
+        RawTag("region", "There"),
+        RawTag("hide", "org >> Foo >> role"),
+    ]
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person", tags=old_tags)
+    expected_id = store(db, tmp_campaign, "Test Mann", type_key="person", tags=new_tags)
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person", tags=new_tags)
+
+    assert stored_tree(db, character_id) == stored_tree(db, expected_id)
+
+def test_new_subtags_belong_to_record(tmp_campaign, db):
+    character_id = store(db, tmp_campaign, "Test Mann", type_key="person", tags=[RawTag("org", "Foo")])
+
+    sync(db, tmp_campaign, character_id, "Test Mann", type_key="person",
+        tags=[RawTag("org", "Foo"), RawTag("role", "Bar")])
+
+    with db.session() as session:
+        result = session.scalars(character_repository.tag_tree(session.get(Character, character_id))).all()
+        assert [(tag.name, tag.path) for tag in result] == [("org", "00000"), ("role", "00000.00000")]
@@ -0,0 +1,21 @@
+from npc.db.custom_functions import replace_name_part
+
+def test_replaces_top_level_name():
+    result = replace_name_part("org>>role", "00001", "group")
+
+    assert result == "group>>role"
+
+def test_replaces_nested_name():
+    result = replace_name_part("location>>region>>locale", "00000.00002", "area")
+
+    assert result == "location>>area>>locale"
+
+def test_replaces_empty_name():
+    result = replace_name_part("org>>", "00001.00000", "role")
+
+    assert result == "org>>role"
+
+def test_missing_name_path_becomes_name():
+    result = replace_name_part(None, None, "org")
+
+    assert result == "org"
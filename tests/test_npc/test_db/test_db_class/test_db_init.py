@@ -24,3 +24,54 @@ def test_injects_last_word_func():
         query = text("SELECT last_word('one two three')")
         result = session.scalar(query)
         assert result == 'three'
+
+def test_custom_functions_are_deterministic():
+    db = DB(clearSingleton=True)
+
+    with db.session() as session:
+        session.execute(text("CREATE INDEX ix_test_last_word ON characters (last_word(realname))"))
+        session.execute(text("CREATE INDEX ix_test_first_word ON characters (first_word(realname))"))
+
+def test_uses_memory_by_default():
+    db = DB(clearSingleton=True)
+
+    assert db.db_path is None
+    assert db.engine.url.database is None
+
+def test_uses_file_when_given_path(tmp_path):
+    db_path = tmp_path / "index.sqlite"
+
+    db = DB(clearSingleton=True, db_path=db_path)
+
+    assert db.engine.url.database == str(db_path)
+    assert db_path.exists()
+
+def test_stores_schema_version():
+    db = DB(clearSingleton=True)
+
+    assert db.schema_version == DB.SCHEMA_VERSION
+
+def test_keeps_contents_with_matching_schema(tmp_path):
+    db_path = tmp_path / "index.sqlite"
+    db = DB(clearSingleton=True, db_path=db_path)
+    with db.session() as session:
+        session.execute(text("INSERT INTO characters (realname, type_key, nolint, sticky, delist) VALUES ('tester', 'person', False, False, False)"))
+        session.commit()
+
+    reopened = DB(clearSingleton=True, db_path=db_path)
+
+    with reopened.session() as session:
+        assert session.scalar(text("SELECT count(1) FROM characters")) == 1
+
+def test_resets_contents_with_old_schema(tmp_path):
+    db_path = tmp_path / "index.sqlite"
+    db = DB(clearSingleton=True, db_path=db_path)
+    with db.session() as session:
+        session.execute(text("INSERT INTO characters (realname, type_key, nolint, sticky, delist) VALUES ('tester', 'person', False, False, False)"))
+        session.execute(text("PRAGMA user_version = 0"))
+        session.commit()
+
+    reopened = DB(clearSingleton=True, db_path=db_path)
+
+    with reopened.session() as session:
+        assert session.scalar(text("SELECT count(1) FROM characters")) == 0
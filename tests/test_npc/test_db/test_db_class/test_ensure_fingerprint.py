@@ -0,0 +1,46 @@
+from sqlalchemy import text
+
+from npc.db.database import DB
+
+def insert_character(db: DB):
+    with db.session() as session:
+        session.execute(text("INSERT INTO characters (realname, type_key, nolint, sticky, delist) VALUES ('tester', 'person', False, False, False)"))
+        session.commit()
+
+def count_characters(db: DB) -> int:
+    with db.session() as session:
+        return session.scalar(text("SELECT count(1) FROM characters"))
+
+def test_stores_new_fingerprint():
+    db = DB(clearSingleton=True)
+
+    db.ensure_fingerprint("abc")
+
+    assert db.fingerprint == "abc"
+
+def test_returns_false_on_new_fingerprint():
+    db = DB(clearSingleton=True)
+
+    result = db.ensure_fingerprint("abc")
+
+    assert result is False
+
+def test_keeps_records_on_same_fingerprint():
+    db = DB(clearSingleton=True)
+    db.ensure_fingerprint("abc")
+    insert_character(db)
+
+    result = db.ensure_fingerprint("abc")
+
+    assert result is True
+    assert count_characters(db) == 1
+
+def test_clears_records_on_changed_fingerprint():
+    db = DB(clearSingleton=True)
+    db.ensure_fingerprint("abc")
+    insert_character(db)
+
+    db.ensure_fingerprint("def")
+
+    assert count_characters(db) == 0
+    assert db.fingerprint == "def"
@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from npc.db import DB, character_search, character_names, VIRTUAL_TABLES, sqlite_supports
+
+def table_names(db) -> set[str]:
+    with db.session() as session:
+        return set(session.scalars(text("SELECT name FROM sqlite_master WHERE type = 'table'")))
+
+def test_new_db_has_no_virtual_tables():
+    db = DB(clearSingleton=True)
+
+    assert "character_search" not in table_names(db)
+    assert "character_names" not in table_names(db)
+
+def test_creates_table():
+    db = DB(clearSingleton=True)
+
+    with db.session() as session:
+        result = db.ensure_virtual_table(session, character_names)
+        session.commit()
+
+    assert result
+    assert "character_names" in table_names(db)
+
+def test_skips_unsupported_table(monkeypatch):
+    monkeypatch.setattr("npc.db.database.sqlite_supports", lambda ddl: False)
+    db = DB(clearSingleton=True)
+
+    with db.session() as session:
+        result = db.ensure_virtual_table(session, character_search)
+        session.commit()
+
+    assert not result
+    assert "character_search" not in table_names(db)
+
+def test_probes_real_statements():
+    assert sqlite_supports(VIRTUAL_TABLES["character_search"])
+
+def test_rejects_unknown_module():
+    assert not sqlite_supports("CREATE VIRTUAL TABLE nope USING no_such_module(a)")
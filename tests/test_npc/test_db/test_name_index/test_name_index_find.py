@@ -0,0 +1,78 @@
+from tests.fixtures import db
+from npc.characters import Character
+
+from npc.db import name_index, character_names
+
+def store(db, *names):
+    characters = [Character(realname=name, mnemonic=mnemonic, type_key="person") for name, mnemonic in names]
+    with db.session() as session:
+        session.add_all(characters)
+        session.flush()
+        db.ensure_virtual_table(session, character_names)
+        name_index.add(session, [(character.id, character) for character in characters])
+        session.commit()
+
+def find(db, fragment, limit=None) -> list[str]:
+    with db.session() as session:
+        return [character.realname for character in session.scalars(name_index.find(fragment, limit))]
+
+def test_finds_substrings(db):
+    store(db, ("Martha Pike", "keeper"), ("Jonas Grimsby", "clerk"))
+
+    result = find(db, "pike")
+
+    assert result == ["Martha Pike"]
+
+def test_forgives_typos(db):
+    store(db, ("Martha Pike", "keeper"), ("Jonas Grimsby", "clerk"))
+
+    result = find(db, "marhta")
+
+    assert result == ["Martha Pike"]
+
+def test_matches_mnemonics(db):
+    store(db, ("Martha Pike", "lighthouse keeper"), ("Jonas Grimsby", "clerk"))
+
+    result = find(db, "lighthouse")
+
+    assert result == ["Martha Pike"]
+
+def test_puts_whole_matches_first(db):
+    store(db, ("Marta Pikeman", "clerk"), ("Martha Pike", "keeper"))
+
+    result = find(db, "martha")
+
+    assert result[0] == "Martha Pike"
+
+def test_short_fragments_match_substrings(db):
+    store(db, ("Martha Pike", "keeper"), ("Jonas Grimsby", "clerk"))
+
+    result = find(db, "jo")
+
+    assert result == ["Jonas Grimsby"]
+
+def test_respects_limit(db):
+    store(db, ("Martha Pike", "keeper"), ("Marta Quill", "clerk"), ("Mart Vale", "sailor"))
+
+    result = find(db, "mar", 2)
+
+    assert len(result) == 2
+
+def test_remove_drops_rows(db):
+    store(db, ("Martha Pike", "keeper"))
+    with db.session() as session:
+        ids = session.scalars(name_index.find("martha")).all()
+        name_index.remove(session, [character.id for character in ids])
+        session.commit()
+
+    assert find(db, "martha") == []
+
+def test_finds_substrings_without_index(db):
+    with db.session() as session:
+        session.add_all([Character(realname="Martha Pike", type_key="person"), Character(realname="Jonas Grimsby", type_key="person")])
+        session.commit()
+
+    with db.session() as session:
+        result = [character.realname for character in session.scalars(name_index.find("pike", indexed=False))]
+
+    assert result == ["Martha Pike"]
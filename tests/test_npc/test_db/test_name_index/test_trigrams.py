@@ -0,0 +1,26 @@
+from npc.db.name_index import trigrams, match_expression
+
+def test_splits_into_lowercase_trigrams():
+    result = trigrams("Mart")
+
+    assert result == ["mar", "art"]
+
+def test_skips_repeated_trigrams():
+    result = trigrams("aaaa")
+
+    assert result == ["aaa"]
+
+def test_short_fragment_has_no_trigrams():
+    result = trigrams("Ma")
+
+    assert result == []
+
+def test_expression_matches_any_trigram():
+    result = match_expression("Mart")
+
+    assert result == '"mar" OR "art"'
+
+def test_expression_escapes_quotes():
+    result = match_expression('a"b')
+
+    assert result == '"a""b"'
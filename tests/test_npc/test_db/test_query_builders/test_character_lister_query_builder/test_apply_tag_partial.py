@@ -1,3 +1,5 @@
+from tests.fixtures import tmp_campaign, db, create_character
+
 from npc.db.query_builders import CharacterListerQueryBuilder
 
 def test_includes_label():
@@ -6,3 +8,23 @@ def test_includes_label():
     builder.apply_tag_partial("org", "test")
 
     assert "test" in str(builder.query)
+
+def test_gets_first_value_of_tag(tmp_campaign, db):
+    create_character([("org", "Foo"), ("org", "Bar")], tmp_campaign, db)
+    builder = CharacterListerQueryBuilder()
+
+    builder.apply_tag_partial("org", "test")
+
+    with db.session() as session:
+        row = session.execute(builder.query).one()
+    assert row.test == "Foo"
+
+def test_gets_none_without_tag(tmp_campaign, db):
+    create_character([("location", "Here")], tmp_campaign, db)
+    builder = CharacterListerQueryBuilder()
+
+    builder.apply_tag_partial("org", "test")
+
+    with db.session() as session:
+        row = session.execute(builder.query).one()
+    assert row.test is None
@@ -1,11 +1,11 @@
 from npc.db.query_builders import CharacterListerQueryBuilder
 
-def test_examines_name_first_char():
+def test_uses_first_initial():
     builder = CharacterListerQueryBuilder()
 
     builder.apply_first_initial_partial("test")
 
-    assert "substr(characters.realname" in str(builder.query)
+    assert "characters.first_initial AS test" in str(builder.query)
 
 def test_includes_label():
     builder = CharacterListerQueryBuilder()
@@ -1,11 +1,11 @@
 from npc.db.query_builders import CharacterListerQueryBuilder
 
-def test_applies_first_word_func():
+def test_uses_first_name():
     builder = CharacterListerQueryBuilder()
 
     builder.apply_first_name_partial("test")
 
-    assert "first_word(characters.realname)" in str(builder.query)
+    assert "characters.first_name AS test" in str(builder.query)
 
 def test_includes_label():
     builder = CharacterListerQueryBuilder()
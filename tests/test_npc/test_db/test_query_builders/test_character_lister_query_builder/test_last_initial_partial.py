@@ -1,11 +1,11 @@
 from npc.db.query_builders import CharacterListerQueryBuilder
 
-def test_examines_name_first_char():
+def test_uses_last_initial():
     builder = CharacterListerQueryBuilder()
 
     builder.apply_last_initial_partial("test")
 
-    assert "substr(last_word(characters.realname" in str(builder.query)
+    assert "characters.last_initial AS test" in str(builder.query)
 
 def test_includes_label():
     builder = CharacterListerQueryBuilder()
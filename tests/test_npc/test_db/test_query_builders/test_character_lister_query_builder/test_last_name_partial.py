@@ -1,11 +1,11 @@
 from npc.db.query_builders import CharacterListerQueryBuilder
 
-def test_applies_first_word_func():
+def test_uses_last_name():
     builder = CharacterListerQueryBuilder()
 
     builder.apply_last_name_partial("test")
 
-    assert "last_word(characters.realname)" in str(builder.query)
+    assert "characters.last_name AS test" in str(builder.query)
 
 def test_includes_label():
     builder = CharacterListerQueryBuilder()
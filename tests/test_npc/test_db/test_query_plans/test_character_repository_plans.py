@@ -0,0 +1,64 @@
+from tests.fixtures import db, query_plan, scans_table
+
+from npc.characters import Character
+from npc.db import character_repository
+
+def test_tags_uses_character_index(db):
+    query = character_repository.tags(Character(id=1))
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_character_id_name (character_id=?)" in plan
+
+def test_tag_values_by_name_uses_character_and_name_index(db):
+    query = character_repository.tag_values_by_name(Character(id=1), "org")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_character_id_name (character_id=? AND name=?)" in plan
+    assert not scans_table(plan, "tags")
+
+def test_tags_by_name_uses_character_and_name_index(db):
+    query = character_repository.tags_by_name(Character(id=1), "org", "role")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_character_id_name (character_id=? AND name=?)" in plan
+
+def test_has_tags_uses_character_and_name_index(db):
+    query = character_repository.has_tags(Character(id=1), "org")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_character_id_name (character_id=? AND name=?)" in plan
+
+def test_type_counts_use_type_index(db):
+    query = character_repository.attr_counts("type")
+
+    plan = query_plan(db, query)
+
+    assert "SCAN characters USING COVERING INDEX ix_characters_type_key" in plan
+
+def test_delist_counts_use_delist_index(db):
+    query = character_repository.attr_counts("delist")
+
+    plan = query_plan(db, query)
+
+    assert "SCAN characters USING COVERING INDEX ix_characters_delist" in plan
+
+def test_missing_tags_use_owner_index(db):
+    with db.engine.begin() as conn:
+        character_repository.seen_files.create(conn)
+    query = character_repository.destroy_missing_tags()
+
+    plan = query_plan(db, query)
+
+    assert any("ix_tags_owner_id_path (owner_id=?)" in step for step in plan)
+
+def test_tag_tree_uses_owner_path_index(db):
+    query = character_repository.tag_tree(Character(id=1))
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_owner_id_path (owner_id=?)" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
@@ -0,0 +1,41 @@
+from tests.fixtures import db, query_plan, scans_table
+
+from npc.db.query_builders.character_lister_query_builder import CharacterListerQueryBuilder
+
+def test_skips_delisted_with_delist_index(db):
+    builder = CharacterListerQueryBuilder()
+
+    plan = query_plan(db, builder.query)
+
+    assert "SEARCH characters USING INDEX ix_characters_delist (delist=?)" in plan
+
+def test_tag_partial_uses_character_and_name_index(db):
+    builder = CharacterListerQueryBuilder()
+    builder.group_by("org")
+    builder.sort_by("location")
+
+    plan = query_plan(db, builder.query)
+
+    assert "SEARCH tags USING INDEX ix_tags_character_id_name (character_id=? AND name=?)" in plan
+    assert not scans_table(plan, "tags")
+
+def test_tag_partials_only_sort_the_result(db):
+    builder = CharacterListerQueryBuilder()
+    builder.group_by("type", "org", "location")
+    builder.sort_by("last_name", "group")
+
+    plan = query_plan(db, builder.query)
+
+    assert plan.count("SEARCH tags USING INDEX ix_tags_character_id_name (character_id=? AND name=?)") == 3
+    assert len([step for step in plan if "TEMP B-TREE" in step]) == 1
+
+def test_name_partials_use_stored_columns(db):
+    builder = CharacterListerQueryBuilder()
+    builder.group_by("last_initial")
+    builder.sort_by("last_name", "first_name")
+
+    plan = query_plan(db, builder.query)
+
+    assert not scans_table(plan, "characters")
+    assert "first_word" not in str(builder.query)
+    assert "last_word" not in str(builder.query)
@@ -0,0 +1,27 @@
+from tests.fixtures import db, query_plan, scans_table
+
+from npc.db import tag_repository
+
+def test_value_counts_use_covering_name_index(db):
+    query = tag_repository.value_counts("org")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING COVERING INDEX ix_tags_name_value_name_path (name=?)" in plan
+    assert not scans_table(plan, "tags")
+
+def test_subtag_value_counts_use_covering_name_index(db):
+    query = tag_repository.subtag_value_counts("role", "org")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING COVERING INDEX ix_tags_name_value_name_path (name=?)" in plan
+    assert not scans_table(plan, "tags")
+
+def test_subtags_use_covering_name_index(db):
+    query = tag_repository.subtags("role", "org")
+
+    plan = query_plan(db, query)
+
+    assert "SEARCH tags USING INDEX ix_tags_name_value_name_path (name=?)" in plan
+    assert not scans_table(plan, "tags")
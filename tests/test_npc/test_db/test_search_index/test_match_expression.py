@@ -0,0 +1,21 @@
+from npc.db.search_index import match_expression
+
+def test_quotes_each_term():
+    result = match_expression("old lighthouse")
+
+    assert result == '"old" "lighthouse"'
+
+def test_escapes_quotes():
+    result = match_expression('say "hi"')
+
+    assert result == '"say" """hi"""'
+
+def test_keeps_prefix_star_outside_quotes():
+    result = match_expression("light*")
+
+    assert result == '"light"*'
+
+def test_skips_bare_stars():
+    result = match_expression("*  **")
+
+    assert result == ""
@@ -0,0 +1,56 @@
+from tests.fixtures import tmp_campaign, db, create_character
+from npc.characters import Character
+
+from npc.db import search_index, character_search
+
+def index(db, *characters):
+    with db.session() as session:
+        db.ensure_virtual_table(session, character_search)
+        search_index.add(session, [(character.id, character) for character in characters])
+        session.commit()
+
+def find(db, query) -> list:
+    with db.session() as session:
+        rows = session.execute(search_index.search(search_index.match_expression(query))).all()
+        return [(row[0].realname, row.snippet) for row in rows]
+
+def test_finds_body_text(tmp_campaign, db):
+    character = create_character([], tmp_campaign, db, body="Keeps the old lighthouse lit")
+    index(db, character)
+
+    result = find(db, "lighthouse")
+
+    assert result == [("Test Mann", "Keeps the old **lighthouse** lit")]
+
+def test_finds_subtag_values(tmp_campaign, db):
+    character = create_character([("location", "Here"), ("region", "Misty Bay")], tmp_campaign, db)
+    index(db, character)
+
+    result = find(db, "misty")
+
+    assert [name for name, _ in result] == ["Test Mann"]
+
+def test_ranks_name_matches_first(tmp_campaign, db):
+    body_match = create_character([], tmp_campaign, db, body="Once met Harbor at the docks")
+    name_match = create_character([], tmp_campaign, db, body="Nothing much")
+    with db.session() as session:
+        record = session.get(Character, name_match.id)
+        record.realname = "Harbor Master"
+        session.commit()
+        name_match = record
+        name_match.tags
+    index(db, body_match, name_match)
+
+    result = find(db, "harbor")
+
+    assert [name for name, _ in result] == ["Harbor Master", "Test Mann"]
+
+def test_remove_drops_rows(tmp_campaign, db):
+    character = create_character([], tmp_campaign, db, body="Keeps the old lighthouse lit")
+    index(db, character)
+
+    with db.session() as session:
+        search_index.remove(session, [character.id])
+        session.commit()
+
+    assert find(db, "lighthouse") == []
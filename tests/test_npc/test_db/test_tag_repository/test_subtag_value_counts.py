@@ -0,0 +1,37 @@
+from tests.fixtures import tmp_campaign, db, create_character
+
+from npc.db.tag_repository import subtag_value_counts, subtags
+
+def test_counts_subtags_under_named_parent(tmp_campaign, db):
+    create_character([("org", "Foo"), ("role", "Bar"), ("role", "Baz")], tmp_campaign, db)
+    create_character([("org", "Qux"), ("role", "Bar")], tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.execute(subtag_value_counts("role", "org")).all()
+
+    assert result == [("Bar", 2), ("Baz", 1)]
+
+def test_counts_subtags_under_nested_parent(tmp_campaign, db):
+    create_character([("location", "Here"), ("region", "There"), ("locale", "Everywhere")], tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.execute(subtag_value_counts("locale", "region")).all()
+
+    assert result == [("Everywhere", 1)]
+
+def test_ignores_subtags_under_other_parents(tmp_campaign, db):
+    create_character([("location", "Here"), ("region", "There"), ("locale", "Everywhere")], tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.execute(subtag_value_counts("locale", "location")).all()
+
+    assert result == []
+
+def test_subtags_gets_every_character_in_order(tmp_campaign, db):
+    first = create_character([("org", "Foo"), ("role", "Bar"), ("role", "Baz")], tmp_campaign, db)
+    second = create_character([("org", "Qux"), ("role", "Zip")], tmp_campaign, db)
+
+    with db.session() as session:
+        result = session.scalars(subtags("role", "org")).all()
+
+    assert [(tag.owner_id, tag.value) for tag in result] == [(first.id, "Bar"), (first.id, "Baz"), (second.id, "Zip")]
@@ -0,0 +1,78 @@
+from tests.fixtures import db
+from npc.characters import Character, Tag
+
+from npc.db.tag_repository import update_attrs_by_id, subtag_value_counts
+
+def make_tree(db) -> Tag:
+    character = Character(realname="Test Mann", type_key="person")
+    tag = Tag(name="", value="Foo")
+    character.add_tag(Tag(name="location", value="Here"))
+    character.add_tag(tag)
+    subtag = Tag(name="role", value="Bar")
+    tag.add_tag(subtag)
+    subtag.add_tag(Tag(name="rank", value="Low"))
+    with db.session() as session:
+        session.add(character)
+        session.commit()
+        return tag.id
+
+def test_updates_other_attrs(db):
+    tag_id = make_tree(db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(tag_id, {"value": "Qux"}))
+        session.commit()
+        record = session.get(Tag, tag_id)
+        assert record.value == "Qux"
+
+def test_renames_name_path(db):
+    tag_id = make_tree(db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(tag_id, {"name": "org"}))
+        session.commit()
+        record = session.get(Tag, tag_id)
+        assert record.name == "org"
+        assert record.name_path == "org"
+
+def test_renames_descendant_name_paths(db):
+    tag_id = make_tree(db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(tag_id, {"name": "org"}))
+        session.commit()
+        result = session.scalars(Tag.__table__.select().with_only_columns(Tag.name_path).order_by(Tag.path)).all()
+
+    assert result == ["location", "org", "org>>role", "org>>role>>rank"]
+
+def test_leaves_descendant_attrs_alone(db):
+    tag_id = make_tree(db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(tag_id, {"name": "org", "value": "Qux"}))
+        session.commit()
+        result = session.execute(Tag.__table__.select().with_only_columns(Tag.name, Tag.value).order_by(Tag.path)).all()
+
+    assert result == [("location", "Here"), ("org", "Qux"), ("role", "Bar"), ("rank", "Low")]
+
+def test_renamed_parent_counts_subtags(db):
+    tag_id = make_tree(db)
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(tag_id, {"name": "org"}))
+        session.commit()
+        result = session.execute(subtag_value_counts("role", "org")).all()
+
+    assert result == [("Bar", 1)]
+
+def test_renames_nested_tag(db):
+    tag_id = make_tree(db)
+    with db.session() as session:
+        role_id = session.get(Tag, tag_id).subtags[0].id
+
+    with db.session() as session:
+        session.execute(update_attrs_by_id(role_id, {"name": "title"}))
+        session.commit()
+        result = session.scalars(Tag.__table__.select().with_only_columns(Tag.name_path).order_by(Tag.path)).all()
+
+    assert result == ["location", "", ">>title", ">>title>>rank"]
@@ -0,0 +1,41 @@
+from io import StringIO
+from tests.fixtures import tmp_campaign, db
+
+from npc.listers import CharacterLister
+
+def test_reuses_unused_environment(tmp_campaign):
+    lister = CharacterLister(tmp_campaign.characters)
+    jenv = lister.environment()
+
+    assert lister.environment() is jenv
+
+def test_reuses_environment(tmp_campaign):
+    first = CharacterLister(tmp_campaign.characters)
+    second = CharacterLister(tmp_campaign.characters)
+    jenv = first.environment()
+    jenv.get_template("character.md")
+
+    assert second.environment() is jenv
+
+def test_replaces_environment_after_template_change(tmp_campaign):
+    lister = CharacterLister(tmp_campaign.characters)
+    jenv = lister.environment()
+    jenv.get_template("character.md")
+    templates = tmp_campaign.settings_dir / "templates" / "characters"
+    templates.mkdir(parents=True)
+    (templates / "character.md").write_text("Custom")
+
+    result = lister.environment()
+
+    assert result is not jenv
+    assert result.get_template("character.md").render() == "Custom"
+
+def test_stores_compiled_templates(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    lister = CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=False)
+
+    lister.list(target=StringIO())
+
+    assert list(lister.bytecode_dir.glob("*.cache"))
@@ -1,13 +1,14 @@
 import pytest
 from io import StringIO
-from tests.fixtures import fixture_file, ProgressCounter, db
-from npc.campaign import Campaign
+from tests.fixtures import fixture_campaign, ProgressCounter, db, tmp_campaign
 
 from npc.listers import CharacterLister
+from npc.listers.character_lister import chunk_pieces
+from npc.templates.filters import cached_markdown
 
 class TestCharacters:
-    def test_includes_names(self, db):
-        campaign = Campaign(fixture_file("listing", "show_all"))
+    def test_includes_names(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "show_all")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -19,8 +20,8 @@ class TestCharacters:
         assert "Test Mann" in result
         assert "Frank" in result
 
-    def test_excludes_delist(self, db):
-        campaign = Campaign(fixture_file("listing", "skip_delist"))
+    def test_excludes_delist(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "skip_delist")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -32,8 +33,8 @@ class TestCharacters:
         assert "Test Mann" in result
         assert "Frank" not in result
 
-    def test_char_header_higher_than_groups(self, db):
-        campaign = Campaign(fixture_file("listing", "basic_groups"))
+    def test_char_header_higher_than_groups(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -46,8 +47,8 @@ class TestCharacters:
         assert "## Test Mann" in result
 
 class TestGroupings:
-    def test_group_header_levels_increment(self, db):
-        campaign = Campaign(fixture_file("listing", "basic_groups"))
+    def test_group_header_levels_increment(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -60,8 +61,8 @@ class TestGroupings:
         assert "## T" in result
         assert "### Test Mann" in result
 
-    def test_resets_subgroups(self, db):
-        campaign = Campaign(fixture_file("listing", "basic_groups"))
+    def test_resets_subgroups(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -77,8 +78,8 @@ class TestGroupings:
         assert "## T" in result
         assert "### Test Mann" in result
 
-    def test_labels_null_group_static(self, db):
-        campaign = Campaign(fixture_file("listing", "missing_groups"))
+    def test_labels_null_group_static(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "missing_groups")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -89,8 +90,8 @@ class TestGroupings:
         result = target.getvalue()
         assert "# No org" in result
 
-    def test_reuses_group(self, db):
-        campaign = Campaign(fixture_file("listing", "basic_groups"))
+    def test_reuses_group(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -109,8 +110,8 @@ class TestGroupings:
         assert header2_loc > char2_loc
 
 class TestFilters():
-    def test_renders_markdown(self, db):
-        campaign = Campaign(fixture_file("listing", "markdown"))
+    def test_renders_markdown(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "markdown")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="html")
@@ -121,8 +122,8 @@ class TestFilters():
         result = target.getvalue()
         assert "<p>A <em>testing</em> string with <strong>markdown</strong></p>" in result
 
-    def test_renders_inline_markdown(self, db):
-        campaign = Campaign(fixture_file("listing", "markdown"))
+    def test_renders_inline_markdown(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "markdown")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="html")
@@ -134,8 +135,8 @@ class TestFilters():
         assert "<span>A <em>testing</em> string with <strong>markdown</strong></span>" in result
 
 class TestProgressBar():
-    def test_updates_progress(self, db):
-        campaign = Campaign(fixture_file("listing", "show_all"))
+    def test_updates_progress(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "show_all")
         campaign.characters.db = db
         campaign.characters.refresh()
         lister = CharacterLister(campaign.characters, lang="markdown")
@@ -145,3 +146,201 @@ class TestProgressBar():
         lister.list(target=target, progress_callback=counter.progress)
 
         assert counter.count == 2
+
+class TestWorkers():
+    def test_uses_passed_workers(self, tmp_campaign):
+        lister = CharacterLister(tmp_campaign.characters, workers=3)
+
+        assert lister.workers == 3
+
+    def test_uses_passed_zero_workers(self, tmp_campaign):
+        tmp_campaign.patch_campaign_settings({"characters": {"listing": {"render_workers": 3}}})
+
+        lister = CharacterLister(tmp_campaign.characters, workers=0)
+
+        assert lister.workers == 0
+
+    def test_uses_settings_workers(self, tmp_campaign):
+        tmp_campaign.patch_campaign_settings({"characters": {"listing": {"render_workers": 3}}})
+
+        lister = CharacterLister(tmp_campaign.characters)
+
+        assert lister.workers == 3
+
+    @pytest.mark.parametrize("lang", ["markdown", "html"])
+    def test_parallel_matches_serial(self, db, lang, monkeypatch, tmp_path):
+        monkeypatch.setattr("npc.listers.character_lister.RENDER_CHUNK_SIZE", 1)
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
+        campaign.characters.db = db
+        campaign.characters.refresh()
+        serial = StringIO()
+        parallel = StringIO()
+
+        CharacterLister(campaign.characters, lang=lang, workers=1, render_cache=False).list(target=serial)
+        CharacterLister(campaign.characters, lang=lang, workers=2, render_cache=False).list(target=parallel)
+
+        assert parallel.getvalue() == serial.getvalue()
+
+    def test_parallel_updates_progress(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "show_all")
+        campaign.characters.db = db
+        campaign.characters.refresh()
+        lister = CharacterLister(campaign.characters, lang="markdown", workers=2, render_cache=False)
+        counter = ProgressCounter()
+
+        lister.list(target=StringIO(), progress_callback=counter.progress)
+
+        assert counter.count == 2
+
+class TestChunks():
+    def test_keeps_headers_with_next_character(self):
+        pieces = [
+            ("group.md", {"group": "A"}),
+            ("character.md", {"character": 1}),
+            ("group.md", {"group": "B"}),
+            ("character.md", {"character": 2}),
+            ("character.md", {"character": 3}),
+        ]
+
+        chunks = list(chunk_pieces(iter(pieces), 1))
+
+        assert chunks == [pieces[0:2], pieces[2:4], pieces[4:5]]
+
+class RecordingTarget(StringIO):
+    """Target which notes how many pieces had been built when it was first written to"""
+    def __init__(self, counter: dict):
+        super().__init__()
+        self.counter = counter
+        self.built_at_first_write = None
+
+    def write(self, text):
+        if self.built_at_first_write is None:
+            self.built_at_first_write = self.counter["built"]
+        return super().write(text)
+
+def count_built_pieces(lister: CharacterLister) -> dict:
+    counter = {"built": 0}
+    pieces = lister.pieces
+    def counted_pieces():
+        for piece in pieces():
+            counter["built"] += 1
+            yield piece
+    lister.pieces = counted_pieces
+    return counter
+
+class TestStreaming():
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_writes_before_building_every_piece(self, db, tmp_campaign, workers, monkeypatch):
+        monkeypatch.setattr("npc.listers.character_lister.RENDER_CHUNK_SIZE", 1)
+        tmp_campaign.characters.db = db
+        for index in range(12):
+            (tmp_campaign.characters_dir / f"Test Mann{index} - tester.npc").write_text("@type person\n")
+        tmp_campaign.characters.refresh()
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", workers=workers, render_cache=False)
+        counter = count_built_pieces(lister)
+        target = RecordingTarget(counter)
+
+        lister.list(target=target)
+
+        assert counter["built"] == 13
+        assert target.built_at_first_write < counter["built"]
+
+    def test_bounds_chunks_in_flight(self, db, tmp_campaign, monkeypatch):
+        monkeypatch.setattr("npc.listers.character_lister.RENDER_CHUNK_SIZE", 1)
+        monkeypatch.setattr("npc.listers.character_lister.RENDER_CHUNKS_PER_WORKER", 1)
+        tmp_campaign.characters.db = db
+        for index in range(12):
+            (tmp_campaign.characters_dir / f"Test Mann{index} - tester.npc").write_text("@type person\n")
+        tmp_campaign.characters.refresh()
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", workers=2, render_cache=False)
+        counter = count_built_pieces(lister)
+        target = RecordingTarget(counter)
+
+        lister.list(target=target)
+
+        # the first chunk holds the heading, and no more than three chunks are built before one is written
+        assert target.built_at_first_write <= 4
+
+class TestStats():
+    def test_counts_pieces(self, db, tmp_campaign):
+        tmp_campaign.characters.db = db
+        (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+        (tmp_campaign.characters_dir / "Other Mann - other.npc").write_text("@type person\n")
+        tmp_campaign.characters.refresh()
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=False)
+
+        lister.list(target=StringIO())
+
+        assert lister.stats.characters == 2
+        assert lister.stats.groups == 1
+        assert lister.stats.cached == 0
+
+    def test_counts_cached_pieces(self, db, tmp_campaign):
+        tmp_campaign.characters.db = db
+        (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+        tmp_campaign.characters.refresh()
+        CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=True).list(target=StringIO())
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=True)
+
+        lister.list(target=StringIO())
+
+        assert lister.stats.cached == 2
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_counts_markdown_hits(self, db, tmp_campaign, workers):
+        cached_markdown.cache_clear()
+        tmp_campaign.characters.db = db
+        for name in ["Test", "Other", "Third"]:
+            (tmp_campaign.characters_dir / f"{name} Mann - tester.npc").write_text(
+                "@type person\n@description A *shared* description\n")
+        tmp_campaign.characters.refresh()
+        lister = CharacterLister(tmp_campaign.characters, lang="html", render_cache=False, workers=workers)
+
+        lister.list(target=StringIO())
+
+        assert lister.stats.markdown_hits + lister.stats.markdown_misses == 3
+        assert lister.stats.markdown_hits >= 1
+
+class TestListMany():
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_separate_listings(self, db, workers, monkeypatch, tmp_path):
+        monkeypatch.setattr("npc.listers.character_lister.RENDER_CHUNK_SIZE", 1)
+        campaign = fixture_campaign(tmp_path, "listing", "basic_groups")
+        campaign.characters.db = db
+        campaign.characters.refresh()
+        html_single = StringIO()
+        markdown_single = StringIO()
+        CharacterLister(campaign.characters, lang="html", render_cache=False).list(target=html_single)
+        CharacterLister(campaign.characters, lang="markdown", render_cache=False).list(target=markdown_single)
+        lister = CharacterLister(campaign.characters, workers=workers, render_cache=False)
+        html = StringIO()
+        markdown = StringIO()
+
+        lister.list_many([("html", html), ("markdown", markdown)])
+
+        assert html.getvalue() == html_single.getvalue()
+        assert markdown.getvalue() == markdown_single.getvalue()
+
+    def test_counts_characters_once(self, db, tmp_path):
+        campaign = fixture_campaign(tmp_path, "listing", "show_all")
+        campaign.characters.db = db
+        campaign.characters.refresh()
+        lister = CharacterLister(campaign.characters, render_cache=False)
+        counter = ProgressCounter()
+
+        lister.list_many([("html", StringIO()), ("markdown", StringIO())], progress_callback=counter.progress)
+
+        assert counter.count == 2
+        assert lister.stats.characters == 2
+
+    def test_caches_each_language(self, db, tmp_campaign):
+        tmp_campaign.characters.db = db
+        (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+        tmp_campaign.characters.refresh()
+        CharacterLister(tmp_campaign.characters, render_cache=True) \
+            .list_many([("html", StringIO()), ("markdown", StringIO())])
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=True)
+
+        lister.list(target=StringIO())
+
+        assert lister.stats.cached == 2
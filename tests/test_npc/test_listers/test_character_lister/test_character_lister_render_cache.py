@@ -0,0 +1,127 @@
+from io import StringIO
+from tests.fixtures import tmp_campaign, db
+
+from npc.listers import CharacterLister
+from npc.listers.render_cache import RenderCache
+
+def make_listing(campaign, **kwargs) -> str:
+    target = StringIO()
+    CharacterLister(campaign.characters, lang="markdown", render_cache=True).list(target=target, **kwargs)
+    return target.getvalue()
+
+def poison_cache(campaign):
+    cache = RenderCache(campaign.cache_dir / RenderCache.FILENAME, "markdown:1:full:")
+    for key in cache.entries:
+        cache.store(key, "poisoned")
+    cache.save()
+
+def test_uses_settings_render_cache(tmp_campaign):
+    tmp_campaign.patch_campaign_settings({"characters": {"listing": {"render_cache": True}}})
+
+    lister = CharacterLister(tmp_campaign.characters)
+
+    assert lister.render_cache is True
+
+def test_skips_cache_by_default(tmp_campaign):
+    lister = CharacterLister(tmp_campaign.characters)
+
+    assert lister.render_cache is False
+
+def test_matches_uncached_output(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n@org Mars Bank\n")
+    tmp_campaign.characters.refresh()
+    plain = StringIO()
+    CharacterLister(tmp_campaign.characters, lang="markdown", render_cache=False).list(target=plain)
+
+    make_listing(tmp_campaign)
+
+    assert make_listing(tmp_campaign) == plain.getvalue()
+
+def test_reuses_unchanged_pieces(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    make_listing(tmp_campaign)
+    poison_cache(tmp_campaign)
+
+    result = make_listing(tmp_campaign)
+
+    assert "poisoned" in result
+    assert "Test Mann" not in result
+
+def test_renders_changed_characters(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    (tmp_campaign.characters_dir / "Other Mann - other.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    make_listing(tmp_campaign)
+    poison_cache(tmp_campaign)
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n@org Mars Bank\n")
+    tmp_campaign.characters.refresh()
+
+    result = make_listing(tmp_campaign)
+
+    assert "Mars Bank" in result
+    assert "Other Mann" not in result
+
+def test_renders_everything_after_template_change(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    make_listing(tmp_campaign)
+    poison_cache(tmp_campaign)
+    templates = tmp_campaign.settings_dir / "templates" / "characters"
+    templates.mkdir(parents=True)
+    (templates / "character.md").write_text("Custom {{ character.realname }}")
+
+    result = make_listing(tmp_campaign)
+
+    assert "Custom Test Mann" in result
+
+def test_rebuild_ignores_cache(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    make_listing(tmp_campaign)
+    poison_cache(tmp_campaign)
+
+    result = make_listing(tmp_campaign, rebuild=True)
+
+    assert "poisoned" not in result
+    assert "Test Mann" in result
+
+def test_uses_passed_false_render_cache(tmp_campaign):
+    tmp_campaign.patch_campaign_settings({"characters": {"listing": {"render_cache": True}}})
+
+    lister = CharacterLister(tmp_campaign.characters, render_cache=False)
+
+    assert lister.render_cache is False
+
+def test_full_and_split_listings_keep_their_pieces(tmp_campaign, db):
+    tmp_campaign.characters.db = db
+    (tmp_campaign.characters_dir / "Test Mann - tester.npc").write_text("@type person\n@org Mars Bank\n")
+    (tmp_campaign.characters_dir / "Other Mann - other.npc").write_text("@type person\n@org Venus Bank\n")
+    tmp_campaign.characters.refresh()
+    directory = tmp_campaign.root / "listing"
+
+    def full_listing():
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", group_by=["org"], render_cache=True)
+        lister.list(target=StringIO())
+        return lister.stats
+
+    def split_listing():
+        for path in directory.glob("*.md"):
+            path.unlink()
+        lister = CharacterLister(tmp_campaign.characters, lang="markdown", group_by=["org"], render_cache=True)
+        lister.split(directory)
+        return lister.stats
+
+    split_listing()
+    every_split_piece = split_listing().cached
+    full_listing()
+    full_stats = full_listing()
+    split_stats = split_listing()
+
+    assert full_stats.cached == full_stats.characters + full_stats.groups
+    assert split_stats.cached == every_split_piece
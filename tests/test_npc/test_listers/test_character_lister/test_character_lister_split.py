@@ -0,0 +1,176 @@
+import pytest
+import threading
+from io import StringIO
+from jinja2 import Template
+from tests.fixtures import ProgressCounter, db, tmp_campaign
+
+from npc.listers import CharacterLister
+from npc.listers.character_lister import split_file_name
+from npc.views import GroupView
+
+def make_campaign(tmp_campaign, db, names: list[str]):
+    tmp_campaign.characters.db = db
+    for name in names:
+        (tmp_campaign.characters_dir / f"{name} - tester.npc").write_text("@type person\n")
+    tmp_campaign.characters.refresh()
+    return tmp_campaign
+
+def make_lister(campaign, **kwargs) -> CharacterLister:
+    return CharacterLister(campaign.characters, lang="markdown", group_by=["last_initial"], **kwargs)
+
+class TestFiles():
+    def test_writes_file_per_group(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker", "Bart Brown"])
+        directory = campaign.root / "listing"
+
+        make_lister(campaign).split(directory)
+
+        assert sorted(path.name for path in directory.iterdir()) == ["A.md", "B.md", "index.md"]
+
+    def test_groups_hold_full_listing(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker", "Bart Brown"])
+        directory = campaign.root / "listing"
+        target = StringIO()
+        make_lister(campaign).list(target=target)
+
+        make_lister(campaign).split(directory)
+
+        combined = (directory / "A.md").read_text() + (directory / "B.md").read_text()
+        assert combined == target.getvalue()
+
+    def test_index_links_groups(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+
+        make_lister(campaign).split(directory)
+
+        result = (directory / "index.md").read_text()
+        assert "* [A](A.md)" in result
+        assert "* [B](B.md)" in result
+
+    def test_updates_progress(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker", "Bart Brown"])
+        counter = ProgressCounter()
+
+        make_lister(campaign).split(campaign.root / "listing", progress_callback=counter.progress)
+
+        assert counter.count == 3
+
+    def test_renders_on_calling_thread(self, db, tmp_campaign, monkeypatch):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker", "Bart Brown"])
+        threads = set()
+        render = Template.render
+        def record_thread(self, *args, **kwargs):
+            threads.add(threading.get_ident())
+            return render(self, *args, **kwargs)
+        monkeypatch.setattr(Template, "render", record_thread)
+
+        make_lister(campaign).split(campaign.root / "listing")
+
+        assert threads == {threading.get_ident()}
+
+    def test_requires_group_by(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able"])
+        lister = CharacterLister(campaign.characters, lang="markdown")
+        lister.group_by = []
+
+        with pytest.raises(ValueError):
+            lister.split(campaign.root / "listing")
+
+class TestChanges():
+    def test_skips_unchanged_files(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+
+        written = make_lister(campaign).split(directory)
+
+        assert written == []
+
+    def test_writes_changed_group(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+        (campaign.characters_dir / "Bart Brown - tester.npc").write_text("@type person\n")
+        campaign.characters.refresh()
+
+        written = make_lister(campaign).split(directory)
+
+        assert written == [directory / "B.md"]
+        assert "Bart Brown" in (directory / "B.md").read_text()
+
+    def test_writes_missing_file(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+        (directory / "A.md").unlink()
+
+        written = make_lister(campaign).split(directory)
+
+        assert written == [directory / "A.md"]
+
+    def test_writes_new_group_and_index(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+        (campaign.characters_dir / "Bob Baker - tester.npc").write_text("@type person\n")
+        campaign.characters.refresh()
+
+        written = make_lister(campaign).split(directory)
+
+        assert written == [directory / "B.md", directory / "index.md"]
+
+    def test_removes_empty_group(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+        (campaign.characters_dir / "Bob Baker - tester.npc").unlink()
+        campaign.characters.refresh()
+
+        make_lister(campaign).split(directory)
+
+        assert not (directory / "B.md").exists()
+
+    def test_rebuild_writes_everything(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign).split(directory)
+
+        written = make_lister(campaign).split(directory, rebuild=True)
+
+        assert len(written) == 3
+
+    def test_uses_render_cache(self, db, tmp_campaign):
+        campaign = make_campaign(tmp_campaign, db, ["Alice Able", "Bob Baker"])
+        directory = campaign.root / "listing"
+        make_lister(campaign, render_cache=True).split(directory)
+        (directory / "A.md").unlink()
+        lister = make_lister(campaign, render_cache=True)
+
+        lister.split(directory)
+
+        assert lister.stats.cached == 2
+
+class TestSplitFileName():
+    def test_uses_title(self):
+        result = split_file_name(GroupView("Alpha", "org"), "md", set())
+
+        assert result == "Alpha.md"
+
+    def test_names_missing_title(self):
+        result = split_file_name(GroupView(None, "org"), "md", set())
+
+        assert result == "No org.md"
+
+    def test_sanitizes_title(self):
+        result = split_file_name(GroupView("Alpha/Beta", "org"), "md", set())
+
+        assert result == "Alpha_Beta.md"
+
+    def test_numbers_taken_names(self):
+        taken = {"alpha.md"}
+
+        result = split_file_name(GroupView("ALPHA", "org"), "md", taken)
+
+        assert result == "ALPHA 2.md"
+        assert "alpha 2.md" in taken
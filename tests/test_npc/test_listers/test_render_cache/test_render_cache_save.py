@@ -0,0 +1,69 @@
+from npc.listers.render_cache import RenderCache
+
+def test_keeps_stored_entries(tmp_path):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.store("key", "text")
+    cache.save()
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+
+    assert cache.get("key") == "text"
+
+def test_prunes_unused_entries(tmp_path):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.store("old", "text")
+    cache.save()
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.store("new", "text")
+    cache.save()
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+
+    assert "old" not in cache.entries
+
+def test_keeps_used_entries(tmp_path):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.store("old", "text")
+    cache.save()
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.get("old")
+    cache.save()
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+
+    assert cache.get("old") == "text"
+
+def test_leaves_other_scopes(tmp_path):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "html:1")
+    cache.store("other", "text")
+    cache.save()
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.save()
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "html:1")
+
+    assert cache.get("other") == "text"
+
+def test_clears_entries_on_version_mismatch(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+    cache.store("key", "text")
+    cache.save()
+    monkeypatch.setattr("npc.listers.render_cache.npc_version", "0.0.0")
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1")
+
+    assert cache.entries == {}
+
+def test_keeps_shared_key_in_each_scope(tmp_path):
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1:full:")
+    cache.store("key", "text")
+    cache.save()
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1:split:/listing")
+    cache.store("key", "text")
+    cache.save()
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1:split:/listing")
+    cache.save()
+
+    cache = RenderCache(tmp_path / RenderCache.FILENAME, "md:1:full:")
+
+    assert cache.get("key") == "text"
@@ -0,0 +1,29 @@
+from npc.templates.filters import markdown, markdown_inline, cached_markdown
+
+def test_converts_markdown():
+    result = markdown("A *test*")
+
+    assert result == "<p>A <em>test</em></p>\n"
+
+def test_converts_inline_markdown():
+    result = markdown_inline("A *test*")
+
+    assert result == "A <em>test</em>"
+
+def test_reuses_repeated_values():
+    cached_markdown.cache_clear()
+    markdown("A *test*")
+
+    markdown_inline("A *test*")
+
+    info = cached_markdown.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+def test_skips_cache_for_other_values():
+    cached_markdown.cache_clear()
+
+    result = markdown(["A *test*\n"])
+
+    assert result == "<p>A <em>test</em></p>\n"
+    assert cached_markdown.cache_info().misses == 0
@@ -0,0 +1,64 @@
+import pytest
+from jinja2 import TemplateNotFound
+
+from npc.templates import IndexedFileSystemLoader
+
+def test_gets_template_from_first_path(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (first / "named.html").write_text("first")
+    (second / "named.html").write_text("second")
+    loader = IndexedFileSystemLoader([first, second])
+
+    source, filename, _ = loader.get_source(None, "named.html")
+
+    assert source == "first"
+    assert filename == str(first / "named.html")
+
+def test_gets_template_from_later_path(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (second / "named.html").write_text("second")
+    loader = IndexedFileSystemLoader([first, second])
+
+    source, _, _ = loader.get_source(None, "named.html")
+
+    assert source == "second"
+
+def test_gets_template_in_subdir(tmp_path):
+    (tmp_path / "nwod").mkdir()
+    (tmp_path / "nwod" / "changeling.html").write_text("nested")
+    loader = IndexedFileSystemLoader([tmp_path])
+
+    source, _, _ = loader.get_source(None, "nwod/changeling.html")
+
+    assert source == "nested"
+
+def test_skips_missing_paths(tmp_path):
+    (tmp_path / "named.html").write_text("found")
+    loader = IndexedFileSystemLoader([tmp_path / "missing", tmp_path])
+
+    source, _, _ = loader.get_source(None, "named.html")
+
+    assert source == "found"
+
+def test_raises_when_not_found(tmp_path):
+    loader = IndexedFileSystemLoader([tmp_path])
+
+    with pytest.raises(TemplateNotFound):
+        loader.get_source(None, "named.html")
+
+def test_scans_once(tmp_path, monkeypatch):
+    (tmp_path / "named.html").write_text("found")
+    loader = IndexedFileSystemLoader([tmp_path])
+    loader.get_source(None, "named.html")
+    calls = []
+    monkeypatch.setattr(loader, "scan", lambda: calls.append(1))
+
+    loader.get_source(None, "named.html")
+
+    assert calls == []
@@ -0,0 +1,35 @@
+import os
+
+from npc.templates import IndexedFileSystemLoader
+
+def test_true_before_scan(tmp_path):
+    loader = IndexedFileSystemLoader([tmp_path])
+
+    assert loader.is_current()
+
+def test_true_when_unchanged(tmp_path):
+    (tmp_path / "named.html").write_text("found")
+    loader = IndexedFileSystemLoader([tmp_path])
+    loader.list_templates()
+
+    assert loader.is_current()
+
+def test_false_after_new_file(tmp_path):
+    (tmp_path / "named.html").write_text("found")
+    loader = IndexedFileSystemLoader([tmp_path])
+    loader.list_templates()
+
+    (tmp_path / "other.html").write_text("new")
+
+    assert not loader.is_current()
+
+def test_false_after_edit(tmp_path):
+    template = tmp_path / "named.html"
+    template.write_text("found")
+    loader = IndexedFileSystemLoader([tmp_path])
+    loader.list_templates()
+
+    template.write_text("changed text")
+    os.utime(template, ns=(1, 1))
+
+    assert not loader.is_current()
@@ -1,7 +1,10 @@
+import pickle
+import pytest
 from tests.fixtures import tmp_campaign
 from npc.characters import Tag, Character, CharacterFactory, RawTag
 
 from npc.views.character_view import CharacterView
+from npc.views.tag_view_collection import TagViewCollection
 
 def test_uses_character_type(tmp_campaign):
     factory = CharacterFactory(tmp_campaign)
@@ -116,3 +119,62 @@ def test_first_ignores_hidden_tag_value(tmp_campaign):
 
     assert view.first("title") == ""
 
+
+def test_chains_tag_views(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person", tags=[
+        RawTag("org", "Mars Bank"),
+        RawTag("role", "Teller"),
+        RawTag("role", "Janitor"),
+        RawTag("org", "Bowling Club"),
+    ])
+
+    view = CharacterView(character)
+
+    assert [role.value for role in view.org.first().role.all()] == ["Teller", "Janitor"]
+    assert [org.value for org in view.org.rest()] == ["Bowling Club"]
+
+def test_missing_tag_raises_attribute_error(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person")
+
+    view = CharacterView(character)
+
+    with pytest.raises(AttributeError):
+        view.title
+
+def test_makes_tag_views_on_first_use(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person", tags=[RawTag("title", "bro")])
+    view = CharacterView(character)
+
+    assert view.has("title")
+    assert not isinstance(view._tags["title"], TagViewCollection)
+    assert view.title is view.title
+
+def test_keeps_values_after_tags_change(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person", tags=[RawTag("title", "bro")])
+    view = CharacterView(character)
+
+    character.tags[0].value = "guy"
+
+    assert view.first("title") == "bro"
+
+def test_uses_slots(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person")
+
+    view = CharacterView(character)
+
+    assert not hasattr(view, "__dict__")
+
+def test_survives_pickling(tmp_campaign):
+    factory = CharacterFactory(tmp_campaign)
+    character = factory.make("Test Mann", type_key="person", tags=[RawTag("org", "Mars Bank"), RawTag("role", "Teller")])
+    view = CharacterView(character)
+
+    copy = pickle.loads(pickle.dumps(view))
+
+    assert copy.realname == "Test Mann"
+    assert copy.org.first().role.first().value == "Teller"
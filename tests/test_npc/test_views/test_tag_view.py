@@ -1,6 +1,7 @@
+import pytest
 from npc.characters import Tag
 
-from npc.views.tag_view import TagView
+from npc.views.tag_view import TagView, tag_data
 
 def test_uses_tag_name():
     tag = Tag(name="test", value="testing", subtags=[])
@@ -55,3 +56,34 @@ def test_has_false_without_tag():
     view = TagView(tag)
 
     assert not view.has("when")
+
+def test_missing_subtag_raises_attribute_error():
+    tag = Tag(name="test", value="testing")
+
+    view = TagView(tag)
+
+    with pytest.raises(AttributeError):
+        view.when
+
+def test_has_static_attributes():
+    tag = Tag(name="test", value="testing")
+
+    view = TagView(tag)
+
+    assert view.has("value")
+
+def test_uses_slots():
+    tag = Tag(name="test", value="testing")
+
+    view = TagView(tag)
+
+    assert not hasattr(view, "__dict__")
+
+def test_from_data_matches_tag():
+    subtag = Tag(name="when", value="now")
+    tag = Tag(name="test", value="testing", subtags=[subtag])
+
+    view = TagView.from_data(tag_data(tag))
+
+    assert view.name == "test"
+    assert view.when.first().value == "now"
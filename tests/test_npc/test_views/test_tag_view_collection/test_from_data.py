@@ -0,0 +1,20 @@
+from npc.characters import Tag
+
+from npc.views.tag_view import TagView, tag_data
+from npc.views.tag_view_collection import TagViewCollection
+
+def test_makes_views_from_data():
+    tags = [Tag(name="test", value="yes"), Tag(name="test", value="no")]
+
+    collection = TagViewCollection.from_data([tag_data(tag) for tag in tags])
+
+    assert [view.value for view in collection.all()] == ["yes", "no"]
+
+def test_makes_views_on_first_use():
+    tags = [Tag(name="test", value="yes"), Tag(name="test", value="no")]
+    collection = TagViewCollection.from_data([tag_data(tag) for tag in tags])
+
+    first = collection.first()
+
+    assert first is collection.first()
+    assert not isinstance(collection._entries[1], TagView)
@@ -0,0 +1,12 @@
+from tests.fixtures import tmp_campaign
+
+from npc_cli.client import find_campaign_root
+
+def test_finds_root_from_root(tmp_campaign):
+    assert find_campaign_root(str(tmp_campaign.root)) == tmp_campaign.root
+
+def test_finds_root_from_subdir(tmp_campaign):
+    assert find_campaign_root(str(tmp_campaign.characters_dir)) == tmp_campaign.root
+
+def test_none_outside_campaign(tmp_path):
+    assert find_campaign_root(str(tmp_path)) is None
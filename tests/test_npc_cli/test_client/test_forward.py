@@ -0,0 +1,54 @@
+import threading
+
+from tests.fixtures import tmp_campaign, clean_db
+
+from npc.db import DB
+
+from npc_cli.client import forward, socket_path
+from npc_cli.server import CampaignServer, stop_server
+
+def test_skips_unforwardable_commands(tmp_campaign):
+    assert forward(["new", "person"], str(tmp_campaign.root)) is None
+
+def test_skips_without_campaign(tmp_path):
+    assert forward(["list"], str(tmp_path)) is None
+
+def test_skips_without_server(tmp_campaign):
+    assert forward(["list"], str(tmp_campaign.root)) is None
+
+def test_skips_stale_socket(tmp_campaign):
+    path = socket_path(tmp_campaign.root.resolve())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+    assert forward(["list"], str(tmp_campaign.root)) is None
+    path.unlink()
+
+@clean_db
+def test_runs_command_on_server(tmp_campaign):
+    with (tmp_campaign.characters_dir / "Test Mann - tester.npc").open("w", newline="\n") as file:
+        file.write("@type person\n")
+    server = CampaignServer(tmp_campaign.root, polling=True)
+    ready = threading.Event()
+    def run_server():
+        # in-memory databases are per thread, so the server needs its own
+        server_db = DB(clearSingleton=True)
+        try:
+            server.serve_forever(ready_callback=ready.set)
+        finally:
+            server_db.engine.dispose()
+    thread = threading.Thread(target=run_server)
+    thread.start()
+    ready.wait(10)
+
+    try:
+        response = forward(["list", "-f", "markdown", "-o", "-"], str(tmp_campaign.root))
+        mode = server.socket_path.stat().st_mode & 0o777
+    finally:
+        stop_server(tmp_campaign.root)
+        thread.join(10)
+
+    assert response["exit_code"] == 0
+    assert "Test Mann" in response["output"]
+    assert mode == 0o600
+    assert not server.socket_path.exists()
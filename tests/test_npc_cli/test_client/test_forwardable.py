@@ -0,0 +1,30 @@
+import pytest
+
+from npc_cli.client import forwardable
+
+@pytest.mark.parametrize("args", [
+    ["list"],
+    ["list", "-f", "html", "-o", "out.html"],
+    ["find", "lighthouse"],
+    ["lint"],
+    ["lint", "--no-edit"],
+    ["report", "values", "org"],
+    ["reorg", "--batch"],
+])
+def test_forwards_read_only_commands(args):
+    assert forwardable(args)
+
+@pytest.mark.parametrize("args", [
+    [],
+    ["--version"],
+    ["list", "--help"],
+    ["lint", "--edit"],
+    ["reorg"],
+    ["reorg", "--interactive"],
+    ["report"],
+    ["new", "person"],
+    ["serve"],
+    ["session"],
+])
+def test_runs_other_commands_locally(args):
+    assert not forwardable(args)
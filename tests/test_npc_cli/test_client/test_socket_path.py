@@ -0,0 +1,67 @@
+import os
+import tempfile
+from pathlib import Path
+
+from npc_cli.client import socket_path, runtime_dir, private_socket, MAX_SOCKET_PATH
+
+def test_uses_cache_dir():
+    root = Path("/campaign")
+
+    assert socket_path(root) == root / ".npc" / "cache" / "serve.sock"
+
+def test_shortens_long_paths():
+    root = Path("/") / ("a" * MAX_SOCKET_PATH)
+
+    result = socket_path(root)
+
+    assert len(str(result)) <= MAX_SOCKET_PATH
+    assert result.suffix == ".sock"
+
+def test_long_paths_are_stable():
+    root = Path("/") / ("a" * MAX_SOCKET_PATH)
+
+    assert socket_path(root) == socket_path(root)
+
+def test_long_paths_are_distinct():
+    first = Path("/") / ("a" * MAX_SOCKET_PATH)
+    second = Path("/") / ("b" * MAX_SOCKET_PATH)
+
+    assert socket_path(first) != socket_path(second)
+
+def test_long_paths_use_runtime_dir(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    root = Path("/") / ("a" * MAX_SOCKET_PATH)
+
+    result = socket_path(root)
+
+    assert result.parent == Path("/run/user/1000/npc")
+
+def test_long_paths_use_user_temp_dir(monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    root = Path("/") / ("a" * MAX_SOCKET_PATH)
+
+    result = socket_path(root)
+
+    assert result.parent == Path(tempfile.gettempdir()) / f"npc-{os.getuid()}"
+
+class TestPrivateSocket:
+    def test_trusts_cache_dir(self):
+        assert private_socket(Path("/campaign") / ".npc" / "cache" / "serve.sock")
+
+    def test_trusts_private_runtime_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        runtime_dir().mkdir(mode=0o700)
+
+        assert private_socket(runtime_dir() / "test.sock")
+
+    def test_rejects_shared_runtime_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        runtime_dir().mkdir()
+        runtime_dir().chmod(0o777)
+
+        assert not private_socket(runtime_dir() / "test.sock")
+
+    def test_rejects_missing_runtime_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+        assert not private_socket(runtime_dir() / "test.sock")
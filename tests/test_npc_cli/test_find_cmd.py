@@ -0,0 +1,32 @@
+from click.testing import CliRunner
+from tests.fixtures import runner, tmp_campaign, isolated, clean_db
+
+from npc_cli import cli
+
+@isolated
+@clean_db
+def test_aborts_on_missing_campaign(tmp_path, runner):
+    result = runner.invoke(cli, "find lighthouse")
+
+    assert "Not a campaign" in result.output
+
+@isolated
+@clean_db
+def test_shows_matching_characters(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Test Mann' -m 'keeps the lighthouse'")
+    runner.invoke(cli, "new person -n 'Other Mann' -m 'sells fish'")
+
+    result = runner.invoke(cli, "find lighthouse")
+
+    assert "Test Mann" in result.output
+    assert "**lighthouse**" in result.output
+    assert "Other Mann" not in result.output
+
+@isolated
+@clean_db
+def test_reports_no_matches(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Test Mann' -m tester")
+
+    result = runner.invoke(cli, "find lighthouse")
+
+    assert "No characters found" in result.output
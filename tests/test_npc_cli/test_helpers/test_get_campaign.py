@@ -1,7 +1,7 @@
 from tests.fixtures import tmp_campaign, change_cwd
 from npc.settings import Settings
 
-from npc_cli.helpers import get_campaign
+from npc_cli.helpers import get_campaign, warm_campaigns
 
 def test_aborts_on_missing_campaign(tmp_path):
     settings = Settings()
@@ -24,3 +24,12 @@ def test_returns_campaign_for_parent_dir(tmp_campaign):
         campaign = get_campaign(settings)
 
         assert campaign.root == tmp_campaign.root
+
+def test_returns_warm_campaign(tmp_campaign, monkeypatch):
+    settings = Settings()
+    monkeypatch.setitem(warm_campaigns, tmp_campaign.root.resolve(), tmp_campaign)
+
+    with change_cwd(tmp_campaign.root):
+        campaign = get_campaign(settings)
+
+        assert campaign is tmp_campaign
@@ -18,3 +18,68 @@ def test_shows_characters(tmp_campaign, runner):
     result = runner.invoke(cli, "list -o -")
 
     assert "Test Mann" in result.output
+
+@isolated
+@clean_db
+def test_rebuild_shows_characters(tmp_campaign, runner):
+    tmp_campaign.patch_campaign_settings({"characters": {"listing": {"render_cache": True}}})
+    runner.invoke(cli, "new person -n 'Test Mann' -m tester")
+    runner.invoke(cli, "list -o -")
+
+    result = runner.invoke(cli, "list -o - --rebuild")
+
+    assert "Test Mann" in result.output
+
+@isolated
+@clean_db
+def test_writes_each_format(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Test Mann' -m tester")
+
+    result = runner.invoke(cli, "list -f html -o list.html -f markdown -o list.md")
+
+    assert result.exit_code == 0
+    assert "<h" in tmp_campaign.root.joinpath("list.html").read_text()
+    assert "# Test Mann" in tmp_campaign.root.joinpath("list.md").read_text()
+
+@isolated
+@clean_db
+def test_rejects_unpaired_formats(tmp_campaign, runner):
+    result = runner.invoke(cli, "list -f html -f markdown -o list.html")
+
+    assert result.exit_code != 0
+    assert "one --output for each --format" in result.output
+
+@isolated
+@clean_db
+def test_rejects_outputs_without_formats(tmp_campaign, runner):
+    result = runner.invoke(cli, "list -o list.html -o list.md")
+
+    assert result.exit_code != 0
+    assert "one --format for each --output" in result.output
+
+@isolated
+@clean_db
+def test_splits_by_group(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Test Mann' -m tester")
+
+    result = runner.invoke(cli, "list -f markdown -g last_initial --split-by-group listing")
+
+    assert result.exit_code == 0
+    assert "# Test Mann" in tmp_campaign.root.joinpath("listing", "M.md").read_text()
+    assert "(M.md)" in tmp_campaign.root.joinpath("listing", "index.md").read_text()
+
+@isolated
+@clean_db
+def test_rejects_output_with_split(tmp_campaign, runner):
+    result = runner.invoke(cli, "list -o - --split-by-group listing")
+
+    assert result.exit_code != 0
+    assert "cannot be used with --split-by-group" in result.output
+
+@isolated
+@clean_db
+def test_requires_output_or_split(tmp_campaign, runner):
+    result = runner.invoke(cli, "list")
+
+    assert result.exit_code != 0
+    assert "give an --output" in result.output
@@ -0,0 +1,44 @@
+from click.testing import CliRunner
+from tests.fixtures import runner, tmp_campaign, isolated, clean_db
+
+from npc_cli import cli
+
+@isolated
+@clean_db
+def test_aborts_on_missing_campaign(tmp_path, runner):
+    result = runner.invoke(cli, "open martha")
+
+    assert "Not a campaign" in result.output
+
+@isolated
+@clean_db
+def test_reports_no_matches(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Test Mann' -m tester")
+
+    result = runner.invoke(cli, "open martha")
+
+    assert "No characters found" in result.output
+
+@isolated
+@clean_db
+def test_asks_which_match_to_open(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Martha Pike' -m keeper")
+    runner.invoke(cli, "new person -n 'Marta Quill' -m clerk")
+
+    result = runner.invoke(cli, "open mart", input="2\n")
+
+    assert "1. " in result.output
+    assert "Marta Quill - clerk" in result.output
+    assert "Which character?" in result.output
+    assert result.exit_code == 0
+
+@isolated
+@clean_db
+def test_first_skips_question(tmp_campaign, runner):
+    runner.invoke(cli, "new person -n 'Martha Pike' -m keeper")
+    runner.invoke(cli, "new person -n 'Marta Quill' -m clerk")
+
+    result = runner.invoke(cli, "open mart --first")
+
+    assert "Which character?" not in result.output
+    assert result.exit_code == 0
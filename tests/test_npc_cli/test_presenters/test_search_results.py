@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from npc.characters import Character
+from npc.db.search_index import SearchResult
+
+from npc_cli.presenters import search_results
+
+def make_result(snippet: str = "the **lighthouse**") -> SearchResult:
+    character = Character(realname="Test Mann", file_loc="/campaign/Characters/Test Mann.npc")
+    return SearchResult(character, snippet)
+
+def test_shows_relative_path():
+    result = search_results([make_result()], Path("/campaign"))
+
+    assert "Test Mann (Characters/Test Mann.npc)" in result
+
+def test_keeps_path_outside_root():
+    result = search_results([make_result()], Path("/elsewhere"))
+
+    assert "(/campaign/Characters/Test Mann.npc)" in result
+
+def test_puts_snippet_on_one_line():
+    result = search_results([make_result("the\nold **lighthouse**")], Path("/campaign"))
+
+    assert "    the old **lighthouse**" in result
@@ -0,0 +1,40 @@
+from tests.fixtures import runner, tmp_campaign, isolated, clean_db
+
+from npc_cli import cli
+from npc_cli.server import CampaignServer
+
+@isolated
+@clean_db
+def test_aborts_on_missing_campaign(tmp_path, runner):
+    result = runner.invoke(cli, "serve")
+
+    assert "Not a campaign" in result.output
+
+@isolated
+@clean_db
+def test_stop_without_server(tmp_campaign, runner):
+    result = runner.invoke(cli, "serve --stop")
+
+    assert "No server is running" in result.output
+
+@isolated
+@clean_db
+def test_reports_when_ready(tmp_campaign, runner, monkeypatch):
+    def fake_serve(self, ready_callback):
+        ready_callback()
+    monkeypatch.setattr(CampaignServer, "serve_forever", fake_serve)
+
+    result = runner.invoke(cli, "serve")
+
+    assert "Serving" in result.output
+
+@isolated
+@clean_db
+def test_reports_running_server(tmp_campaign, runner, monkeypatch):
+    def fake_serve(self, ready_callback):
+        raise RuntimeError("A server is already running")
+    monkeypatch.setattr(CampaignServer, "serve_forever", fake_serve)
+
+    result = runner.invoke(cli, "serve")
+
+    assert "already running" in result.output
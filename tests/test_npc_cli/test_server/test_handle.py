@@ -0,0 +1,129 @@
+import pytest
+from tests.fixtures import tmp_campaign, clean_db
+
+from npc.campaign import CharacterCollection
+from npc_cli import helpers
+from npc_cli.server import CampaignServer
+
+def write_character(path, contents="@type person\n"):
+    with path.open('w', newline="\n") as file:
+        file.write(contents)
+    return path
+
+@clean_db
+def test_runs_command(tmp_campaign):
+    write_character(tmp_campaign.characters_dir / "Test Mann - tester.npc")
+    server = CampaignServer(tmp_campaign.root, polling=True)
+
+    response = server.handle({"args": ["list", "-f", "markdown", "-o", "-"], "cwd": str(tmp_campaign.root)})
+    server.cool_down()
+
+    assert response["exit_code"] == 0, response["output"]
+    assert "Test Mann" in response["output"]
+
+@clean_db
+def test_reports_exit_code(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+
+    response = server.handle({"args": ["list"], "cwd": str(tmp_campaign.root)})
+    server.cool_down()
+
+    assert response["exit_code"] != 0
+
+@clean_db
+def test_reuses_warm_campaign(tmp_campaign, monkeypatch):
+    write_character(tmp_campaign.characters_dir / "Test Mann - tester.npc")
+    server = CampaignServer(tmp_campaign.root, polling=True)
+    server.warm_up()
+    def fail(*args, **kwargs):
+        raise AssertionError("characters were loaded again")
+    monkeypatch.setattr(CharacterCollection, "seed", fail)
+    monkeypatch.setattr(CharacterCollection, "refresh", fail)
+
+    response = server.handle({"args": ["list", "-f", "markdown", "-o", "-"], "cwd": str(tmp_campaign.root)})
+    server.cool_down()
+
+    assert "Test Mann" in response["output"]
+
+@clean_db
+def test_sees_new_characters(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+    server.warm_up()
+    write_character(tmp_campaign.characters_dir / "Test Mann - tester.npc")
+
+    response = server.handle({"args": ["list", "-f", "markdown", "-o", "-"], "cwd": str(tmp_campaign.root)})
+    server.cool_down()
+
+    assert "Test Mann" in response["output"]
+
+@clean_db
+def test_reloads_after_settings_change(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+    server.warm_up()
+    first = server.campaign
+    tmp_campaign.patch_campaign_settings({"desc": "Changed"})
+
+    server.handle({"args": ["lint"], "cwd": str(tmp_campaign.root)})
+    second = server.campaign
+    server.cool_down()
+
+    assert second is not first
+
+@clean_db
+def test_registers_warm_campaign(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+
+    server.warm_up()
+    registered = helpers.warm_campaigns.get(tmp_campaign.root.resolve())
+    warm = server.campaign
+    server.cool_down()
+
+    assert registered is warm
+    assert tmp_campaign.root.resolve() not in helpers.warm_campaigns
+
+def test_stop_request_ends_serving(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root)
+    server.running = True
+
+    server.handle({"stop": True})
+
+    assert not server.running
+
+@clean_db
+def test_reports_missing_cwd(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+    missing = tmp_campaign.root / "nowhere"
+
+    response = server.handle({"args": ["list"], "cwd": str(missing)})
+    server.cool_down()
+
+    assert response["exit_code"] == 1
+    assert str(missing) in response["errors"]
+
+def test_refuses_unforwardable_commands(tmp_campaign, monkeypatch):
+    server = CampaignServer(tmp_campaign.root)
+    monkeypatch.setattr(server, "warm_up", lambda: pytest.fail("should not warm up"))
+
+    response = server.handle({"args": ["new", "person", "-n", "Test Mann"], "cwd": str(tmp_campaign.root)})
+
+    assert response["exit_code"] == 1
+    assert "cannot run" in response["errors"]
+
+def test_refuses_malformed_args(tmp_campaign, monkeypatch):
+    server = CampaignServer(tmp_campaign.root)
+    monkeypatch.setattr(server, "warm_up", lambda: pytest.fail("should not warm up"))
+
+    response = server.handle({"args": "list", "cwd": str(tmp_campaign.root)})
+
+    assert response["exit_code"] == 1
+
+@clean_db
+def test_keeps_stderr_separate(tmp_campaign):
+    server = CampaignServer(tmp_campaign.root, polling=True)
+
+    response = server.handle({"args": ["list", "--bogus"], "cwd": str(tmp_campaign.root)})
+    server.cool_down()
+
+    assert response["exit_code"] != 0
+    assert "--bogus" not in response["output"]
+    assert "--bogus" in response["errors"]
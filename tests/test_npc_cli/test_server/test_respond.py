@@ -0,0 +1,78 @@
+import os
+import json
+import socket
+
+from tests.fixtures import tmp_campaign
+
+from npc_cli.server import CampaignServer
+
+def read_response(client: socket.socket) -> dict:
+    client.settimeout(5)
+    chunks = []
+    try:
+        while chunk := client.recv(64 * 1024):
+            chunks.append(chunk)
+    except ConnectionResetError:
+        pass
+    return json.loads(b"".join(chunks)) if chunks else None
+
+def test_answers_request(tmp_campaign, monkeypatch):
+    server = CampaignServer(tmp_campaign.root)
+    monkeypatch.setattr(server, "handle", lambda request: {"output": "hi\n", "exit_code": 0})
+    conn, client = socket.socketpair()
+    client.sendall(json.dumps({"args": ["list"]}).encode("utf-8"))
+    client.shutdown(socket.SHUT_WR)
+
+    with conn:
+        server.respond(conn)
+
+    with client:
+        assert read_response(client) == {"output": "hi\n", "exit_code": 0}
+
+def test_drops_stalled_client(tmp_campaign, monkeypatch):
+    monkeypatch.setattr("npc_cli.server.REQUEST_TIMEOUT", 0.1)
+    server = CampaignServer(tmp_campaign.root)
+    handled = []
+    monkeypatch.setattr(server, "handle", handled.append)
+    conn, client = socket.socketpair()
+    client.sendall(b'{"args": ')
+
+    with conn:
+        server.respond(conn)
+
+    with client:
+        assert read_response(client) is None
+    assert handled == []
+
+def test_reports_handler_errors(tmp_campaign, monkeypatch):
+    server = CampaignServer(tmp_campaign.root)
+    def explode(request):
+        raise RuntimeError("kaboom")
+    monkeypatch.setattr(server, "handle", explode)
+    conn, client = socket.socketpair()
+    client.sendall(json.dumps({"args": ["list"]}).encode("utf-8"))
+    client.shutdown(socket.SHUT_WR)
+
+    with conn:
+        server.respond(conn)
+
+    with client:
+        response = read_response(client)
+    assert response["exit_code"] == 1
+    assert "kaboom" in response["errors"]
+
+def test_ignores_other_users(tmp_campaign, monkeypatch):
+    server = CampaignServer(tmp_campaign.root)
+    handled = []
+    monkeypatch.setattr(server, "handle", handled.append)
+    monkeypatch.setattr("npc_cli.server.peer_uid", lambda conn: os.getuid() + 1)
+    conn, client = socket.socketpair()
+    client.sendall(json.dumps({"args": ["list"]}).encode("utf-8"))
+    client.shutdown(socket.SHUT_WR)
+
+    with conn:
+        server.respond(conn)
+
+    with client:
+        assert read_response(client) is None
+    assert handled == []
@@ -0,0 +1,45 @@
+from tests.fixtures import runner, tmp_campaign, isolated, clean_db
+
+from npc_cli import cli
+from npc.campaign import CharacterCollection
+
+@isolated
+@clean_db
+def test_aborts_on_missing_campaign(tmp_path, runner):
+    result = runner.invoke(cli, "watch")
+
+    assert "Not a campaign" in result.output
+
+@isolated
+@clean_db
+def test_builds_persistent_index(tmp_campaign, runner, monkeypatch):
+    monkeypatch.setattr(CharacterCollection, "watch", lambda self, *args, **kwargs: None)
+
+    result = runner.invoke(cli, "watch")
+
+    assert (tmp_campaign.cache_dir / CharacterCollection.INDEX_FILENAME).exists()
+    assert "Watching 0 characters" in result.output
+
+@isolated
+@clean_db
+def test_reports_changes(tmp_campaign, runner, monkeypatch):
+    def fake_watch(self, callback, **kwargs):
+        loc = self.root / "Test Mann.npc"
+        loc.write_text("@type person\n")
+        callback(self.apply_changes([str(loc)]))
+    monkeypatch.setattr(CharacterCollection, "watch", fake_watch)
+
+    result = runner.invoke(cli, "watch")
+
+    assert "Loaded 1 and removed 0" in result.output
+
+@isolated
+@clean_db
+def test_stops_on_interrupt(tmp_campaign, runner, monkeypatch):
+    def interrupt(self, *args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(CharacterCollection, "watch", interrupt)
+
+    result = runner.invoke(cli, "watch")
+
+    assert result.exit_code == 0
@@ -0,0 +1,58 @@
+import time
+import threading
+from PySide6.QtCore import Qt
+
+from npc_gui.util import WatchThread
+
+class FakeWatcher():
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.threads = set()
+
+    def changes(self, timeout: float = None) -> set[str]:
+        self.threads.add(threading.get_ident())
+        if self.batches:
+            return self.batches.pop(0)
+        time.sleep(timeout)
+        return set()
+
+def collect(watcher, count: int) -> list:
+    received = []
+    thread = WatchThread(watcher, interval=0.01)
+    thread.changed.connect(received.append, Qt.DirectConnection)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while len(received) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    thread.stop()
+    return received
+
+def test_emits_changed_paths():
+    watcher = FakeWatcher({"a.npc"}, {"b.npc"})
+
+    received = collect(watcher, 2)
+
+    assert received == [{"a.npc"}, {"b.npc"}]
+
+def test_skips_empty_changes():
+    watcher = FakeWatcher(set(), {"a.npc"})
+
+    received = collect(watcher, 1)
+
+    assert received == [{"a.npc"}]
+
+def test_checks_off_the_calling_thread():
+    watcher = FakeWatcher({"a.npc"})
+
+    collect(watcher, 1)
+
+    assert threading.get_ident() not in watcher.threads
+
+def test_stops_when_asked():
+    watcher = FakeWatcher()
+    thread = WatchThread(watcher, interval=0.01)
+    thread.start()
+
+    thread.stop()
+
+    assert thread.isFinished()